@@ -0,0 +1,161 @@
+"""Benchmark the six code generators at scaled spec sizes.
+
+Usage:
+    python benchmarks/bench_generators.py run -o results.json
+    python benchmarks/bench_generators.py run --sizes 1 100 10000 --generators class gui_app
+    python benchmarks/bench_generators.py compare baseline.json results.json --threshold 0.15
+
+Each generator is rendered through the headless engine with its list
+option (params, methods, widgets, steps, scraped fields) grown to the
+requested size. Fragment caches are cleared before every render so the
+numbers describe cold renders. "compare" exits with status 1 when any
+generator/size pair got slower than the threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mygen
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000]
+
+def cycle(values, n):
+    return ", ".join(f"{values[i % len(values)]}_{i}" if i >= len(values) else values[i] for i in range(n))
+
+# Generator name -> (function building a spec of size n, whether the spec grows with n)
+GENERATORS = {
+    "function": (lambda n: mygen.FunctionSpec(params=", ".join(f"param{i}" for i in range(n))), True),
+    "class": (lambda n: mygen.ClassSpec(methods=cycle(["__init__", "do_something"], n)), True),
+    "script": (lambda n: mygen.ScriptSpec(), False),
+    "gui_app": (lambda n: mygen.GuiAppSpec(
+        widgets=", ".join(["Label", "Entry", "Button", "Text", "Checkbutton"][i % 5] for i in range(n))), True),
+    "data_processing": (lambda n: mygen.DataProcessingSpec(
+        processing_steps=cycle(["clean", "transform", "analyze"], n)), True),
+    "data_processing_streaming": (lambda n: mygen.DataProcessingSpec(
+        processing_steps=cycle(["clean", "transform", "analyze"], n), streaming=True), True),
+    "data_processing_parallel": (lambda n: mygen.DataProcessingSpec(
+        processing_steps=cycle(["clean", "transform", "analyze"], n), parallel=True), True),
+    "data_processing_polars": (lambda n: mygen.DataProcessingSpec(
+        processing_steps=cycle(["clean", "transform", "analyze"], n), backend="Polars"), True),
+    "web_scraper": (lambda n: mygen.WebScraperSpec(scrape_data=cycle(["titles", "links"], n)), True),
+    "web_scraper_async": (lambda n: mygen.WebScraperSpec(scrape_data=cycle(["titles", "links"], n), library="aiohttp"), True),
+    "web_scraper_scrapy": (lambda n: mygen.WebScraperSpec(scrape_data=cycle(["titles", "links"], n), library="Scrapy"), True),
+    "web_scraper_streaming": (lambda n: mygen.WebScraperSpec(scrape_data=cycle(["titles", "links"], n), streaming=True), True),
+    "web_scraper_crawl": (lambda n: mygen.WebScraperSpec(scrape_data=cycle(["titles", "links"], n), library="aiohttp", crawl=True), True),
+}
+
+def time_render(spec, min_time, min_repeats):
+    """Render spec repeatedly; returns (list of per-render seconds, output size)."""
+    timings = []
+    size = 0
+    started = time.perf_counter()
+    while len(timings) < min_repeats or time.perf_counter() - started < min_time:
+        mygen.clear_fragment_caches()
+        start = time.perf_counter()
+        code = mygen.render(spec)
+        timings.append(time.perf_counter() - start)
+        size = len(code.encode("utf-8"))
+    return timings, size
+
+def peak_memory(spec):
+    mygen.clear_fragment_caches()
+    tracemalloc.start()
+    try:
+        mygen.render(spec)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(args):
+    results = []
+    for generator in args.generators:
+        make_spec, scales = GENERATORS[generator]
+        for size in (args.sizes if scales else [1]):
+            spec = make_spec(size)
+            timings, output_bytes = time_render(spec, args.min_time, args.repeats)
+            best = min(timings)
+            result = {
+                "generator": generator,
+                "size": size,
+                "repeats": len(timings),
+                "min_s": best,
+                "mean_s": sum(timings) / len(timings),
+                "renders_per_s": 1 / best if best else float("inf"),
+                "items_per_s": size / best if best else float("inf"),
+                "output_bytes": output_bytes,
+                "output_mb_per_s": output_bytes / best / 1e6 if best else float("inf"),
+                "peak_memory_bytes": peak_memory(spec),
+            }
+            results.append(result)
+            print(f"{generator:<16} size={size:<6} {best * 1000:10.3f} ms  "
+                  f"{result['items_per_s']:12.0f} items/s  {result['output_mb_per_s']:7.1f} MB/s  "
+                  f"peak {result['peak_memory_bytes'] / 1024:9.1f} KiB")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+    return 0
+
+def compare(args):
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = {(r["generator"], r["size"]): r for r in json.load(f)["results"]}
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = {(r["generator"], r["size"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key]["min_s"], current[key]["min_s"]
+        change = (after - before) / before if before else 0.0
+        memory_before = baseline[key]["peak_memory_bytes"]
+        memory_change = (current[key]["peak_memory_bytes"] - memory_before) / memory_before if memory_before else 0.0
+        flag = ""
+        if change > args.threshold or memory_change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key[0]:<16} size={key[1]:<6} {before * 1000:10.3f} -> {after * 1000:10.3f} ms "
+              f"({change:+7.1%})  memory {memory_change:+7.1%}{flag}")
+
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{key[0]:<16} size={key[1]:<6} only in {'baseline' if key in baseline else 'current'}")
+
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the mygen code generators")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Time every generator across spec sizes")
+    run_parser.add_argument("-o", "--output", default="bench_results.json", help="JSON file to save results to")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Spec sizes to render")
+    run_parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds spent per measurement")
+    run_parser.add_argument("--repeats", type=int, default=3, help="Minimum renders per measurement")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Allowed slowdown / memory growth as a fraction (default 0.10)")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
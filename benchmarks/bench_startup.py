@@ -0,0 +1,92 @@
+"""Measure time-to-first-output of the mygen command line.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --binary dist/mygen-cli/mygen-cli --runs 20 -o startup.json
+
+Each target is launched as a fresh process running "render" on a small
+record; the harness records the time until the first byte arrives on
+stdout and the time until the process exits. The script target is always
+measured; frozen builds are added with --binary (build one with
+"pyinstaller mygen_cli.spec"). It also checks that the headless import
+path does not load tkinter.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "mygen.py")
+
+RECORD = {"code_type": "Function", "name": "startup_probe", "params": "a, b", "return_value": "a + b"}
+
+def time_to_first_output(command):
+    """Run command once; returns (seconds to first stdout byte, seconds to exit)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    first = process.stdout.read(1)
+    first_output = time.perf_counter() - start
+    process.stdout.read()
+    _, stderr = process.communicate()
+    total = time.perf_counter() - start
+    if process.returncode != 0 or not first:
+        raise RuntimeError(f"{command[0]} failed: {stderr.decode(errors='replace').strip()}")
+    return first_output, total
+
+def measure(name, command, runs, warmup):
+    for _ in range(warmup):
+        time_to_first_output(command)
+    samples = [time_to_first_output(command) for _ in range(runs)]
+    first = [sample[0] for sample in samples]
+    total = [sample[1] for sample in samples]
+    result = {
+        "target": name,
+        "command": command,
+        "runs": runs,
+        "first_output_min_s": min(first),
+        "first_output_median_s": statistics.median(first),
+        "exit_median_s": statistics.median(total),
+    }
+    print(f"{name:<10} first output: min {min(first) * 1000:8.1f} ms  median {statistics.median(first) * 1000:8.1f} ms  "
+          f"exit median {statistics.median(total) * 1000:8.1f} ms")
+    return result
+
+def headless_imports_tk(python):
+    probe = "import sys; import mygen; print('tkinter' in sys.modules)"
+    output = subprocess.run([python, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return output.stdout.strip() == "True"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure mygen command-line startup time")
+    parser.add_argument("--binary", action="append", default=[], help="Frozen mygen executable to measure as well")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter used for the script target")
+    parser.add_argument("--runs", type=int, default=10, help="Measured launches per target")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured launches per target (fills OS caches)")
+    parser.add_argument("-o", "--output", help="Save results as JSON")
+    args = parser.parse_args(argv)
+
+    imports_tk = headless_imports_tk(args.python)
+    print(f"headless import loads tkinter: {imports_tk}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        record_file = os.path.join(tmp, "record.json")
+        with open(record_file, 'w', encoding='utf-8') as f:
+            json.dump(RECORD, f)
+
+        results = [measure("script", [args.python, SCRIPT, "render", record_file], args.runs, args.warmup)]
+        for binary in args.binary:
+            results.append(measure(os.path.basename(binary), [binary, "render", record_file], args.runs, args.warmup))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"headless_imports_tkinter": imports_tk, "results": results}, f, indent=2)
+        print(f"Results saved to {args.output}")
+    return 1 if imports_tk else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
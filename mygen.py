@@ -1,1116 +1,3999 @@
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox, filedialog
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
+from itertools import islice, product
+import argparse
+import bisect
+import builtins
 import json
 import os
+import re
+import sys
+import textwrap
+import time
+import warnings
 
-class CodeGeneratorApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Python Code Generator")
-        self.root.geometry("900x700")
-        
-        # Configure styles
-        self.style = ttk.Style()
-        self.style.configure('TFrame', background='#f0f0f0')
-        self.style.configure('TLabel', background='#f0f0f0', font=('Arial', 10))
-        self.style.configure('TButton', font=('Arial', 10))
-        self.style.configure('Header.TLabel', font=('Arial', 12, 'bold'))
-        
-        # Create main container
-        self.main_frame = ttk.Frame(root)
-        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Left panel - Code Generation Options
-        self.options_frame = ttk.LabelFrame(self.main_frame, text="Code Generation Options", padding=10)
-        self.options_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
-        
-        # Right panel - Code Preview and Output
-        self.output_frame = ttk.LabelFrame(self.main_frame, text="Generated Code", padding=10)
-        self.output_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Initialize UI components
-        self.create_options_panel()
-        self.create_output_panel()
-        
-        # Load templates
-        self.templates = self.load_templates()
-        
-    def create_options_panel(self):
-        # Code type selection
-        ttk.Label(self.options_frame, text="Code Type:", style='Header.TLabel').grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
-        
-        self.code_type = tk.StringVar()
-        code_types = ['Function', 'Class', 'Script', 'GUI Application', 'Data Processing', 'Web Scraper']
-        self.code_type_combobox = ttk.Combobox(self.options_frame, textvariable=self.code_type, values=code_types, state='readonly')
-        self.code_type_combobox.grid(row=1, column=0, sticky=tk.EW, pady=(0, 10))
-        self.code_type_combobox.current(0)
-        self.code_type_combobox.bind('<<ComboboxSelected>>', self.update_options)
-        
-        # Options frame (will be populated dynamically)
-        self.dynamic_options_frame = ttk.Frame(self.options_frame)
-        self.dynamic_options_frame.grid(row=2, column=0, sticky=tk.EW)
-        
-        # Generate button
-        self.generate_button = ttk.Button(self.options_frame, text="Generate Code", command=self.generate_code)
-        self.generate_button.grid(row=3, column=0, pady=20)
-        
-        # Save button
-        self.save_button = ttk.Button(self.options_frame, text="Save Code", command=self.save_code)
-        self.save_button.grid(row=4, column=0, pady=5)
-        
-        # Template management
-        ttk.Label(self.options_frame, text="Templates:", style='Header.TLabel').grid(row=5, column=0, sticky=tk.W, pady=(20, 5))
-        
-        self.template_name = tk.StringVar()
-        ttk.Entry(self.options_frame, textvariable=self.template_name).grid(row=6, column=0, sticky=tk.EW, pady=(0, 5))
-        
-        self.save_template_button = ttk.Button(self.options_frame, text="Save as Template", command=self.save_template)
-        self.save_template_button.grid(row=7, column=0, pady=5)
-        
-        self.load_template_button = ttk.Button(self.options_frame, text="Load Template", command=self.load_template)
-        self.load_template_button.grid(row=8, column=0, pady=5)
-        
-    def create_output_panel(self):
-        # Code display
-        self.code_display = scrolledtext.ScrolledText(self.output_frame, wrap=tk.WORD, width=80, height=30, font=('Courier New', 10))
-        self.code_display.pack(fill=tk.BOTH, expand=True)
-        
-        # Copy button
-        self.copy_button = ttk.Button(self.output_frame, text="Copy to Clipboard", command=self.copy_to_clipboard)
-        self.copy_button.pack(side=tk.LEFT, pady=5)
-        
-        # Clear button
-        self.clear_button = ttk.Button(self.output_frame, text="Clear", command=self.clear_code)
-        self.clear_button.pack(side=tk.RIGHT, pady=5)
-    
-    def update_options(self, event=None):
-        # Clear previous options
-        for widget in self.dynamic_options_frame.winfo_children():
-            widget.destroy()
-        
-        code_type = self.code_type.get()
-        row = 0
-        
-        # Common options
-        ttk.Label(self.dynamic_options_frame, text="Function/Class Name:").grid(row=row, column=0, sticky=tk.W)
-        self.name_var = tk.StringVar(value="my_" + code_type.lower().replace(" ", "_"))
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.name_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Description:").grid(row=row, column=0, sticky=tk.W)
-        self.desc_var = tk.StringVar(value=f"A {code_type.lower()}")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.desc_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        # Type-specific options
-        if code_type == "Function":
-            self.setup_function_options(row)
-        elif code_type == "Class":
-            self.setup_class_options(row)
-        elif code_type == "Script":
-            self.setup_script_options(row)
-        elif code_type == "GUI Application":
-            self.setup_gui_options(row)
-        elif code_type == "Data Processing":
-            self.setup_data_processing_options(row)
-        elif code_type == "Web Scraper":
-            self.setup_web_scraper_options(row)
-    
-    def setup_function_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="Parameters:").grid(row=row, column=0, sticky=tk.W)
-        self.params_var = tk.StringVar(value="param1, param2='default'")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.params_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Return Value:").grid(row=row, column=0, sticky=tk.W)
-        self.return_var = tk.StringVar(value="None")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.return_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Docstring:").grid(row=row, column=0, sticky=tk.W)
-        self.docstring_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.docstring_var).grid(row=row, column=1, sticky=tk.W)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Example:").grid(row=row, column=0, sticky=tk.W)
-        self.example_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.example_var).grid(row=row, column=1, sticky=tk.W)
-    
-    def setup_class_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="Parent Class:").grid(row=row, column=0, sticky=tk.W)
-        self.parent_var = tk.StringVar(value="object")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.parent_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Methods:").grid(row=row, column=0, sticky=tk.W)
-        self.methods_var = tk.StringVar(value="__init__, do_something")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.methods_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Docstring:").grid(row=row, column=0, sticky=tk.W)
-        self.docstring_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.docstring_var).grid(row=row, column=1, sticky=tk.W)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Example Usage:").grid(row=row, column=0, sticky=tk.W)
-        self.example_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.example_var).grid(row=row, column=1, sticky=tk.W)
-    
-    def setup_script_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="Script Purpose:").grid(row=row, column=0, sticky=tk.W)
-        self.purpose_var = tk.StringVar(value="Process data")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.purpose_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Input Type:").grid(row=row, column=0, sticky=tk.W)
-        self.input_type_var = tk.StringVar(value="file")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.input_type_var, 
-                     values=["file", "user input", "API", "database"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Output Type:").grid(row=row, column=0, sticky=tk.W)
-        self.output_type_var = tk.StringVar(value="console")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.output_type_var, 
-                     values=["console", "file", "database", "API"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Error Handling:").grid(row=row, column=0, sticky=tk.W)
-        self.error_handling_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.error_handling_var).grid(row=row, column=1, sticky=tk.W)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Logging:").grid(row=row, column=0, sticky=tk.W)
-        self.logging_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.logging_var).grid(row=row, column=1, sticky=tk.W)
-    
-    def setup_gui_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="GUI Framework:").grid(row=row, column=0, sticky=tk.W)
-        self.gui_framework_var = tk.StringVar(value="Tkinter")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.gui_framework_var, 
-                    values=["Tkinter", "PyQt", "Kivy", "PyGTK"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Main Widgets:").grid(row=row, column=0, sticky=tk.W)
-        self.widgets_var = tk.StringVar(value="Label, Entry, Button")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.widgets_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Window Title:").grid(row=row, column=0, sticky=tk.W)
-        self.window_title_var = tk.StringVar(value="My Application")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.window_title_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Main Loop:").grid(row=row, column=0, sticky=tk.W)
-        self.main_loop_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.main_loop_var).grid(row=row, column=1, sticky=tk.W)
-    
-    def setup_data_processing_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="Data Source:").grid(row=row, column=0, sticky=tk.W)
-        self.data_source_var = tk.StringVar(value="CSV file")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.data_source_var, 
-                    values=["CSV file", "Excel file", "JSON file", "Database", "API"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Processing Steps:").grid(row=row, column=0, sticky=tk.W)
-        self.processing_steps_var = tk.StringVar(value="clean, transform, analyze")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.processing_steps_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Output Format:").grid(row=row, column=0, sticky=tk.W)
-        self.output_format_var = tk.StringVar(value="CSV")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.output_format_var, 
-                    values=["CSV", "Excel", "JSON", "Database", "Plot"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Include Visualization:").grid(row=row, column=0, sticky=tk.W)
-        self.visualization_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(self.dynamic_options_frame, variable=self.visualization_var).grid(row=row, column=1, sticky=tk.W)
-    
-    def setup_web_scraper_options(self, row):
-        ttk.Label(self.dynamic_options_frame, text="Target Website:").grid(row=row, column=0, sticky=tk.W)
-        self.website_var = tk.StringVar(value="example.com")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.website_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Data to Scrape:").grid(row=row, column=0, sticky=tk.W)
-        self.scrape_data_var = tk.StringVar(value="titles, links")
-        ttk.Entry(self.dynamic_options_frame, textvariable=self.scrape_data_var).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Library:").grid(row=row, column=0, sticky=tk.W)
-        self.scraper_lib_var = tk.StringVar(value="BeautifulSoup")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.scraper_lib_var, 
-                    values=["BeautifulSoup", "Scrapy", "Selenium", "Requests"]).grid(row=row, column=1, sticky=tk.EW)
-        row += 1
-        
-        ttk.Label(self.dynamic_options_frame, text="Output Format:").grid(row=row, column=0, sticky=tk.W)
-        self.scraper_output_var = tk.StringVar(value="CSV")
-        ttk.Combobox(self.dynamic_options_frame, textvariable=self.scraper_output_var, 
-                    values=["CSV", "JSON", "Database", "Console"]).grid(row=row, column=1, sticky=tk.EW)
-    
-    def generate_code(self):
-        code_type = self.code_type.get()
-        
-        if code_type == "Function":
-            code = self.generate_function()
-        elif code_type == "Class":
-            code = self.generate_class()
-        elif code_type == "Script":
-            code = self.generate_script()
-        elif code_type == "GUI Application":
-            code = self.generate_gui_app()
-        elif code_type == "Data Processing":
-            code = self.generate_data_processing()
-        elif code_type == "Web Scraper":
-            code = self.generate_web_scraper()
+# ---------------------------------------------------------------------------
+# Headless generation engine
+#
+# Each code type is described by a plain spec object whose fields mirror the
+# keys written to code_templates.json, and rendered by a pure function that
+# returns the generated source. Nothing in this module imports Tk (the GUI
+# lives in mygen_gui.py), so specs can be rendered from scripts, batch jobs
+# or worker processes.
+# ---------------------------------------------------------------------------
+
+@dataclass
+class FunctionSpec:
+    code_type = "Function"
+    name: str = "my_function"
+    description: str = "A function"
+    params: str = "param1, param2='default'"
+    return_value: str = "None"
+    docstring: bool = True
+    example: bool = True
+
+@dataclass
+class ClassSpec:
+    code_type = "Class"
+    name: str = "my_class"
+    description: str = "A class"
+    parent: str = "object"
+    methods: str = "__init__, do_something"
+    docstring: bool = True
+    example: bool = True
+
+@dataclass
+class ScriptSpec:
+    code_type = "Script"
+    name: str = "my_script"
+    description: str = "A script"
+    purpose: str = "Process data"
+    input_type: str = "file"
+    output_type: str = "console"
+    error_handling: bool = True
+    logging: bool = True
+
+@dataclass
+class GuiAppSpec:
+    code_type = "GUI Application"
+    name: str = "my_gui_application"
+    description: str = "A gui application"
+    framework: str = "Tkinter"
+    widgets: str = "Label, Entry, Button"
+    window_title: str = "My Application"
+    main_loop: bool = True
+
+@dataclass
+class DataProcessingSpec:
+    code_type = "Data Processing"
+    name: str = "my_data_processing"
+    description: str = "A data processing"
+    data_source: str = "CSV file"
+    processing_steps: str = "clean, transform, analyze"
+    output_format: str = "CSV"
+    visualization: bool = False
+    streaming: bool = False
+    rows_per_chunk: int = 100000
+    columns: str = ""
+    parallel: bool = False
+    quiet: bool = False
+    backend: str = "pandas"
+
+@dataclass
+class WebScraperSpec:
+    code_type = "Web Scraper"
+    name: str = "my_web_scraper"
+    description: str = "A web scraper"
+    website: str = "example.com"
+    scrape_data: str = "titles, links"
+    library: str = "BeautifulSoup"
+    output_format: str = "CSV"
+    pooled_session: bool = False
+    http_cache: bool = False
+    streaming: bool = False
+    crawl: bool = False
+
+# Fixed choices of the combobox options, per code type and spec field.
+# The GUI offers these values and sweeps enumerate them (bool fields are
+# swept over True/False automatically).
+SPEC_CHOICES = {
+    "Script": {
+        "input_type": ["file", "user input", "API", "database"],
+        "output_type": ["console", "file", "database", "API"],
+    },
+    "GUI Application": {
+        "framework": ["Tkinter", "PyQt", "Kivy", "PyGTK"],
+    },
+    "Data Processing": {
+        "data_source": ["CSV file", "Excel file", "JSON file", "Database", "API",
+                        "Parquet file", "Feather file", "Arrow IPC file"],
+        "output_format": ["CSV", "Excel", "JSON", "Database", "Plot", "Parquet", "Feather", "Arrow"],
+        "backend": ["pandas", "Polars"],
+    },
+    "Web Scraper": {
+        "library": ["BeautifulSoup", "Scrapy", "Selenium", "Requests", "aiohttp", "httpx"],
+        "output_format": ["CSV", "JSON", "Database", "Console"],
+    },
+}
+
+class CodeBuilder:
+    """Collects generated lines with indentation tracking and joins them once.
+
+    Appending to a list and joining at the end keeps rendering linear in the
+    size of the output, unlike repeated ``code +=`` concatenation. When a
+    chunk_size is given, render functions periodically drain() the buffer so
+    output can be streamed with memory bounded by the chunk size.
+    """
+
+    def __init__(self, chunk_size=None, indent_unit="    "):
+        self.chunk_size = chunk_size
+        self._parts = []
+        self._size = 0
+        self._indent_unit = indent_unit
+        self._level = 0
+        self._prefix = ""
+
+    def line(self, text=""):
+        """Append one line at the current indentation (blank lines stay empty)."""
+        part = self._prefix + text + "\n" if text else "\n"
+        self._parts.append(part)
+        self._size += len(part)
+
+    def blank(self, count=1):
+        self._parts.append("\n" * count)
+        self._size += count
+
+    def raw(self, text):
+        """Append pre-rendered text (e.g. a cached fragment) exactly as given."""
+        self._parts.append(text)
+        self._size += len(text)
+
+    def block(self, text):
+        """Append a triple-quoted block, dedented and re-indented to the current level."""
+        for text_line in textwrap.dedent(text).strip("\n").split("\n"):
+            self.line(text_line.rstrip())
+
+    def indent(self, levels=1):
+        self._level += levels
+        self._prefix = self._indent_unit * self._level
+
+    def dedent(self, levels=1):
+        self._level = max(0, self._level - levels)
+        self._prefix = self._indent_unit * self._level
+
+    @contextmanager
+    def indented(self, levels=1):
+        self.indent(levels)
+        try:
+            yield self
+        finally:
+            self.dedent(levels)
+
+    def drain(self, final=False):
+        """Yield the buffered text as one chunk once it reaches chunk_size.
+
+        With final=True anything still buffered is yielded regardless of size.
+        """
+        if self._parts and (final or (self.chunk_size is not None and self._size >= self.chunk_size)):
+            chunk = "".join(self._parts)
+            self._parts = []
+            self._size = 0
+            yield chunk
+
+    def getvalue(self):
+        return "".join(self._parts)
+
+# Per-item fragments are memoized so re-rendering a large spec after a small
+# edit (e.g. live preview while typing) only formats the items that changed.
+FRAGMENT_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def class_method_fragment(method):
+    """Source for one generated stub method, indented for a class body."""
+    return (
+        f"    def {method}(self):\n"
+        f'        """TODO: Document this method."""\n'
+        f"        # TODO: Implement method logic\n"
+        f"        pass\n"
+        f"\n"
+    )
+
+def render_optimize_loop(out):
+    """Loop shrinking every column of data to its most compact exact dtype."""
+    out.block('''
+        data = data.copy(deep=False)
+        for column in data.columns:
+            values = data[column]
+            if pd.api.types.is_integer_dtype(values.dtype):
+                data[column] = pd.to_numeric(values, downcast="integer")
+            elif pd.api.types.is_float_dtype(values.dtype):
+                narrow = values.astype("float32")
+                if narrow.astype(values.dtype).equals(values):
+                    data[column] = narrow
+            elif values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+                if values.nunique() < len(values) // 2:
+                    data[column] = values.astype("category")
+    ''')
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def data_step_fragment(step, streaming=False):
+    """Source for the module-level function implementing one processing step."""
+    if streaming:
+        return streaming_data_step_fragment(step)
+    step_name = step.lower().replace(" ", "_")
+    out = CodeBuilder()
+    out.line(f"def {step_name}_data(data):")
+    with out.indented():
+        out.line(f'"""{step.capitalize()} the data."""')
+
+        if step == "clean":
+            out.block('''
+                # Handle missing values
+                data = data.dropna()
+                # Remove duplicates
+                data = data.drop_duplicates()
+                return data
+            ''')
+        elif step == "transform":
+            out.block('''
+                # Example transformation: normalize numeric columns
+                numeric_cols = data.select_dtypes(include=["number"]).columns
+                data[numeric_cols] = (data[numeric_cols] - data[numeric_cols].mean()) / data[numeric_cols].std()
+                return data
+            ''')
+        elif step == "analyze":
+            out.block('''
+                # Perform analysis
+                analysis = data.describe()
+                # Add custom analysis as needed
+                return analysis
+            ''')
+        elif step == "optimize":
+            out.block('''
+                # Shrink dtypes: the smallest integer type that fits, float32 where it
+                # is exact, and categoricals for text columns that repeat a lot
+                before = data.memory_usage(deep=True).sum()
+            ''')
+            render_optimize_loop(out)
+            out.block('''
+                after = data.memory_usage(deep=True).sum()
+                print(f"Memory: {before / 2**20:.1f} MB -> {after / 2**20:.1f} MB ({1 - after / max(before, 1):.0%} less)")
+                return data
+            ''')
+        else:
+            out.line(f"# TODO: Implement {step} logic")
+            out.line("return data")
+    out.blank()
+    return out.getvalue()
+
+def streaming_data_step_fragment(step):
+    """Per-chunk version of a processing step for streaming scripts.
+
+    Steps take the chunk plus a state dict shared across chunks; analyze
+    instead folds the chunk into a RunningStats and returns it.
+    """
+    step_name = step.lower().replace(" ", "_")
+    out = CodeBuilder()
+    if step == "analyze":
+        out.block('''
+            def analyze_data(data, stats):
+                """Analyze one chunk of the data."""
+                # Fold the chunk into mergeable running statistics
+                return stats.merge(RunningStats.from_frame(data))
+        ''')
+        out.blank()
+        return out.getvalue()
+
+    out.line(f"def {step_name}_data(data, state):")
+    with out.indented():
+        out.line(f'"""{step.capitalize()} one chunk of the data."""')
+
+        if step == "clean":
+            out.block('''
+                # Handle missing values
+                data = data.dropna()
+                # Remove duplicates, including rows already seen in earlier chunks
+                seen = state.setdefault("seen_rows", SeenRows())
+                return data[seen.add_new(pd.util.hash_pandas_object(data, index=False).to_numpy())]
+            ''')
+        elif step == "transform":
+            out.block('''
+                # Example transformation: normalize numeric columns with whole-dataset
+                # statistics (gathered by a first pass in main), else this data's own
+                stats = state.get("stats") or RunningStats.from_frame(data)
+                numeric_cols = data.select_dtypes(include=["number"]).columns.intersection(stats.mean.index)
+                data = data.copy()
+                data[numeric_cols] = (data[numeric_cols] - stats.mean[numeric_cols]) / stats.std()[numeric_cols]
+                return data
+            ''')
+        elif step == "optimize":
+            out.line("# Shrink this chunk's dtypes (every chunk is narrowed on its own): the smallest")
+            out.line("# integer type that fits, float32 where it is exact, categoricals for repeated text")
+            render_optimize_loop(out)
+            out.line("return data")
+        else:
+            out.line(f"# TODO: Implement {step} logic (called once per chunk)")
+            out.line("return data")
+    out.blank()
+    return out.getvalue()
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def lazy_data_step_fragment(step):
+    """Polars version of a processing step: takes and returns a LazyFrame.
+
+    Steps only add to the query plan; nothing runs until it is collected or
+    sunk into the output file.
+    """
+    step_name = step.lower().replace(" ", "_")
+    out = CodeBuilder()
+    out.line(f"def {step_name}_data(data):")
+    with out.indented():
+        out.line(f'"""{step.capitalize()} the data."""')
+
+        if step == "clean":
+            out.block('''
+                # Drop rows with missing values, then duplicates (keeping the first)
+                return data.drop_nulls().unique(keep="first", maintain_order=True)
+            ''')
+        elif step == "transform":
+            out.block('''
+                # Example transformation: normalize numeric columns
+                numeric = cs.numeric().as_expr()
+                return data.with_columns((numeric - numeric.mean()) / numeric.std())
+            ''')
+        elif step == "analyze":
+            out.block('''
+                # Summary statistics as part of the same plan, one row per statistic
+                numeric = data.select(cs.numeric())
+                statistics = {
+                    "count": pl.all().count(),
+                    "mean": pl.all().mean(),
+                    "std": pl.all().std(),
+                    "min": pl.all().min(),
+                    "25%": pl.all().quantile(0.25, interpolation="linear"),
+                    "50%": pl.all().median(),
+                    "75%": pl.all().quantile(0.75, interpolation="linear"),
+                    "max": pl.all().max(),
+                }
+                return pl.concat([
+                    numeric.select(pl.lit(name).alias("statistic"), expr.cast(pl.Float64))
+                    for name, expr in statistics.items()
+                ])
+            ''')
+        elif step == "optimize":
+            out.block('''
+                # Text columns become categoricals, storing each distinct string once
+                # (integer widths depend on the data, which a lazy plan has not seen)
+                return data.with_columns(cs.string().as_expr().cast(pl.Categorical))
+            ''')
         else:
-            code = "# Select a code type to generate"
-        
-        self.code_display.delete(1.0, tk.END)
-        self.code_display.insert(tk.END, code)
-    
-    def generate_function(self):
-        name = self.name_var.get()
-        params = self.params_var.get()
-        return_val = self.return_var.get()
-        desc = self.desc_var.get()
-        include_docstring = self.docstring_var.get()
-        include_example = self.example_var.get()
-        
-        code = f"def {name}({params}):\n"
-        
-        if include_docstring:
-            code += f'    """{desc}\n\n'
-            code += f'    Args:\n'
-            
+            out.line(f"# TODO: Implement {step} logic")
+            out.line("return data")
+    out.blank()
+    return out.getvalue()
+
+def clear_fragment_caches():
+    """Drop all memoized fragments (used by benchmarks to measure cold renders)."""
+    class_method_fragment.cache_clear()
+    data_step_fragment.cache_clear()
+    lazy_data_step_fragment.cache_clear()
+
+def split_list(value):
+    """Split a comma-separated option string the way the option widgets expect."""
+    return [item.strip() for item in value.split(',')]
+
+def iter_render_function(spec, chunk_size=None):
+    name = spec.name
+    params = spec.params
+    return_val = spec.return_value
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"def {name}({params}):")
+
+    with out.indented():
+        if spec.docstring:
+            out.line(f'"""{spec.description}')
+            out.blank()
+            out.line("Args:")
+
             # Add parameter descriptions
-            for param in params.split(','):
-                param = param.strip().split('=')[0]
-                if param:
-                    code += f'        {param}: Description of {param}\n'
-            
-            code += f'\n    Returns:\n'
-            code += f'        {return_val}: Description of return value\n'
-            code += '    """\n\n'
-        
+            with out.indented():
+                for param in params.split(','):
+                    param = param.strip().split('=')[0]
+                    if param:
+                        out.line(f"{param}: Description of {param}")
+                    yield from out.drain()
+
+            out.blank()
+            out.line("Returns:")
+            out.line(f"    {return_val}: Description of return value")
+            out.line('"""')
+            out.blank()
+
         # Function body
-        code += f'    # TODO: Implement function logic\n'
-        code += f'    return {return_val}\n\n'
-        
-        if include_example:
-            code += f'# Example usage:\n'
-            example_params = ', '.join([p.strip().split('=')[0] for p in params.split(',') if p.strip()])
-            code += f'result = {name}({example_params})\n'
-            code += f'print(result)\n'
-        
-        return code
-    
-    def generate_class(self):
-        name = self.name_var.get()
-        parent = self.parent_var.get()
-        methods = [m.strip() for m in self.methods_var.get().split(',')]
-        desc = self.desc_var.get()
-        include_docstring = self.docstring_var.get()
-        include_example = self.example_var.get()
-        
-        code = f"class {name}({parent}):\n"
-        
-        if include_docstring:
-            code += f'    """{desc}\n    """\n\n'
-        
+        out.line("# TODO: Implement function logic")
+        out.line(f"return {return_val}")
+    out.blank()
+
+    if spec.example:
+        example_params = ', '.join([p.strip().split('=')[0] for p in params.split(',') if p.strip()])
+        out.line("# Example usage:")
+        out.line(f"result = {name}({example_params})")
+        out.line("print(result)")
+
+    yield from out.drain(final=True)
+
+def iter_render_class(spec, chunk_size=None):
+    name = spec.name
+    methods = split_list(spec.methods)
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"class {name}({spec.parent}):")
+
+    with out.indented():
+        if spec.docstring:
+            out.line(f'"""{spec.description}')
+            out.line('"""')
+            out.blank()
+
         # __init__ method
         if "__init__" in methods:
-            code += f'    def __init__(self):\n'
-            code += f'        """Initialize the {name} instance."""\n'
-            code += f'        super().__init__()\n'
-            code += f'        # TODO: Initialize attributes\n\n'
-        
+            out.line("def __init__(self):")
+            with out.indented():
+                out.line(f'"""Initialize the {name} instance."""')
+                out.line("super().__init__()")
+                out.line("# TODO: Initialize attributes")
+            out.blank()
+
         # Other methods
         for method in methods:
             if method != "__init__":
-                code += f'    def {method}(self):\n'
-                code += f'        """TODO: Document this method."""\n'
-                code += f'        # TODO: Implement method logic\n'
-                code += f'        pass\n\n'
-        
-        if include_example:
-            code += f'# Example usage:\n'
-            code += f'obj = {name}()\n'
-            if len(methods) > 1 and methods[1] != "__init__":
-                code += f'obj.{methods[1]}()\n'
-        
-        return code
-    
-    def generate_script(self):
-        name = self.name_var.get()
-        purpose = self.purpose_var.get()
-        input_type = self.input_type_var.get()
-        output_type = self.output_type_var.get()
-        include_error_handling = self.error_handling_var.get()
-        include_logging = self.logging_var.get()
-        
-        code = f'#!/usr/bin/env python3\n'
-        code += f'# {name}.py - {purpose}\n\n'
-        code += f'import sys\n'
-        
-        if include_logging:
-            code += f'import logging\n\n'
-            code += f'# Configure logging\n'
-            code += f'logging.basicConfig(\n'
-            code += f'    level=logging.INFO,\n'
-            code += f'    format="%(asctime)s - %(levelname)s - %(message)s"\n'
-            code += f')\n'
-            code += f'logger = logging.getLogger(__name__)\n\n'
-        
-        # Input handling
-        code += f'def get_input():\n'
-        code += f'    """Get input data based on configuration."""\n'
-        
+                out.raw(class_method_fragment(method))
+            yield from out.drain()
+
+    if spec.example:
+        out.line("# Example usage:")
+        out.line(f"obj = {name}()")
+        if len(methods) > 1 and methods[1] != "__init__":
+            out.line(f"obj.{methods[1]}()")
+
+    yield from out.drain(final=True)
+
+def iter_render_script(spec, chunk_size=None):
+    input_type = spec.input_type
+    output_type = spec.output_type
+    include_logging = spec.logging
+
+    out = CodeBuilder(chunk_size)
+    out.line("#!/usr/bin/env python3")
+    out.line(f"# {spec.name}.py - {spec.purpose}")
+    out.blank()
+    out.line("import sys")
+
+    if include_logging:
+        out.block('''
+            import logging
+
+            # Configure logging
+            logging.basicConfig(
+                level=logging.INFO,
+                format="%(asctime)s - %(levelname)s - %(message)s"
+            )
+            logger = logging.getLogger(__name__)
+        ''')
+        out.blank()
+
+    # Input handling
+    out.line("def get_input():")
+    with out.indented():
+        out.line('"""Get input data based on configuration."""')
+
         if input_type == "file":
-            code += f'    input_file = input("Enter input file path: ")\n'
-            code += f'    try:\n'
-            code += f'        with open(input_file, "r") as f:\n'
-            code += f'            data = f.read()\n'
-            code += f'        return data\n'
-            code += f'    except FileNotFoundError:\n'
-            code += f'        print(f"Error: File {{input_file}} not found")\n'
-            code += f'        sys.exit(1)\n\n'
+            out.block('''
+                input_file = input("Enter input file path: ")
+                try:
+                    with open(input_file, "r") as f:
+                        data = f.read()
+                    return data
+                except FileNotFoundError:
+                    print(f"Error: File {input_file} not found")
+                    sys.exit(1)
+            ''')
+            out.blank()
         elif input_type == "user input":
-            code += f'    print("Enter your data (press Ctrl+D when finished):")\n'
-            code += f'    data = sys.stdin.read()\n'
-            code += f'    return data\n\n'
+            out.block('''
+                print("Enter your data (press Ctrl+D when finished):")
+                data = sys.stdin.read()
+                return data
+            ''')
+            out.blank()
         elif input_type == "API":
-            code += f'    import requests\n'
-            code += f'    url = input("Enter API URL: ")\n'
-            code += f'    try:\n'
-            code += f'        response = requests.get(url)\n'
-            code += f'        response.raise_for_status()\n'
-            code += f'        return response.json()\n'
-            code += f'    except requests.exceptions.RequestException as e:\n'
-            code += f'        print(f"API Error: {{e}}")\n'
-            code += f'        sys.exit(1)\n\n'
+            out.block('''
+                import requests
+                url = input("Enter API URL: ")
+                try:
+                    response = requests.get(url)
+                    response.raise_for_status()
+                    return response.json()
+                except requests.exceptions.RequestException as e:
+                    print(f"API Error: {e}")
+                    sys.exit(1)
+            ''')
+            out.blank()
         elif input_type == "database":
-            code += f'    import sqlite3\n'
-            code += f'    db_file = input("Enter database file path: ")\n'
-            code += f'    query = input("Enter SQL query: ")\n'
-            code += f'    try:\n'
-            code += f'        conn = sqlite3.connect(db_file)\n'
-            code += f'        cursor = conn.cursor()\n'
-            code += f'        cursor.execute(query)\n'
-            code += f'        return cursor.fetchall()\n'
-            code += f'    except sqlite3.Error as e:\n'
-            code += f'        print(f"Database Error: {{e}}")\n'
-            code += f'        sys.exit(1)\n'
-            code += f'    finally:\n'
-            code += f'        conn.close()\n\n'
-        
-        # Processing function
-        code += f'def process_data(data):\n'
-        code += f'    """Process the input data."""\n'
-        code += f'    # TODO: Implement data processing logic\n'
-        code += f'    processed_data = data  # Placeholder\n'
-        code += f'    return processed_data\n\n'
-        
-        # Output handling
-        code += f'def save_output(data):\n'
-        code += f'    """Save output data based on configuration."""\n'
-        
+            out.block('''
+                import sqlite3
+                db_file = input("Enter database file path: ")
+                query = input("Enter SQL query: ")
+                try:
+                    conn = sqlite3.connect(db_file)
+                    cursor = conn.cursor()
+                    cursor.execute(query)
+                    return cursor.fetchall()
+                except sqlite3.Error as e:
+                    print(f"Database Error: {e}")
+                    sys.exit(1)
+                finally:
+                    conn.close()
+            ''')
+            out.blank()
+
+    # Processing function
+    out.block('''
+        def process_data(data):
+            """Process the input data."""
+            # TODO: Implement data processing logic
+            processed_data = data  # Placeholder
+            return processed_data
+    ''')
+    out.blank()
+
+    # Output handling
+    out.line("def save_output(data):")
+    with out.indented():
+        out.line('"""Save output data based on configuration."""')
+
         if output_type == "console":
-            code += f'    print("Processing complete. Result:")\n'
-            code += f'    print(data)\n\n'
+            out.line('print("Processing complete. Result:")')
+            out.line("print(data)")
+            out.blank()
         elif output_type == "file":
-            code += f'    output_file = input("Enter output file path: ")\n'
-            code += f'    try:\n'
-            code += f'        with open(output_file, "w") as f:\n'
-            code += f'            f.write(str(data))\n'
-            code += f'        print(f"Data saved to {{output_file}}")\n'
-            code += f'    except IOError as e:\n'
-            code += f'        print(f"Error saving file: {{e}}")\n'
-            code += f'        sys.exit(1)\n\n'
+            out.block('''
+                output_file = input("Enter output file path: ")
+                try:
+                    with open(output_file, "w") as f:
+                        f.write(str(data))
+                    print(f"Data saved to {output_file}")
+                except IOError as e:
+                    print(f"Error saving file: {e}")
+                    sys.exit(1)
+            ''')
+            out.blank()
         elif output_type == "database":
-            code += f'    import sqlite3\n'
-            code += f'    db_file = input("Enter database file path: ")\n'
-            code += f'    table = input("Enter table name: ")\n'
-            code += f'    try:\n'
-            code += f'        conn = sqlite3.connect(db_file)\n'
-            code += f'        cursor = conn.cursor()\n'
-            code += f'        # TODO: Implement database insert logic\n'
-            code += f'        conn.commit()\n'
-            code += f'        print(f"Data saved to {{table}} table")\n'
-            code += f'    except sqlite3.Error as e:\n'
-            code += f'        print(f"Database Error: {{e}}")\n'
-            code += f'        sys.exit(1)\n'
-            code += f'    finally:\n'
-            code += f'        conn.close()\n\n'
+            out.block('''
+                import sqlite3
+                db_file = input("Enter database file path: ")
+                table = input("Enter table name: ")
+                try:
+                    conn = sqlite3.connect(db_file)
+                    cursor = conn.cursor()
+                    # TODO: Implement database insert logic
+                    conn.commit()
+                    print(f"Data saved to {table} table")
+                except sqlite3.Error as e:
+                    print(f"Database Error: {e}")
+                    sys.exit(1)
+                finally:
+                    conn.close()
+            ''')
+            out.blank()
         elif output_type == "API":
-            code += f'    import requests\n'
-            code += f'    url = input("Enter API endpoint URL: ")\n'
-            code += f'    try:\n'
-            code += f'        response = requests.post(url, json=data)\n'
-            code += f'        response.raise_for_status()\n'
-            code += f'        print("Data successfully sent to API")\n'
-            code += f'    except requests.exceptions.RequestException as e:\n'
-            code += f'        print(f"API Error: {{e}}")\n'
-            code += f'        sys.exit(1)\n\n'
-        
-        # Main function
-        code += f'def main():\n'
+            out.block('''
+                import requests
+                url = input("Enter API endpoint URL: ")
+                try:
+                    response = requests.post(url, json=data)
+                    response.raise_for_status()
+                    print("Data successfully sent to API")
+                except requests.exceptions.RequestException as e:
+                    print(f"API Error: {e}")
+                    sys.exit(1)
+            ''')
+            out.blank()
+
+    # Main function
+    out.line("def main():")
+    with out.indented():
         if include_logging:
-            code += f'    logger.info("Starting script")\n'
-        
-        if include_error_handling:
-            code += f'    try:\n'
-            code += f'        data = get_input()\n'
-            if include_logging:
-                code += f'        logger.info("Data retrieved successfully")\n'
-            
-            code += f'        processed_data = process_data(data)\n'
-            if include_logging:
-                code += f'        logger.info("Data processed successfully")\n'
-            
-            code += f'        save_output(processed_data)\n'
-            if include_logging:
-                code += f'        logger.info("Output saved successfully")\n'
-            
-            code += f'    except Exception as e:\n'
-            if include_logging:
-                code += f'        logger.error(f"Error: {{e}}", exc_info=True)\n'
-            code += f'        print(f"Error: {{e}}", file=sys.stderr)\n'
-            code += f'        sys.exit(1)\n'
+            out.line('logger.info("Starting script")')
+
+        if spec.error_handling:
+            out.line("try:")
+            with out.indented():
+                out.line("data = get_input()")
+                if include_logging:
+                    out.line('logger.info("Data retrieved successfully")')
+
+                out.line("processed_data = process_data(data)")
+                if include_logging:
+                    out.line('logger.info("Data processed successfully")')
+
+                out.line("save_output(processed_data)")
+                if include_logging:
+                    out.line('logger.info("Output saved successfully")')
+
+            out.line("except Exception as e:")
+            with out.indented():
+                if include_logging:
+                    out.line('logger.error(f"Error: {e}", exc_info=True)')
+                out.line('print(f"Error: {e}", file=sys.stderr)')
+                out.line("sys.exit(1)")
         else:
-            code += f'    data = get_input()\n'
-            code += f'    processed_data = process_data(data)\n'
-            code += f'    save_output(processed_data)\n'
-        
-        code += f'\n\nif __name__ == "__main__":\n'
-        code += f'    main()\n'
-        
-        return code
-    
-    def generate_gui_app(self):
-        name = self.name_var.get()
-        framework = self.gui_framework_var.get()
-        widgets = [w.strip() for w in self.widgets_var.get().split(',')]
-        window_title = self.window_title_var.get()
-        include_main_loop = self.main_loop_var.get()
-        
-        code = f'# {name}.py - {window_title}\n\n'
-        
-        if framework == "Tkinter":
-            code += f'import tkinter as tk\n'
-            code += f'from tkinter import ttk\n\n'
-            
-            code += f'class {name}:\n'
-            code += f'    def __init__(self, root):\n'
-            code += f'        self.root = root\n'
-            code += f'        self.root.title("{window_title}")\n'
-            code += f'        self.setup_ui()\n\n'
-            
-            code += f'    def setup_ui(self):\n'
-            code += f'        """Setup the user interface."""\n'
-            
-            for widget in widgets:
-                widget_name = widget.lower().replace(" ", "_")
-                if widget == "Label":
-                    code += f'        self.{widget_name} = ttk.Label(self.root, text="{widget}:")\n'
-                    code += f'        self.{widget_name}.grid(row={widgets.index(widget)}, column=0, padx=5, pady=5)\n'
-                elif widget == "Entry":
-                    code += f'        self.{widget_name} = ttk.Entry(self.root)\n'
-                    code += f'        self.{widget_name}.grid(row={widgets.index(widget)}, column=1, padx=5, pady=5)\n'
-                elif widget == "Button":
-                    code += f'        self.{widget_name} = ttk.Button(self.root, text="{widget}", command=self.on_button_click)\n'
-                    code += f'        self.{widget_name}.grid(row={widgets.index(widget)}, column=0, columnspan=2, pady=10)\n'
-                elif widget == "Text":
-                    code += f'        self.{widget_name} = tk.Text(self.root, height=10, width=40)\n'
-                    code += f'        self.{widget_name}.grid(row={widgets.index(widget)}, column=0, columnspan=2, padx=5, pady=5)\n'
-                elif widget == "Checkbutton":
-                    code += f'        self.{widget_name}_var = tk.BooleanVar()\n'
-                    code += f'        self.{widget_name} = ttk.Checkbutton(\n'
-                    code += f'            self.root, text="Enable feature", variable=self.{widget_name}_var\n'
-                    code += f'        )\n'
-                    code += f'        self.{widget_name}.grid(row={widgets.index(widget)}, column=0, columnspan=2, sticky=tk.W, padx=5)\n'
-            
-            code += f'\n    def on_button_click(self):\n'
-            code += f'        """Handle button click events."""\n'
-            code += f'        print("Button clicked!")\n'
-            code += f'        # TODO: Add button click logic\n\n'
-            
-            if include_main_loop:
-                code += f'if __name__ == "__main__":\n'
-                code += f'    root = tk.Tk()\n'
-                code += f'    app = {name}(root)\n'
-                code += f'    root.mainloop()\n'
-        
-        elif framework == "PyQt":
-            code += f'from PyQt5.QtWidgets import (\n'
-            code += f'    QApplication, QMainWindow, QWidget, QVBoxLayout,\n'
-            
-            qt_widgets = []
-            for widget in widgets:
-                if widget == "Label":
-                    qt_widgets.append("QLabel")
-                elif widget == "Entry":
-                    qt_widgets.append("QLineEdit")
-                elif widget == "Button":
-                    qt_widgets.append("QPushButton")
-                elif widget == "Text":
-                    qt_widgets.append("QTextEdit")
-                elif widget == "Checkbutton":
-                    qt_widgets.append("QCheckBox")
-            
-            code += f'    {", ".join(qt_widgets)}\n'
-            code += f')\n'
-            code += f'from PyQt5.QtCore import Qt\n\n'
-            
-            code += f'class {name}(QMainWindow):\n'
-            code += f'    def __init__(self):\n'
-            code += f'        super().__init__()\n'
-            code += f'        self.setWindowTitle("{window_title}")\n'
-            code += f'        self.setup_ui()\n\n'
-            
-            code += f'    def setup_ui(self):\n'
-            code += f'        """Setup the user interface."""\n'
-            code += f'        central_widget = QWidget()\n'
-            code += f'        self.setCentralWidget(central_widget)\n'
-            code += f'        layout = QVBoxLayout()\n'
-            code += f'        central_widget.setLayout(layout)\n\n'
-            
-            for widget in widgets:
-                widget_name = widget.lower().replace(" ", "_")
-                if widget == "Label":
-                    code += f'        self.{widget_name} = QLabel("{widget}")\n'
-                    code += f'        layout.addWidget(self.{widget_name})\n'
-                elif widget == "Entry":
-                    code += f'        self.{widget_name} = QLineEdit()\n'
-                    code += f'        layout.addWidget(self.{widget_name})\n'
-                elif widget == "Button":
-                    code += f'        self.{widget_name} = QPushButton("{widget}")\n'
-                    code += f'        self.{widget_name}.clicked.connect(self.on_button_click)\n'
-                    code += f'        layout.addWidget(self.{widget_name})\n'
-                elif widget == "Text":
-                    code += f'        self.{widget_name} = QTextEdit()\n'
-                    code += f'        layout.addWidget(self.{widget_name})\n'
-                elif widget == "Checkbutton":
-                    code += f'        self.{widget_name} = QCheckBox("Enable feature")\n'
-                    code += f'        layout.addWidget(self.{widget_name})\n'
-            
-            code += f'\n    def on_button_click(self):\n'
-            code += f'        """Handle button click events."""\n'
-            code += f'        print("Button clicked!")\n'
-            code += f'        # TODO: Add button click logic\n\n'
-            
-            if include_main_loop:
-                code += f'if __name__ == "__main__":\n'
-                code += f'    app = QApplication([])\n'
-                code += f'    window = {name}()\n'
-                code += f'    window.show()\n'
-                code += f'    app.exec_()\n'
-        
-        return code
-    
-    def generate_data_processing(self):
-        name = self.name_var.get()
-        data_source = self.data_source_var.get()
-        processing_steps = [s.strip() for s in self.processing_steps_var.get().split(',')]
-        output_format = self.output_format_var.get()
-        include_visualization = self.visualization_var.get()
-        
-        code = f'# {name}.py - Data Processing Script\n\n'
-        code += f'import pandas as pd\n'
-        
-        if data_source == "CSV file":
-            code += f'def load_csv_data(file_path):\n'
-            code += f'    """Load data from a CSV file."""\n'
-            code += f'    return pd.read_csv(file_path)\n\n'
-        elif data_source == "Excel file":
-            code += f'def load_excel_data(file_path, sheet_name=0):\n'
-            code += f'    """Load data from an Excel file."""\n'
-            code += f'    return pd.read_excel(file_path, sheet_name=sheet_name)\n\n'
-        elif data_source == "JSON file":
-            code += f'def load_json_data(file_path):\n'
-            code += f'    """Load data from a JSON file."""\n'
-            code += f'    return pd.read_json(file_path)\n\n'
-        elif data_source == "Database":
-            code += f'import sqlite3\n'
-            code += f'def load_db_data(db_file, query):\n'
-            code += f'    """Load data from a database."""\n'
-            code += f'    conn = sqlite3.connect(db_file)\n'
-            code += f'    data = pd.read_sql(query, conn)\n'
-            code += f'    conn.close()\n'
-            code += f'    return data\n\n'
-        elif data_source == "API":
-            code += f'import requests\n'
-            code += f'def load_api_data(url):\n'
-            code += f'    """Load data from an API."""\n'
-            code += f'    response = requests.get(url)\n'
-            code += f'    response.raise_for_status()\n'
-            code += f'    return pd.DataFrame(response.json())\n\n'
-        
-        # Processing functions
-        for step in processing_steps:
-            step_name = step.lower().replace(" ", "_")
-            code += f'def {step_name}_data(data):\n'
-            code += f'    """{step.capitalize()} the data."""\n'
-            
-            if step == "clean":
-                code += f'    # Handle missing values\n'
-                code += f'    data = data.dropna()\n'
-                code += f'    # Remove duplicates\n'
-                code += f'    data = data.drop_duplicates()\n'
-                code += f'    return data\n\n'
-            elif step == "transform":
-                code += f'    # Example transformation: normalize numeric columns\n'
-                code += f'    numeric_cols = data.select_dtypes(include=["number"]).columns\n'
-                code += f'    data[numeric_cols] = (data[numeric_cols] - data[numeric_cols].mean()) / data[numeric_cols].std()\n'
-                code += f'    return data\n\n'
-            elif step == "analyze":
-                code += f'    # Perform analysis\n'
-                code += f'    analysis = data.describe()\n'
-                code += f'    # Add custom analysis as needed\n'
-                code += f'    return analysis\n\n'
+            out.line("data = get_input()")
+            out.line("processed_data = process_data(data)")
+            out.line("save_output(processed_data)")
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+# Widget type -> PyQt class; also the set of widget types the GUI generator supports
+QT_WIDGET_CLASSES = {"Label": "QLabel", "Entry": "QLineEdit", "Button": "QPushButton",
+                     "Text": "QTextEdit", "Checkbutton": "QCheckBox"}
+
+def layout_widgets(widgets):
+    """Yield (widget, attribute name, grid row) for each supported widget.
+
+    Done in one pass: the first widget of a type is named after it ("entry"),
+    later ones get a counter suffix ("entry_2", "entry_3"), and each widget
+    gets the row of its position in the list. Unsupported types are skipped.
+    """
+    counts = dict.fromkeys(QT_WIDGET_CLASSES, 0)
+    for row, widget in enumerate(widgets):
+        count = counts.get(widget)
+        if count is None:
+            continue
+        counts[widget] = count = count + 1
+        yield widget, widget.lower() if count == 1 else f"{widget.lower()}_{count}", row
+
+def iter_render_gui_app(spec, chunk_size=None):
+    name = spec.name
+    framework = spec.framework
+    widgets = split_list(spec.widgets)
+    window_title = spec.window_title
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - {window_title}")
+    out.blank()
+
+    if framework == "Tkinter":
+        out.line("import tkinter as tk")
+        out.line("from tkinter import ttk")
+        out.blank()
+
+        out.line(f"class {name}:")
+        with out.indented():
+            out.line("def __init__(self, root):")
+            with out.indented():
+                out.line("self.root = root")
+                out.line(f'self.root.title("{window_title}")')
+                out.line("self.setup_ui()")
+            out.blank()
+
+            out.line("def setup_ui(self):")
+            with out.indented():
+                out.line('"""Setup the user interface."""')
+
+                for widget, widget_name, row in layout_widgets(widgets):
+                    if widget == "Label":
+                        out.line(f'self.{widget_name} = ttk.Label(self.root, text="{widget}:")')
+                        out.line(f'self.{widget_name}.grid(row={row}, column=0, padx=5, pady=5)')
+                    elif widget == "Entry":
+                        out.line(f'self.{widget_name} = ttk.Entry(self.root)')
+                        out.line(f'self.{widget_name}.grid(row={row}, column=1, padx=5, pady=5)')
+                    elif widget == "Button":
+                        out.line(f'self.{widget_name} = ttk.Button(self.root, text="{widget}", command=self.on_button_click)')
+                        out.line(f'self.{widget_name}.grid(row={row}, column=0, columnspan=2, pady=10)')
+                    elif widget == "Text":
+                        out.line(f'self.{widget_name} = tk.Text(self.root, height=10, width=40)')
+                        out.line(f'self.{widget_name}.grid(row={row}, column=0, columnspan=2, padx=5, pady=5)')
+                    elif widget == "Checkbutton":
+                        out.line(f'self.{widget_name}_var = tk.BooleanVar()')
+                        out.line(f'self.{widget_name} = ttk.Checkbutton(')
+                        out.line(f'    self.root, text="Enable feature", variable=self.{widget_name}_var')
+                        out.line(')')
+                        out.line(f'self.{widget_name}.grid(row={row}, column=0, columnspan=2, sticky=tk.W, padx=5)')
+                    yield from out.drain()
+
+            out.blank()
+            render_button_handler(out)
+
+        if spec.main_loop:
+            out.block(f'''
+                if __name__ == "__main__":
+                    root = tk.Tk()
+                    app = {name}(root)
+                    root.mainloop()
+            ''')
+
+    elif framework == "PyQt":
+        # Each class is imported once, however many widgets use it
+        qt_widgets = list(dict.fromkeys(QT_WIDGET_CLASSES[widget] for widget in widgets if widget in QT_WIDGET_CLASSES))
+
+        out.line("from PyQt5.QtWidgets import (")
+        out.line("    QApplication, QMainWindow, QWidget, QVBoxLayout,")
+        out.line(f"    {', '.join(qt_widgets)}")
+        out.line(")")
+        out.line("from PyQt5.QtCore import Qt")
+        out.blank()
+
+        out.line(f"class {name}(QMainWindow):")
+        with out.indented():
+            out.line("def __init__(self):")
+            with out.indented():
+                out.line("super().__init__()")
+                out.line(f'self.setWindowTitle("{window_title}")')
+                out.line("self.setup_ui()")
+            out.blank()
+
+            out.line("def setup_ui(self):")
+            with out.indented():
+                out.block('''
+                    """Setup the user interface."""
+                    central_widget = QWidget()
+                    self.setCentralWidget(central_widget)
+                    layout = QVBoxLayout()
+                    central_widget.setLayout(layout)
+                ''')
+                out.blank()
+
+                for widget, widget_name, row in layout_widgets(widgets):
+                    if widget == "Label":
+                        out.line(f'self.{widget_name} = QLabel("{widget}")')
+                    elif widget == "Entry":
+                        out.line(f'self.{widget_name} = QLineEdit()')
+                    elif widget == "Button":
+                        out.line(f'self.{widget_name} = QPushButton("{widget}")')
+                        out.line(f'self.{widget_name}.clicked.connect(self.on_button_click)')
+                    elif widget == "Text":
+                        out.line(f'self.{widget_name} = QTextEdit()')
+                    elif widget == "Checkbutton":
+                        out.line(f'self.{widget_name} = QCheckBox("Enable feature")')
+                    out.line(f'layout.addWidget(self.{widget_name})')
+                    yield from out.drain()
+
+            out.blank()
+            render_button_handler(out)
+
+        if spec.main_loop:
+            out.block(f'''
+                if __name__ == "__main__":
+                    app = QApplication([])
+                    window = {name}()
+                    window.show()
+                    app.exec_()
+            ''')
+
+    yield from out.drain(final=True)
+
+def render_button_handler(out):
+    out.block('''
+        def on_button_click(self):
+            """Handle button click events."""
+            print("Button clicked!")
+            # TODO: Add button click logic
+    ''')
+    out.blank()
+
+def render_visualize_function(out):
+    out.block('''
+        def visualize_data(data):
+            """Generate visualizations of the data."""
+            import matplotlib.pyplot as plt
+
+            # Example visualizations
+            numeric_cols = data.select_dtypes(include=["number"]).columns
+
+            if len(numeric_cols) > 0:
+                # Histograms for numeric columns
+                data[numeric_cols].hist(bins=20, figsize=(10, 8))
+                plt.tight_layout()
+                plt.show()
+
+                # Correlation heatmap if multiple numeric columns
+                if len(numeric_cols) > 1:
+                    import seaborn as sns
+                    plt.figure(figsize=(8, 6))
+                    sns.heatmap(data[numeric_cols].corr(), annot=True, cmap="coolwarm")
+                    plt.title("Correlation Heatmap")
+                    plt.show()
             else:
-                code += f'    # TODO: Implement {step} logic\n'
-                code += f'    return data\n\n'
-        
-        # Output functions
-        code += f'def save_output(data, output_file):\n'
-        code += f'    """Save processed data in the specified format."""\n'
-        
+                print("No numeric columns for visualization")
+    ''')
+    out.blank()
+
+# Output format -> file extension appended by the generated data-processing main()
+DATA_OUTPUT_EXTENSIONS = {"CSV": ".csv", "Excel": ".xlsx", "JSON": ".json", "Database": ".db", "Plot": ".png",
+                          "Parquet": ".parquet", "Feather": ".feather", "Arrow": ".arrow"}
+
+# Columnar data source -> (loader name, pyarrow.dataset format)
+COLUMNAR_SOURCES = {
+    "Parquet file": ("parquet", "parquet"),
+    "Feather file": ("feather", "feather"),
+    "Arrow IPC file": ("arrow", "ipc"),
+}
+
+# Columnar output format -> expression opening an appending writer in streaming scripts
+# (Feather V2 is the Arrow IPC file format, LZ4-compressed by default)
+COLUMNAR_WRITERS = {
+    "Parquet": "pq.ParquetWriter(output_file, schema)",
+    "Feather": 'pa.ipc.new_file(output_file, schema, options=pa.ipc.IpcWriteOptions(compression="lz4"))',
+    "Arrow": "pa.ipc.new_file(output_file, schema)",
+}
+
+def render_columnar_settings(out, columns, columnar):
+    """Module constants controlling which columns (and rows) the loaders read."""
+    if columnar or columns:
+        out.line("# Columns to read (None reads all); other columns are never parsed or decoded")
+        out.line(f"COLUMNS = {columns or None!r}")
+    if columnar:
+        out.line('# Row filter pushed down into the reader, e.g. ds.field("year") >= 2020 (None keeps all rows)')
+        out.line("ROW_FILTER = None")
+    if columnar or columns:
+        out.blank()
+
+def render_columnar_loader(out, data_source, streaming=False):
+    loader, file_format = COLUMNAR_SOURCES[data_source]
+    if streaming:
+        out.line(f"def load_{loader}_data(file_path, chunksize=CHUNKSIZE):")
+    else:
+        out.line(f"def load_{loader}_data(file_path):")
+    with out.indented():
+        out.line(f'"""Load a {data_source.rsplit(" ", 1)[0]} file, reading only COLUMNS and the rows matching ROW_FILTER."""')
+        if file_format == "parquet":
+            out.line("# Parquet row groups whose statistics rule out ROW_FILTER are skipped unread;")
+        else:
+            out.line("# Batches are checked against ROW_FILTER as they are scanned;")
+        out.line("# the file is memory-mapped rather than copied into read buffers")
+        out.line(f'dataset = ds.dataset(file_path, format="{file_format}", filesystem=fs.LocalFileSystem(use_mmap=True))')
+        if streaming:
+            out.line("for batch in dataset.to_batches(columns=COLUMNS, filter=ROW_FILTER, batch_size=chunksize):")
+            out.line("    yield batch.to_pandas()")
+        else:
+            out.line("return dataset.to_table(columns=COLUMNS, filter=ROW_FILTER).to_pandas()")
+    out.blank()
+
+def render_data_loader(out, data_source, columns, infer_dtypes=False):
+    """The function that reads the whole input into a DataFrame.
+
+    With infer_dtypes, the CSV loader reads repeated text columns straight
+    into categoricals, judged from a sample of the file.
+    """
+    columnar = data_source in COLUMNAR_SOURCES
+    if data_source == "CSV file" and infer_dtypes:
+        usecols = ", usecols=COLUMNS" if columns else ""
+        out.block(f'''
+            def load_csv_data(file_path, sample_rows=10000):
+                """Load data from a CSV file, reading repeated text columns as categoricals."""
+                # Judge the columns from a sample, so the full read never builds
+                # a separate string object for every cell of those columns
+                sample = pd.read_csv(file_path{usecols}, nrows=sample_rows)
+                categories = {{
+                    column: "category" for column, values in sample.items()
+                    if (values.dtype == object or isinstance(values.dtype, pd.StringDtype))
+                    and values.nunique() < len(values) // 2
+                }}
+                return pd.read_csv(file_path{usecols}, dtype=categories)
+        ''')
+        out.blank()
+    elif data_source == "CSV file":
+        out.block(f'''
+            def load_csv_data(file_path):
+                """Load data from a CSV file."""
+                return pd.read_csv(file_path{", usecols=COLUMNS" if columns else ""})
+        ''')
+        out.blank()
+    elif data_source == "Excel file":
+        out.block(f'''
+            def load_excel_data(file_path, sheet_name=0):
+                """Load data from an Excel file."""
+                return pd.read_excel(file_path, sheet_name=sheet_name{", usecols=COLUMNS" if columns else ""})
+        ''')
+        out.blank()
+    elif data_source == "JSON file":
+        out.block('''
+            def load_json_data(file_path):
+                """Load data from a JSON file."""
+                return pd.read_json(file_path)
+        ''')
+        out.blank()
+    elif data_source == "Database":
+        out.block('''
+            import sqlite3
+            def load_db_data(db_file, query):
+                """Load data from a database."""
+                conn = sqlite3.connect(db_file)
+                data = pd.read_sql(query, conn)
+                conn.close()
+                return data
+        ''')
+        out.blank()
+    elif data_source == "API":
+        out.block('''
+            import requests
+            def load_api_data(url):
+                """Load data from an API."""
+                response = requests.get(url)
+                response.raise_for_status()
+                return pd.DataFrame(response.json())
+        ''')
+        out.blank()
+    elif columnar:
+        render_columnar_loader(out, data_source)
+
+def render_save_output(out, output_format):
+    """The in-memory save_output(), writing the whole DataFrame at once."""
+    out.line("def save_output(data, output_file):")
+    with out.indented():
+        out.line('"""Save processed data in the specified format."""')
+
         if output_format == "CSV":
-            code += f'    data.to_csv(output_file, index=False)\n'
-            code += f'    print(f"Data saved to {{output_file}} as CSV")\n\n'
+            out.line("data.to_csv(output_file, index=False)")
+            out.line('print(f"Data saved to {output_file} as CSV")')
+            out.blank()
         elif output_format == "Excel":
-            code += f'    data.to_excel(output_file, index=False)\n'
-            code += f'    print(f"Data saved to {{output_file}} as Excel")\n\n'
+            out.line("data.to_excel(output_file, index=False)")
+            out.line('print(f"Data saved to {output_file} as Excel")')
+            out.blank()
         elif output_format == "JSON":
-            code += f'    data.to_json(output_file, orient="records")\n'
-            code += f'    print(f"Data saved to {{output_file}} as JSON")\n\n'
+            out.line('data.to_json(output_file, orient="records")')
+            out.line('print(f"Data saved to {output_file} as JSON")')
+            out.blank()
         elif output_format == "Database":
-            code += f'    import sqlite3\n'
-            code += f'    table_name = input("Enter table name: ")\n'
-            code += f'    conn = sqlite3.connect(output_file)\n'
-            code += f'    data.to_sql(table_name, conn, if_exists="replace", index=False)\n'
-            code += f'    conn.close()\n'
-            code += f'    print(f"Data saved to {{table_name}} table in {{output_file}}")\n\n'
+            out.block('''
+                import sqlite3
+                table_name = input("Enter table name: ")
+                conn = sqlite3.connect(output_file)
+                data.to_sql(table_name, conn, if_exists="replace", index=False)
+                conn.close()
+                print(f"Data saved to {table_name} table in {output_file}")
+            ''')
+            out.blank()
         elif output_format == "Plot":
-            code += f'    import matplotlib.pyplot as plt\n'
-            code += f'    # Example plot\n'
-            code += f'    if len(data.select_dtypes(include=["number"]).columns) > 0:\n'
-            code += f'        data.plot(kind="hist", alpha=0.5)\n'
-            code += f'        plt.savefig(output_file)\n'
-            code += f'        print(f"Plot saved to {{output_file}}")\n'
-            code += f'    else:\n'
-            code += f'        print("No numeric columns to plot")\n\n'
-        
+            out.block('''
+                import matplotlib.pyplot as plt
+                # Example plot
+                if len(data.select_dtypes(include=["number"]).columns) > 0:
+                    data.plot(kind="hist", alpha=0.5)
+                    plt.savefig(output_file)
+                    print(f"Plot saved to {output_file}")
+                else:
+                    print("No numeric columns to plot")
+            ''')
+            out.blank()
+        elif output_format == "Parquet":
+            out.line("data.to_parquet(output_file, index=False)")
+            out.line('print(f"Data saved to {output_file} as Parquet")')
+            out.blank()
+        elif output_format == "Feather":
+            out.line("data.reset_index(drop=True).to_feather(output_file)")
+            out.line('print(f"Data saved to {output_file} as Feather")')
+            out.blank()
+        elif output_format == "Arrow":
+            out.block('''
+                import pyarrow as pa
+                table = pa.Table.from_pandas(data, preserve_index=False)
+                with pa.OSFile(output_file, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                print(f"Data saved to {output_file} as Arrow IPC")
+            ''')
+            out.blank()
+
+def render_load_data(out, data_source):
+    """Statements in main() that prompt for the input and load it into data."""
+    columnar = data_source in COLUMNAR_SOURCES
+    if data_source == "CSV file":
+        out.line('input_file = input("Enter CSV file path: ")')
+        out.line("data = load_csv_data(input_file)")
+    elif data_source == "Excel file":
+        out.line('input_file = input("Enter Excel file path: ")')
+        out.line("data = load_excel_data(input_file)")
+    elif data_source == "JSON file":
+        out.line('input_file = input("Enter JSON file path: ")')
+        out.line("data = load_json_data(input_file)")
+    elif data_source == "Database":
+        out.line('db_file = input("Enter database file path: ")')
+        out.line('query = input("Enter SQL query: ")')
+        out.line("data = load_db_data(db_file, query)")
+    elif data_source == "API":
+        out.line('url = input("Enter API URL: ")')
+        out.line("data = load_api_data(url)")
+    elif columnar:
+        out.line(f'input_file = input("Enter {data_source.rsplit(" ", 1)[0]} file path: ")')
+        out.line(f"data = load_{COLUMNAR_SOURCES[data_source][0]}_data(input_file)")
+
+def iter_render_data_processing(spec, chunk_size=None):
+    if spec.backend == "Polars":
+        yield from iter_render_data_processing_polars(spec, chunk_size)
+        return
+    if spec.streaming or spec.parallel:
+        yield from iter_render_data_processing_streaming(spec, chunk_size)
+        return
+
+    name = spec.name
+    data_source = spec.data_source
+    processing_steps = split_list(spec.processing_steps)
+    output_format = spec.output_format
+    include_visualization = spec.visualization
+    columns = [column for column in split_list(spec.columns) if column]
+    columnar = data_source in COLUMNAR_SOURCES
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - Data Processing Script")
+    out.blank()
+    # Columnar sources are read through pyarrow; of the steps only optimize calls pd itself
+    if not columnar or "optimize" in processing_steps:
+        out.line("import pandas as pd")
+    if columnar:
+        out.line("import pyarrow.dataset as ds")
+        out.line("from pyarrow import fs")
+    if columnar or columns:
+        out.blank()
+    render_columnar_settings(out, columns, columnar)
+
+    render_data_loader(out, data_source, columns, infer_dtypes="optimize" in processing_steps)
+
+    # Processing functions
+    for step in processing_steps:
+        out.raw(data_step_fragment(step))
+        yield from out.drain()
+
+    # Output functions
+    render_save_output(out, output_format)
+
+    # Visualization if requested
+    if include_visualization:
+        render_visualize_function(out)
+
+    # Main function
+    out.line("def main():")
+    with out.indented():
+        out.line("# Load data")
+        render_load_data(out, data_source)
+        if not spec.quiet:
+            out.line('print("\\nOriginal Data:")')
+            out.line("print(data.head())")
+        out.blank()
+
+        # Processing steps
+        for step in processing_steps:
+            step_name = step.lower().replace(" ", "_")
+            out.line(f"# {step.capitalize()} data")
+            out.line(f"data = {step_name}_data(data)")
+            if not spec.quiet:
+                out.line(f'print("\\nAfter {step}:")')
+                out.line("print(data.head())")
+            out.blank()
+            yield from out.drain()
+
         # Visualization if requested
         if include_visualization:
-            code += f'def visualize_data(data):\n'
-            code += f'    """Generate visualizations of the data."""\n'
-            code += f'    import matplotlib.pyplot as plt\n'
-            code += f'    \n'
-            code += f'    # Example visualizations\n'
-            code += f'    numeric_cols = data.select_dtypes(include=["number"]).columns\n'
-            code += f'    \n'
-            code += f'    if len(numeric_cols) > 0:\n'
-            code += f'        # Histograms for numeric columns\n'
-            code += f'        data[numeric_cols].hist(bins=20, figsize=(10, 8))\n'
-            code += f'        plt.tight_layout()\n'
-            code += f'        plt.show()\n'
-            code += f'        \n'
-            code += f'        # Correlation heatmap if multiple numeric columns\n'
-            code += f'        if len(numeric_cols) > 1:\n'
-            code += f'            import seaborn as sns\n'
-            code += f'            plt.figure(figsize=(8, 6))\n'
-            code += f'            sns.heatmap(data[numeric_cols].corr(), annot=True, cmap="coolwarm")\n'
-            code += f'            plt.title("Correlation Heatmap")\n'
-            code += f'            plt.show()\n'
-            code += f'    else:\n'
-            code += f'        print("No numeric columns for visualization")\n\n'
-        
-        # Main function
-        code += f'def main():\n'
-        code += f'    # Load data\n'
-        
-        if data_source == "CSV file":
-            code += f'    input_file = input("Enter CSV file path: ")\n'
-            code += f'    data = load_csv_data(input_file)\n'
+            out.line("# Visualize data")
+            out.line("visualize_data(data)")
+            out.blank()
+
+        # Save output
+        out.line("# Save processed data")
+        out.line('output_file = input("Enter output file path (without extension): ")')
+
+        extension = DATA_OUTPUT_EXTENSIONS.get(output_format)
+        if extension:
+            out.line(f'save_output(data, output_file + "{extension}")')
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+def render_partition_pool(out, chunk_steps, first_pass_steps, analyze):
+    """Worker-side step runner plus the pool that feeds it hash partitions of each chunk."""
+    out.block('''
+        def split_rows(data, count):
+            """Split data into count partitions by a hash of each row's values.
+
+            Identical rows always land in the same partition. Rows are relabelled
+            with their positions so join_rows() can restore the original order.
+            """
+            positioned = data.set_axis(pd.RangeIndex(len(data)))
+            if count == 1:
+                return [positioned]
+            keys = pd.util.hash_pandas_object(data, index=False).to_numpy() % count
+            return [positioned[keys == i] for i in range(count)]
+
+        def join_rows(parts, index):
+            """Put processed partitions back in their original order, under their original labels."""
+            parts = [part for part in parts if len(part)] or parts[:1]
+            data = pd.concat(parts).sort_index()
+    ''')
+    with out.indented():
+        if "optimize" in chunk_steps:
+            out.block('''
+                # optimize picks categories per partition, and concat turns differing ones back into values
+                for column, values in parts[0].items():
+                    if isinstance(values.dtype, pd.CategoricalDtype):
+                        data[column] = data[column].astype("category")
+            ''')
+        out.line("return data.set_axis(index[data.index.to_numpy()])")
+    out.blank()
+
+    out.block('''
+        # State each worker process keeps across the partitions it handles, per phase
+        WORKER_STATE = {}
+
+        def run_partition(phase, data, shared):
+            """Run one phase of the per-partition steps (called in a worker process).
+
+            shared carries read-only values from the main process, such as the
+            whole-dataset statistics transform normalizes with.
+            """
+            state = WORKER_STATE.setdefault(phase, {})
+            state.update(shared)
+    ''')
+    with out.indented():
+        if first_pass_steps is not None:
+            out.line('if phase == "first_pass":')
+            with out.indented():
+                for step in first_pass_steps:
+                    out.line(f"data = {step.lower().replace(' ', '_')}_data(data, state)")
+                out.line("return RunningStats.from_frame(data)")
+        for step in chunk_steps:
+            out.line(f"data = {step.lower().replace(' ', '_')}_data(data, state)")
+        if analyze:
+            out.line("# The main process merges the statistics of every partition")
+            out.line("return analyze_data(data, RunningStats())")
+        else:
+            out.line("return data")
+    out.blank()
+
+    out.block('''
+        class PartitionPool:
+            """Worker processes that each own one hash partition of the rows.
+
+            Every chunk is split with split_rows() and partition i always goes to
+            worker i, so identical rows meet in the same worker (keeping "rows
+            already seen" exact) and each worker handles its partitions in chunk
+            order. Steps must keep each row's index label so that processed
+            chunks can be put back in order. With one worker everything runs in
+            this process.
+            """
+
+            def __init__(self, workers):
+                self.workers = max(1, workers)
+                self.executors = []
+                if self.workers > 1:
+                    self.executors = [ProcessPoolExecutor(max_workers=1) for _ in range(self.workers)]
+
+            def map(self, phase, chunks, shared):
+                """Yield (row labels, partition results) for each chunk, in order."""
+                pending = deque()
+                for data in chunks:
+                    parts = split_rows(data, self.workers)
+                    if not self.executors:
+                        yield data.index, [run_partition(phase, part, shared) for part in parts]
+                        continue
+                    pending.append((data.index, [executor.submit(run_partition, phase, part, shared)
+                                                 for executor, part in zip(self.executors, parts)]))
+                    # At most two chunks in flight, so memory stays bounded
+                    if len(pending) > 2:
+                        index, futures = pending.popleft()
+                        yield index, [future.result() for future in futures]
+                while pending:
+                    index, futures = pending.popleft()
+                    yield index, [future.result() for future in futures]
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                for executor in self.executors:
+                    executor.shutdown(cancel_futures=True)
+    ''')
+    out.blank()
+
+# Call that opens the chunk reader in a streaming script's main(), per data source
+STREAMING_LOADER_CALLS = {
+    "CSV file": "load_csv_data(input_file)",
+    "Excel file": "load_excel_data(input_file)",
+    "JSON file": "load_json_data(input_file)",
+    "Database": "load_db_data(db_file, query)",
+    "API": "load_api_data(url)",
+    "Parquet file": "load_parquet_data(input_file)",
+    "Feather file": "load_feather_data(input_file)",
+    "Arrow IPC file": "load_arrow_data(input_file)",
+}
+
+def iter_render_data_processing_streaming(spec, chunk_size=None):
+    """Data-processing script that reads, processes and writes its input chunk by chunk.
+
+    Steps before the first "analyze" run on every chunk. analyze folds the
+    stream into mergeable running statistics, and any later steps run on
+    that (small) summary, mirroring the in-memory script where analyze
+    replaces the data with describe().
+
+    Parallel scripts run the per-chunk steps in worker processes, each chunk
+    split into hash partitions; without streaming the whole input is loaded
+    and processed as a single chunk.
+    """
+    name = spec.name
+    data_source = spec.data_source
+    processing_steps = split_list(spec.processing_steps)
+    output_format = spec.output_format
+    include_visualization = spec.visualization
+    streaming = spec.streaming
+    parallel = spec.parallel
+
+    if "analyze" in processing_steps:
+        split = processing_steps.index("analyze")
+        chunk_steps, summary_steps = processing_steps[:split], processing_steps[split + 1:]
+    else:
+        chunk_steps, summary_steps = processing_steps, None
+    # Normalizing needs whole-dataset mean/std, gathered by a first pass
+    first_pass_steps = chunk_steps[:chunk_steps.index("transform")] if "transform" in chunk_steps else None
+    needs_stats = "transform" in processing_steps or summary_steps is not None
+    needs_sample = streaming and (output_format == "Plot" or (include_visualization and summary_steps is None))
+    needs_seen_rows = "clean" in processing_steps
+    loader_call = STREAMING_LOADER_CALLS.get(data_source) if streaming else "[data]"
+    columns = [column for column in split_list(spec.columns) if column]
+    columnar = data_source in COLUMNAR_SOURCES
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - Data Processing Script")
+    out.blank()
+    if parallel:
+        out.line("import argparse")
+        out.line("import os")
+        out.line("from collections import deque")
+        out.line("from concurrent.futures import ProcessPoolExecutor")
+        out.blank()
+    out.line("import pandas as pd")
+    if needs_sample or needs_seen_rows:
+        out.line("import numpy as np")
+    if columnar:
+        out.line("import pyarrow.dataset as ds")
+        out.line("from pyarrow import fs")
+    if streaming and output_format in COLUMNAR_WRITERS:
+        out.line("import pyarrow as pa")
+    out.blank()
+    if streaming:
+        out.line("# Rows read per chunk; memory use depends on this, not on the input size")
+        out.line(f"CHUNKSIZE = {int(spec.rows_per_chunk)}")
+        render_columnar_settings(out, columns if data_source == "CSV file" or columnar else [], columnar)
+        if not (columnar or (columns and data_source == "CSV file")):
+            out.blank()
+    else:
+        render_columnar_settings(out, columns, columnar)
+
+    if not streaming:
+        render_data_loader(out, data_source, columns, infer_dtypes="optimize" in processing_steps)
+    elif data_source == "CSV file":
+        out.block(f'''
+            def load_csv_data(file_path, chunksize=CHUNKSIZE):
+                """Read a CSV file lazily, chunksize rows at a time."""
+                return pd.read_csv(file_path, {"usecols=COLUMNS, " if columns else ""}chunksize=chunksize)
+        ''')
+        out.blank()
+    elif data_source == "Excel file":
+        out.block('''
+            def load_excel_data(file_path, sheet_name=0, chunksize=CHUNKSIZE):
+                """Read an Excel sheet row by row (openpyxl read-only mode), chunksize rows at a time."""
+                from openpyxl import load_workbook
+                workbook = load_workbook(file_path, read_only=True)
+                try:
+                    sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+                    rows = sheet.iter_rows(values_only=True)
+                    header = next(rows, None)
+                    batch = []
+                    for row in rows:
+                        batch.append(row)
+                        if len(batch) >= chunksize:
+                            yield pd.DataFrame(batch, columns=header)
+                            batch = []
+                    if batch:
+                        yield pd.DataFrame(batch, columns=header)
+                finally:
+                    workbook.close()
+        ''')
+        out.blank()
+    elif data_source == "JSON file":
+        out.block('''
+            def load_json_data(file_path, chunksize=CHUNKSIZE):
+                """Read a JSON Lines file (one record per line) lazily, chunksize records at a time."""
+                return pd.read_json(file_path, lines=True, chunksize=chunksize)
+        ''')
+        out.blank()
+    elif data_source == "Database":
+        out.block('''
+            import sqlite3
+            def load_db_data(db_file, query, chunksize=CHUNKSIZE):
+                """Run query and fetch its rows chunksize at a time."""
+                conn = sqlite3.connect(db_file)
+                try:
+                    yield from pd.read_sql(query, conn, chunksize=chunksize)
+                finally:
+                    conn.close()
+        ''')
+        out.blank()
+    elif data_source == "API":
+        out.block('''
+            import requests
+            def load_api_data(url, chunksize=CHUNKSIZE):
+                """Load records from an API and pass them on chunksize at a time.
+
+                The response itself is held in memory; page through the API for larger data.
+                """
+                response = requests.get(url)
+                response.raise_for_status()
+                data = pd.DataFrame(response.json())
+                for start in range(0, len(data), chunksize):
+                    yield data.iloc[start:start + chunksize]
+        ''')
+        out.blank()
+    elif columnar:
+        render_columnar_loader(out, data_source, streaming=True)
+
+    if needs_stats:
+        out.block('''
+            class RunningStats:
+                """Per-column count, mean, variance, min and max that merge exactly.
+
+                Statistics of separate chunks (or files, or workers) combine with
+                merge() into the statistics of all of them, so the data never has
+                to be in memory at once. Quantiles do not merge and are left out.
+                """
+
+                def __init__(self, count=None, mean=None, m2=None, minimum=None, maximum=None):
+                    empty = pd.Series(dtype="float64")
+                    self.count = empty if count is None else count
+                    self.mean = empty if mean is None else mean
+                    self.m2 = empty if m2 is None else m2
+                    self.minimum = empty if minimum is None else minimum
+                    self.maximum = empty if maximum is None else maximum
+
+                @classmethod
+                def from_frame(cls, data):
+                    numeric = data.select_dtypes(include=["number"])
+                    mean = numeric.mean().fillna(0.0)
+                    return cls(numeric.count(), mean, ((numeric - mean) ** 2).sum(), numeric.min(), numeric.max())
+
+                def merge(self, other):
+                    """Statistics of the data behind self and other together (Chan et al.)."""
+                    count_a, count_b = self.count.align(other.count, fill_value=0)
+                    mean_a, mean_b = self.mean.align(other.mean, fill_value=0.0)
+                    m2_a, m2_b = self.m2.align(other.m2, fill_value=0.0)
+                    count = count_a + count_b
+                    weight = (count_b / count).fillna(0.0)
+                    delta = mean_b - mean_a
+                    return RunningStats(
+                        count,
+                        mean_a + delta * weight,
+                        m2_a + m2_b + delta ** 2 * count_a * weight,
+                        pd.concat([self.minimum, other.minimum], axis=1).min(axis=1),
+                        pd.concat([self.maximum, other.maximum], axis=1).max(axis=1),
+                    )
+
+                def std(self):
+                    return (self.m2 / (self.count - 1)).pow(0.5)
+
+                def describe(self):
+                    """The count/mean/std/min/max rows of DataFrame.describe() over everything merged."""
+                    return pd.DataFrame({
+                        "count": self.count,
+                        "mean": self.mean.where(self.count > 0),
+                        "std": self.std(),
+                        "min": self.minimum,
+                        "max": self.maximum,
+                    }).T
+        ''')
+        out.blank()
+
+    if needs_sample:
+        out.block('''
+            class RowSample:
+                """Uniform random sample of at most size rows from a stream of chunks.
+
+                Every row gets a random key and the rows with the smallest keys are
+                kept, so memory stays bounded however long the stream is.
+                """
+
+                def __init__(self, size=100000):
+                    self.size = size
+                    self.rows = None
+
+                def add(self, data):
+                    keyed = data.assign(_sample_key=np.random.random(len(data)))
+                    if self.rows is not None:
+                        keyed = pd.concat([self.rows, keyed])
+                    self.rows = keyed.nsmallest(self.size, "_sample_key")
+                    return data
+
+                def frame(self):
+                    if self.rows is None:
+                        return pd.DataFrame()
+                    return self.rows.drop(columns="_sample_key")
+        ''')
+        out.blank()
+
+    if needs_seen_rows:
+        out.block('''
+            class SeenRows:
+                """Set of 64-bit row hashes stored as a few sorted numpy arrays (8 bytes per row).
+
+                Each chunk's new hashes become a sorted run and runs of similar size
+                are merged, so there are only O(log n) runs to search.
+                """
+
+                def __init__(self):
+                    self.runs = []
+
+                def add_new(self, hashes):
+                    """Mark first occurrences of hashes not seen before, and remember them."""
+                    unique, first = np.unique(hashes, return_index=True)
+                    fresh = np.ones(len(unique), dtype=bool)
+                    for run in self.runs:
+                        positions = np.minimum(np.searchsorted(run, unique), len(run) - 1)
+                        fresh &= run[positions] != unique
+                    keep = np.zeros(len(hashes), dtype=bool)
+                    keep[first[fresh]] = True
+                    if fresh.any():
+                        self.runs.append(unique[fresh])
+                        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+                            merged = np.concatenate([self.runs.pop(), self.runs.pop()])
+                            merged.sort()
+                            self.runs.append(merged)
+                    return keep
+        ''')
+        out.blank()
+
+    # Processing functions
+    for step in dict.fromkeys(processing_steps):
+        out.raw(data_step_fragment(step, streaming=True))
+        yield from out.drain()
+
+    if parallel:
+        render_partition_pool(out, chunk_steps, first_pass_steps, analyze=summary_steps is not None)
+        yield from out.drain()
+
+        out.line("def process_chunks(chunks, state, pool):")
+        with out.indented():
+            if summary_steps is not None:
+                out.line('"""Run the per-chunk processing steps in the worker pool, yielding each partition\'s analysis."""')
+                out.line('for _, parts in pool.map("process", chunks, state):')
+                out.line("    yield from parts")
+            else:
+                out.line('"""Run the per-chunk processing steps over a stream of chunks in the worker pool."""')
+                out.line('for index, parts in pool.map("process", chunks, state):')
+                out.line("    yield join_rows(parts, index)")
+        out.blank()
+    else:
+        out.line("def process_chunks(chunks, state):")
+        with out.indented():
+            out.line('"""Run the per-chunk processing steps over a stream of chunks."""')
+            out.line("for data in chunks:")
+            with out.indented():
+                for step in chunk_steps:
+                    out.line(f"data = {step.lower().replace(' ', '_')}_data(data, state)")
+                    yield from out.drain()
+                out.line("yield data")
+        out.blank()
+
+    # Output functions: consume the stream, writing each chunk as it arrives
+    if not streaming:
+        render_save_output(out, output_format)
+    else:
+        out.line("def save_output(chunks, output_file):")
+        with out.indented():
+            out.line('"""Write processed chunks as they arrive, appending to a single output."""')
+
+            if output_format == "CSV":
+                out.block('''
+                    rows = 0
+                    for data in chunks:
+                        if len(data):
+                            data.to_csv(output_file, mode="a" if rows else "w", header=not rows, index=False)
+                            rows += len(data)
+                    print(f"{rows} rows saved to {output_file} as CSV")
+                ''')
+                out.blank()
+            elif output_format == "Excel":
+                out.block('''
+                    # openpyxl's write-only mode streams rows to disk as they are appended
+                    # (an Excel sheet holds at most 1,048,576 rows)
+                    from openpyxl import Workbook
+                    workbook = Workbook(write_only=True)
+                    sheet = workbook.create_sheet()
+                    rows = 0
+                    for data in chunks:
+                        if len(data):
+                            if not rows:
+                                sheet.append([str(column) for column in data.columns])
+                            for row in data.astype(object).where(data.notna(), None).itertuples(index=False):
+                                sheet.append(list(row))
+                            rows += len(data)
+                    workbook.save(output_file)
+                    print(f"{rows} rows saved to {output_file} as Excel")
+                ''')
+                out.blank()
+            elif output_format == "JSON":
+                out.block('''
+                    rows = 0
+                    with open(output_file, "w", encoding="utf-8") as f:
+                        for data in chunks:
+                            if len(data):
+                                f.write(data.to_json(orient="records", lines=True).rstrip("\\n") + "\\n")
+                                rows += len(data)
+                    print(f"{rows} rows saved to {output_file} as JSON Lines")
+                ''')
+                out.blank()
+            elif output_format == "Database":
+                out.block('''
+                    import sqlite3
+                    table_name = input("Enter table name: ")
+                    conn = sqlite3.connect(output_file)
+                    rows = 0
+                    try:
+                        for data in chunks:
+                            if len(data):
+                                data.to_sql(table_name, conn, if_exists="append" if rows else "replace", index=False)
+                                rows += len(data)
+                    finally:
+                        conn.close()
+                    print(f"{rows} rows saved to {table_name} table in {output_file}")
+                ''')
+                out.blank()
+            elif output_format == "Plot":
+                out.block('''
+                    import matplotlib.pyplot as plt
+                    # Plot a bounded random sample of the rows
+                    sample = RowSample()
+                    for data in chunks:
+                        sample.add(data)
+                    data = sample.frame()
+                    if len(data.select_dtypes(include=["number"]).columns) > 0:
+                        data.plot(kind="hist", alpha=0.5)
+                        plt.savefig(output_file)
+                        print(f"Plot saved to {output_file}")
+                    else:
+                        print("No numeric columns to plot")
+                ''')
+                out.blank()
+            elif output_format in COLUMNAR_WRITERS:
+                if output_format == "Parquet":
+                    out.line("import pyarrow.parquet as pq")
+                open_writer = COLUMNAR_WRITERS[output_format]
+                first_schema = "table.schema"
+                if "optimize" in chunk_steps:
+                    out.block('''
+                        # optimize narrows every chunk on its own, so the file gets the widest types
+                        def widest_type(dtype):
+                            if pa.types.is_integer(dtype):
+                                return pa.int64()
+                            if pa.types.is_floating(dtype):
+                                return pa.float64()
+                            if pa.types.is_dictionary(dtype):
+                                return dtype.value_type
+                            return dtype
+                    ''')
+                    out.blank()
+                    first_schema = "pa.schema([field.with_type(widest_type(field.type)) for field in table.schema])"
+                out.block(f'''
+                    # Every chunk is cast to the first chunk's schema and appended as it arrives
+                    rows = 0
+                    writer = schema = None
+                    try:
+                        for data in chunks:
+                            if not len(data):
+                                continue
+                            table = pa.Table.from_pandas(data, preserve_index=False)
+                            if writer is None:
+                                schema = {first_schema}
+                                writer = {open_writer}
+                            writer.write_table(table.cast(schema))
+                            rows += len(data)
+                    finally:
+                        if writer is not None:
+                            writer.close()
+                    print(f"{{rows}} rows saved to {{output_file}} as {output_format}")
+                ''')
+                out.blank()
+
+    # Visualization if requested
+    if include_visualization:
+        render_visualize_function(out)
+
+    # Main function
+    out.line("def main():")
+    with out.indented():
+        if parallel:
+            out.block(f'''
+                parser = argparse.ArgumentParser(description={spec.description!r})
+                parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                                    help="processes to run the processing steps in (default: one per CPU)")
+                args = parser.parse_args()
+            ''')
+            out.blank()
+        out.line("# Load data")
+
+        if not streaming:
+            render_load_data(out, data_source)
+            if not spec.quiet:
+                out.line('print("\\nOriginal Data:")')
+                out.line("print(data.head())")
+            out.blank()
+        elif data_source == "CSV file":
+            out.line('input_file = input("Enter CSV file path: ")')
+        elif columnar:
+            out.line(f'input_file = input("Enter {data_source.rsplit(" ", 1)[0]} file path: ")')
         elif data_source == "Excel file":
-            code += f'    input_file = input("Enter Excel file path: ")\n'
-            code += f'    data = load_excel_data(input_file)\n'
+            out.line('input_file = input("Enter Excel file path: ")')
         elif data_source == "JSON file":
-            code += f'    input_file = input("Enter JSON file path: ")\n'
-            code += f'    data = load_json_data(input_file)\n'
+            out.line('input_file = input("Enter JSON Lines file path: ")')
         elif data_source == "Database":
-            code += f'    db_file = input("Enter database file path: ")\n'
-            code += f'    query = input("Enter SQL query: ")\n'
-            code += f'    data = load_db_data(db_file, query)\n'
+            out.line('db_file = input("Enter database file path: ")')
+            out.line('query = input("Enter SQL query: ")')
         elif data_source == "API":
-            code += f'    url = input("Enter API URL: ")\n'
-            code += f'    data = load_api_data(url)\n'
-        
-        code += f'    print("\\nOriginal Data:")\n'
-        code += f'    print(data.head())\n\n'
-        
-        # Processing steps
+            out.line('url = input("Enter API URL: ")')
+
+        if parallel:
+            out.line("with PartitionPool(args.workers) as pool:")
+        with out.indented(1 if parallel else 0):
+            out.line("state = {}")
+            out.blank()
+
+            if loader_call and first_pass_steps is not None:
+                out.line("# First pass: transform normalizes with whole-dataset statistics")
+                out.line("stats = RunningStats()")
+                if parallel:
+                    out.line(f'for _, parts in pool.map("first_pass", {loader_call}, {{}}):')
+                    out.line("    for partial in parts:")
+                    out.line("        stats = stats.merge(partial)")
+                else:
+                    out.line("first_pass = {}")
+                    out.line(f"for data in {loader_call}:")
+                    with out.indented():
+                        for step in first_pass_steps:
+                            out.line(f"data = {step.lower().replace(' ', '_')}_data(data, first_pass)")
+                        out.line("stats = stats.merge(RunningStats.from_frame(data))")
+                out.line('state["stats"] = stats')
+                out.blank()
+
+            if streaming:
+                out.line("# Nothing is read until the chunks are consumed below")
+            else:
+                out.line("# The processing steps run in the worker processes, one hash partition each")
+            out.line(f"chunks = process_chunks({loader_call or 'iter([])'}, state{', pool' if parallel else ''})")
+            out.blank()
+
+            if summary_steps is not None:
+                if parallel:
+                    out.line("# Analyze runs in the workers; their running statistics are merged here")
+                    out.line("analysis = RunningStats()")
+                    out.line("for partial in chunks:")
+                    out.line("    analysis = analysis.merge(partial)")
+                else:
+                    out.line("# Analyze folds every chunk into running statistics")
+                    out.line("analysis = RunningStats()")
+                    out.line("for data in chunks:")
+                    out.line("    analysis = analyze_data(data, analysis)")
+                out.line("data = analysis.describe()")
+                if not spec.quiet:
+                    out.line('print("\\nAfter analyze:")')
+                    out.line("print(data)")
+                out.blank()
+
+                for step in summary_steps:
+                    step_name = step.lower().replace(" ", "_")
+                    out.line(f"# {step.capitalize()} data")
+                    if step == "analyze":
+                        out.line("data = analyze_data(data, RunningStats()).describe()")
+                    else:
+                        out.line(f"data = {step_name}_data(data, state)")
+                    if not spec.quiet:
+                        out.line(f'print("\\nAfter {step}:")')
+                        out.line("print(data.head())")
+                    out.blank()
+                    yield from out.drain()
+
+                if include_visualization:
+                    out.line("# Visualize data")
+                    out.line("visualize_data(data)")
+                    out.blank()
+                chunks_expr = "[data]" if streaming else "data"
+            elif streaming:
+                if include_visualization:
+                    out.line("# Keep a bounded sample of the processed rows for the charts")
+                    out.line("sample = RowSample()")
+                    out.line("chunks = (sample.add(data) for data in chunks)")
+                    out.blank()
+                chunks_expr = "chunks"
+            else:
+                out.line("data = next(chunks)")
+                if chunk_steps and not spec.quiet:
+                    out.line(f'print("\\nAfter {", ".join(chunk_steps)}:")')
+                    out.line("print(data.head())")
+                out.blank()
+                if include_visualization:
+                    out.line("# Visualize data")
+                    out.line("visualize_data(data)")
+                    out.blank()
+                chunks_expr = "data"
+
+            # Save output
+            out.line("# Save processed data")
+            out.line('output_file = input("Enter output file path (without extension): ")')
+
+            if streaming and output_format == "JSON":
+                extension = ".jsonl"
+            else:
+                extension = DATA_OUTPUT_EXTENSIONS.get(output_format)
+            if extension:
+                out.line(f'save_output({chunks_expr}, output_file + "{extension}")')
+
+            if streaming and include_visualization and summary_steps is None:
+                out.blank()
+                out.line("# Visualize data")
+                out.line("visualize_data(sample.frame())")
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+# Data source -> (Polars call starting the plan, description), for the lazy backend
+LAZY_SOURCES = {
+    "CSV file": ("pl.scan_csv(file_path)", "a CSV file"),
+    "Excel file": ("pl.read_excel(file_path).lazy()", "an Excel file"),
+    "JSON file": ("pl.read_json(file_path).lazy()", "a JSON file"),
+    "Parquet file": ("pl.scan_parquet(file_path)", "a Parquet file"),
+    "Feather file": ("pl.scan_ipc(file_path)", "a Feather file"),
+    "Arrow IPC file": ("pl.scan_ipc(file_path)", "an Arrow IPC file"),
+}
+
+# Output format -> LazyFrame sink that runs the plan straight into the file
+LAZY_SINKS = {
+    "CSV": "data.sink_csv(output_file)",
+    "Parquet": "data.sink_parquet(output_file)",
+    "Feather": 'data.sink_ipc(output_file, compression="lz4")',
+    "Arrow": "data.sink_ipc(output_file, compression=None)",
+}
+
+def iter_render_data_processing_polars(spec, chunk_size=None):
+    """Data-processing script whose steps build one Polars query plan.
+
+    The plan is optimized as a whole (projection and predicate pushdown,
+    common subplans computed once) and executed a single time, straight
+    into the output file where Polars can sink that format. Polars runs
+    the plan on all cores itself, so the parallel option adds nothing
+    here; streaming selects its streaming engine.
+    """
+    name = spec.name
+    data_source = spec.data_source
+    processing_steps = split_list(spec.processing_steps)
+    output_format = spec.output_format
+    include_visualization = spec.visualization
+    columns = [column for column in split_list(spec.columns) if column]
+    columnar = data_source in COLUMNAR_SOURCES
+    collect = 'collect(engine="streaming")' if spec.streaming else "collect()"
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - Data Processing Script")
+    out.blank()
+    out.line("import polars as pl")
+    if {"transform", "analyze", "optimize"} & set(processing_steps):
+        out.line("import polars.selectors as cs")
+    out.blank()
+    if columnar or columns:
+        out.line("# Columns to read (None reads all); the query optimizer skips the rest")
+        out.line(f"COLUMNS = {columns or None!r}")
+    if columnar:
+        out.line('# Row filter pushed down into the scan, e.g. pl.col("year") >= 2020 (None keeps all rows)')
+        out.line("ROW_FILTER = None")
+    if columnar or columns:
+        out.blank()
+
+    if data_source in LAZY_SOURCES:
+        start, description = LAZY_SOURCES[data_source]
+        if spec.streaming and data_source == "JSON file":
+            start, description = "pl.scan_ndjson(file_path)", "a JSON Lines file"
+        loader = data_source.split()[0].lower() if not columnar else COLUMNAR_SOURCES[data_source][0]
+        out.line(f"def load_{loader}_data(file_path):")
+        with out.indented():
+            out.line(f'"""Start the query plan from {description} (nothing is read yet)."""')
+            if columnar:
+                out.line(f"plan = {start}")
+                out.line("if COLUMNS is not None:")
+                out.line("    plan = plan.select(COLUMNS)")
+                out.line("if ROW_FILTER is not None:")
+                out.line("    plan = plan.filter(ROW_FILTER)")
+                out.line("return plan")
+            elif columns:
+                out.line(f"return {start}.select(COLUMNS)")
+            else:
+                out.line(f"return {start}")
+        out.blank()
+    elif data_source == "Database":
+        out.block(f'''
+            import sqlite3
+            def load_db_data(db_file, query):
+                """Start the query plan from the result of a database query."""
+                conn = sqlite3.connect(db_file)
+                try:
+                    data = pl.read_database(query, connection=conn)
+                finally:
+                    conn.close()
+                return data.lazy(){".select(COLUMNS)" if columns else ""}
+        ''')
+        out.blank()
+    elif data_source == "API":
+        out.block(f'''
+            import requests
+            def load_api_data(url):
+                """Start the query plan from the records returned by an API."""
+                response = requests.get(url)
+                response.raise_for_status()
+                return pl.DataFrame(response.json()).lazy(){".select(COLUMNS)" if columns else ""}
+        ''')
+        out.blank()
+
+    # Processing functions
+    for step in processing_steps:
+        out.raw(lazy_data_step_fragment(step))
+        yield from out.drain()
+
+    # Output functions
+    out.line("def save_output(data, output_file):")
+    with out.indented():
+        out.line('"""Run the query plan and save the result in the specified format."""')
+
+        if output_format in LAZY_SINKS:
+            out.line("# Executes the plan, streaming its rows into the file")
+            out.line(LAZY_SINKS[output_format])
+            out.line(f'print(f"Data saved to {{output_file}} as {output_format}")')
+        elif output_format == "JSON" and spec.streaming:
+            out.line("# Executes the plan, streaming its rows into the file")
+            out.line("data.sink_ndjson(output_file)")
+            out.line('print(f"Data saved to {output_file} as JSON Lines")')
+        elif output_format == "JSON":
+            out.line(f"data.{collect}.write_json(output_file)")
+            out.line('print(f"Data saved to {output_file} as JSON")')
+        elif output_format == "Excel":
+            out.line(f"data.{collect}.write_excel(output_file)")
+            out.line('print(f"Data saved to {output_file} as Excel")')
+        elif output_format == "Database":
+            out.block(f'''
+                import sqlite3
+                table_name = input("Enter table name: ")
+                data = data.{collect}
+                columns = ", ".join(f'"{{column}}"' for column in data.columns)
+                placeholders = ", ".join("?" * data.width)
+                conn = sqlite3.connect(output_file)
+                with conn:
+                    conn.execute(f'DROP TABLE IF EXISTS "{{table_name}}"')
+                    conn.execute(f'CREATE TABLE "{{table_name}}" ({{columns}})')
+                    conn.executemany(f'INSERT INTO "{{table_name}}" VALUES ({{placeholders}})', data.iter_rows())
+                conn.close()
+                print(f"Data saved to {{table_name}} table in {{output_file}}")
+            ''')
+        elif output_format == "Plot":
+            out.block(f'''
+                import matplotlib.pyplot as plt
+                # Example plot
+                data = data.{collect}.to_pandas()
+                if len(data.select_dtypes(include=["number"]).columns) > 0:
+                    data.plot(kind="hist", alpha=0.5)
+                    plt.savefig(output_file)
+                    print(f"Plot saved to {{output_file}}")
+                else:
+                    print("No numeric columns to plot")
+            ''')
+    out.blank()
+
+    # Visualization if requested
+    if include_visualization:
+        render_visualize_function(out)
+
+    # Main function
+    out.line("def main():")
+    with out.indented():
+        out.line("# Build the query plan; nothing is read until it runs in save_output()")
+        if data_source == "Database":
+            out.line('db_file = input("Enter database file path: ")')
+            out.line('query = input("Enter SQL query: ")')
+            out.line("data = load_db_data(db_file, query)")
+        elif data_source == "API":
+            out.line('url = input("Enter API URL: ")')
+            out.line("data = load_api_data(url)")
+        elif data_source in LAZY_SOURCES:
+            description = "JSON Lines" if spec.streaming and data_source == "JSON file" else data_source.rsplit(" ", 1)[0]
+            out.line(f'input_file = input("Enter {description} file path: ")')
+            out.line(f"data = load_{loader}_data(input_file)")
         for step in processing_steps:
-            step_name = step.lower().replace(" ", "_")
-            code += f'    # {step.capitalize()} data\n'
-            code += f'    data = {step_name}_data(data)\n'
-            code += f'    print("\\nAfter {step}:")\n'
-            code += f'    print(data.head())\n\n'
-        
-        # Visualization if requested
+            out.line(f"data = {step.lower().replace(' ', '_')}_data(data)")
+            yield from out.drain()
+        out.blank()
+
+        if not spec.quiet:
+            out.line('print("\\nOptimized query plan:")')
+            out.line("print(data.explain())")
+            out.blank()
+
         if include_visualization:
-            code += f'    # Visualize data\n'
-            code += f'    visualize_data(data)\n\n'
-        
+            out.line("# Visualize data (runs the plan once; saving reuses the result)")
+            out.line(f"data = data.{collect}")
+            out.line("visualize_data(data.to_pandas())")
+            out.line("data = data.lazy()")
+            out.blank()
+
         # Save output
-        code += f'    # Save processed data\n'
-        code += f'    output_file = input("Enter output file path (without extension): ")\n'
-        
-        if output_format == "CSV":
-            code += f'    save_output(data, output_file + ".csv")\n'
-        elif output_format == "Excel":
-            code += f'    save_output(data, output_file + ".xlsx")\n'
-        elif output_format == "JSON":
-            code += f'    save_output(data, output_file + ".json")\n'
+        out.line("# Save processed data")
+        out.line('output_file = input("Enter output file path (without extension): ")')
+
+        if spec.streaming and output_format == "JSON":
+            extension = ".jsonl"
+        else:
+            extension = DATA_OUTPUT_EXTENSIONS.get(output_format)
+        if extension:
+            out.line(f'save_output(data, output_file + "{extension}")')
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+# Async library -> (client opened in scrape_pages, exceptions worth a retry)
+ASYNC_CLIENTS = {
+    "aiohttp": ("aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=TIMEOUT), "
+                "connector=aiohttp.TCPConnector(limit=CONCURRENCY))",
+                "(aiohttp.ClientError, asyncio.TimeoutError)"),
+    "httpx": ("httpx.AsyncClient(timeout=TIMEOUT, limits=httpx.Limits(max_connections=CONCURRENCY), "
+              "follow_redirects=True)",
+              "httpx.HTTPError"),
+}
+
+def render_async_fetch(out, library, website):
+    """Settings, per-host rate limiter and retrying fetch() of an async scraper."""
+    out.block(f'''
+        # Pages to fetch; replace with the catalog's page URLs (e.g. read from a file)
+        URLS = ["https://{website}"]
+        # Most requests in flight at once, across all hosts
+        CONCURRENCY = 20
+        # Minimum seconds between the starts of two requests to the same host
+        PER_HOST_DELAY = 0.1
+        # Request timeout in seconds
+        TIMEOUT = 30
+        # Retries after a timeout, connection error, 429 or 5xx; the first waits
+        # BACKOFF seconds and each further one twice as long (plus jitter)
+        MAX_RETRIES = 3
+        BACKOFF = 0.5
+        RETRY_STATUSES = {{429, 500, 502, 503, 504}}
+    ''')
+    out.blank()
+    out.block('''
+        class HostRateLimiter:
+            """Spaces out the requests to each host by at least delay seconds."""
+
+            def __init__(self, delay):
+                self.delay = delay
+                self.next_start = {}
+
+            async def wait(self, url):
+                host = urlsplit(url).netloc
+                now = time.monotonic()
+                start = max(now, self.next_start.get(host, now))
+                # Reserve the slot before sleeping, so waiting requests queue up behind it
+                self.next_start[host] = start + self.delay
+                if start > now:
+                    await asyncio.sleep(start - now)
+    ''')
+    out.blank()
+    out.block('''
+        async def fetch(session, url, semaphore, limiter):
+            """GET url, retrying transient failures; returns (url, page text or None)."""
+            error = None
+            for attempt in range(MAX_RETRIES + 1):
+                if attempt:
+                    await asyncio.sleep(BACKOFF * 2 ** (attempt - 1) * (1 + random.random()))
+                try:
+                    async with semaphore:
+                        await limiter.wait(url)
+    ''')
+    with out.indented(4):
+        if library == "aiohttp":
+            out.block('''
+                async with session.get(url) as response:
+                    status = response.status
+                    text = await response.text() if status < 400 else None
+            ''')
+        elif library == "httpx":
+            out.block('''
+                response = await session.get(url)
+                status = response.status_code
+                text = response.text
+            ''')
+    with out.indented(2):
+        out.block(f'''
+            except {ASYNC_CLIENTS[library][1]} as e:
+                error = repr(e)
+                continue
+            if status in RETRY_STATUSES:
+                error = f"HTTP {{status}}"
+                continue
+            if status >= 400:
+                print(f"Skipping {{url}}: HTTP {{status}}")
+                return url, None
+            return url, text
+        ''')
+    with out.indented():
+        out.line('print(f"Giving up on {url} after {MAX_RETRIES + 1} attempts: {error}")')
+        out.line("return url, None")
+    out.blank()
+
+def render_session_fetch(out, website, pooled_session, http_cache):
+    """Settings, session factory and fetch() shared by the Requests-based scrapers."""
+    out.line("# Pages to fetch; replace with the pages to scrape (e.g. read from a file)")
+    out.line(f'URLS = ["https://{website}"]')
+    out.line("# Request timeout in seconds")
+    out.line("TIMEOUT = 30")
+    if pooled_session:
+        out.block('''
+            # Keep-alive connections kept open per host (raise for many concurrent hosts)
+            POOL_SIZE = 10
+            # Retries after a connection error, 429 or 5xx, with exponential backoff
+            MAX_RETRIES = 3
+        ''')
+    if http_cache:
+        out.line("# Directory of cached pages, revalidated with ETag / Last-Modified on re-runs")
+        out.line('CACHE_DIR = ".http_cache"')
+    out.blank()
+
+    out.line("def make_session():")
+    with out.indented():
+        if pooled_session:
+            out.block('''
+                """A session reusing keep-alive connections, retrying transient failures."""
+                retry = Retry(total=MAX_RETRIES, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["GET", "HEAD"], respect_retry_after_header=True)
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                return session
+            ''')
+        else:
+            out.line('"""A session reusing keep-alive connections across requests."""')
+            out.line("return requests.Session()")
+    out.blank()
+
+    if http_cache:
+        out.block('''
+            def write_atomic(path, content):
+                temp_path = path + ".tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(content)
+                os.replace(temp_path, path)
+
+            def fetch(session, url):
+                """GET url; a cached copy is only downloaded again when the server says it changed."""
+                key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+                body_path = os.path.join(CACHE_DIR, key + ".html")
+                meta_path = os.path.join(CACHE_DIR, key + ".json")
+                headers = {}
+                if os.path.exists(meta_path):
+                    with open(meta_path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                    if meta.get("etag"):
+                        headers["If-None-Match"] = meta["etag"]
+                    if meta.get("last_modified"):
+                        headers["If-Modified-Since"] = meta["last_modified"]
+
+                response = session.get(url, headers=headers, timeout=TIMEOUT)
+                if response.status_code == 304 and headers:
+                    # Not modified: the server sent no body, reuse the cached one
+                    with open(body_path, "r", encoding="utf-8") as f:
+                        return f.read()
+                response.raise_for_status()
+
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    # Body first, so a metadata file always has its body next to it
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    write_atomic(body_path, response.text.encode("utf-8"))
+                    meta = {"url": url, "etag": etag, "last_modified": last_modified}
+                    write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+                return response.text
+        ''')
+    else:
+        out.block('''
+            def fetch(session, url):
+                """GET url over the session's pooled connections."""
+                response = session.get(url, timeout=TIMEOUT)
+                response.raise_for_status()
+                return response.text
+        ''')
+    out.blank()
+
+def render_crawl_frontier(out, website):
+    """Crawl limits, the SQLite-backed Frontier and extract_links() of a crawling scraper."""
+    out.block(f'''
+        # Links are followed at most MAX_DEPTH steps from the start pages, and the
+        # crawl stops once MAX_PAGES pages have been saved (counting earlier runs)
+        MAX_DEPTH = 3
+        MAX_PAGES = 10000
+        # Only links to these hosts are followed
+        ALLOWED_HOSTS = {{"{website.split("/")[0]}"}}
+        # Links to files that are not web pages are not fetched
+        SKIP_SUFFIXES = (".css", ".js", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".pdf", ".zip")
+    ''')
+    out.blank()
+    out.block('''
+        class Frontier:
+            """Every URL the crawl has found, with its link depth, in a SQLite table.
+
+            The table is both the crawl's visited set and its queue: a URL is
+            stored once, however many pages link to it, and claim() hands out
+            the shallowest URLs not fetched yet, so the queue never has to be
+            held in memory. A rerun takes up the URLs found but not saved yet
+            instead of crawling again from the start.
+            """
+
+            def __init__(self, db_file, table_name="frontier"):
+                self.conn = sqlite3.connect(db_file)
+                self.table_name = table_name
+                with self.conn:
+                    # Keyed by URL alone (no rowid), so each URL is stored once
+                    self.conn.execute(f\'CREATE TABLE IF NOT EXISTS "{table_name}" \'
+                                      "(url TEXT PRIMARY KEY, depth INTEGER NOT NULL,"
+                                      " claimed INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID")
+                    self.conn.execute(f\'CREATE INDEX IF NOT EXISTS "{table_name}_queue" \'
+                                      f\'ON "{table_name}" (claimed, depth)\')
+
+            def add(self, urls, depth):
+                """Record urls as found at depth; URLs seen before are left as they are."""
+                with self.conn:
+                    self.conn.executemany(f\'INSERT OR IGNORE INTO "{self.table_name}" (url, depth) VALUES (?, ?)\',
+                                          ((url, depth) for url in urls))
+
+            def resume(self, done):
+                """Queue again the URLs an earlier run claimed but whose pages are not in done."""
+                rows = self.conn.execute(f\'SELECT url FROM "{self.table_name}" WHERE claimed = 1\')
+                lost = [(url,) for (url,) in rows if url not in done]
+                with self.conn:
+                    self.conn.executemany(f\'UPDATE "{self.table_name}" SET claimed = 0 WHERE url = ?\', lost)
+
+            def claim(self, limit=100):
+                """Take up to limit unclaimed URLs, shallowest first, as (url, depth) pairs."""
+                rows = self.conn.execute(f\'SELECT url, depth FROM "{self.table_name}" WHERE claimed = 0 \'
+                                         "ORDER BY depth LIMIT ?", (limit,)).fetchall()
+                with self.conn:
+                    self.conn.executemany(f\'UPDATE "{self.table_name}" SET claimed = 1 WHERE url = ?\',
+                                          [(url,) for url, _ in rows])
+                return rows
+
+            def close(self):
+                self.conn.close()
+
+        def extract_links(url, soup):
+            """Absolute URLs, without #fragments, of the pages on ALLOWED_HOSTS that soup links to."""
+            links = {}
+            for anchor in soup.find_all("a", href=True):
+                link = urldefrag(urljoin(url, anchor["href"])).url
+                parts = urlsplit(link)
+                if (parts.scheme in ("http", "https") and parts.netloc in ALLOWED_HOSTS
+                        and not parts.path.lower().endswith(SKIP_SUFFIXES)):
+                    links[link] = None
+            return list(links)
+    ''')
+    out.blank()
+
+# Output format -> standard-library modules its streaming RecordWriter needs
+RECORD_WRITER_IMPORTS = {"CSV": ["csv", "json", "os"], "JSON": ["json", "os"],
+                         "Database": ["json", "sqlite3"], "Console": ["json"]}
+
+def render_record_writer(out, output_format, scrape_data):
+    """RecordWriter for streaming scrapers: batched appends plus a resume checkpoint."""
+    if output_format == "Console":
+        out.block('''
+            class RecordWriter:
+                """Prints each page's records as JSON lines (there is nothing to resume)."""
+
+                def __init__(self):
+                    self.done = set()
+                    self.count = 0
+
+                def write(self, url, records):
+                    for record in records:
+                        print(json.dumps(record))
+                    self.count += len(records)
+
+                def close(self):
+                    pass
+        ''')
+        out.blank()
+        return
+
+    if output_format in ("CSV", "Database"):
+        out.line("# Scraped values, in output column order")
+        out.line(f"FIELDS = {json.dumps([item for item in scrape_data if item])}")
+    out.line("# Records are written out, and the checkpoint advanced, every BATCH_SIZE records or pages")
+    out.line("BATCH_SIZE = 100")
+    out.blank()
+
+    out.line("class RecordWriter:")
+    with out.indented():
+        if output_format == "Database":
+            out.block('''
+                """Inserts records into a SQLite table in batches.
+
+                Each batch commits together with the pages it came from (kept in the
+                <table>_pages table), so a rerun skips exactly the pages already saved.
+                """
+
+                def __init__(self, db_file, table_name, batch_size=BATCH_SIZE):
+                    self.conn = sqlite3.connect(db_file)
+                    self.table_name = table_name
+                    self.batch_size = batch_size
+                    self.records = []
+                    self.pages = []
+                    self.count = 0
+                    columns = ", ".join(f\'"{field}"\' for field in FIELDS)
+                    with self.conn:
+                        self.conn.execute(f\'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns})\')
+                        self.conn.execute(f\'CREATE TABLE IF NOT EXISTS "{table_name}_pages" (url TEXT PRIMARY KEY)\')
+                    self.done = {url for (url,) in self.conn.execute(f\'SELECT url FROM "{table_name}_pages"\')}
+            ''')
+        else:
+            out.block('''
+                """Appends records to output_file in batches, checkpointing after each batch.
+
+                The checkpoint next to the output lists the pages whose records were
+                written and the file's size after them. A rerun cuts off anything
+                written after the last checkpoint and skips the pages it lists.
+                """
+
+                def __init__(self, output_file, batch_size=BATCH_SIZE):
+                    self.checkpoint_file = output_file + ".checkpoint"
+                    self.batch_size = batch_size
+                    self.records = []
+                    self.pages = []
+                    self.count = 0
+                    self.done = set()
+                    size = 0
+                    if os.path.exists(self.checkpoint_file) and not os.path.exists(output_file):
+                        os.remove(self.checkpoint_file)  # Its output is gone: start over
+                    if os.path.exists(self.checkpoint_file):
+                        with open(self.checkpoint_file, "rb") as f:
+                            lines = f.readlines()
+                        if lines and not lines[-1].endswith(b"\\n"):
+                            # Cut short by a crash while it was written
+                            lines.pop()
+                            os.truncate(self.checkpoint_file, sum(map(len, lines)))
+                        for line in lines:
+                            entry = json.loads(line)
+                            self.done.update(entry["pages"])
+                            size = entry["size"]
+                    self.file = open(output_file, "a", encoding="utf-8", newline="")
+                    self.file.truncate(size)
+            ''')
+            if output_format == "CSV":
+                with out.indented():
+                    out.line("self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)")
+                    out.line("if size == 0:")
+                    out.line("    self.csv.writeheader()")
+        out.blank()
+        out.block('''
+            def write(self, url, records):
+                """Queue one page's records; they are written once BATCH_SIZE records or pages have built up."""
+                self.records.extend(records)
+                self.pages.append(url)
+                # Pages without records still have to reach the checkpoint
+                if len(self.records) >= self.batch_size or len(self.pages) >= self.batch_size:
+                    self.flush()
+
+            def flush(self):
+                if not self.pages:
+                    return
+        ''')
+        with out.indented():
+            if output_format == "Database":
+                out.block('''
+                    placeholders = ", ".join("?" * len(FIELDS))
+                    # Lists and other non-scalar values are stored as JSON text
+                    rows = [tuple(
+                        value if value is None or isinstance(value, (str, int, float)) else json.dumps(value)
+                        for value in (record.get(field) for field in FIELDS)
+                    ) for record in self.records]
+                    with self.conn:
+                        self.conn.executemany(f\'INSERT INTO "{self.table_name}" VALUES ({placeholders})\', rows)
+                        self.conn.executemany(f\'INSERT OR IGNORE INTO "{self.table_name}_pages" VALUES (?)\',
+                                              [(url,) for url in self.pages])
+                ''')
+            else:
+                if output_format == "CSV":
+                    out.line("self.csv.writerows(self.records)")
+                else:
+                    out.line('self.file.writelines(json.dumps(record) + "\\n" for record in self.records)')
+                out.block('''
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                    # Only pages whose records are safely on disk go into the checkpoint
+                    entry = {"size": os.fstat(self.file.fileno()).st_size, "pages": self.pages}
+                    with open(self.checkpoint_file, "ab") as f:
+                        f.write(json.dumps(entry).encode("utf-8") + b"\\n")
+                ''')
+            out.block('''
+                self.done.update(self.pages)
+                self.count += len(self.records)
+                self.records = []
+                self.pages = []
+            ''')
+        out.blank()
+        out.line("def close(self):")
+        out.line("    self.flush()")
+        out.line(f"    self.{'conn' if output_format == 'Database' else 'file'}.close()")
+    out.blank()
+
+# Output format -> Scrapy feed export format (Database goes through an item pipeline instead)
+SCRAPY_FEED_FORMATS = {"CSV": "csv", "JSON": "json", "Console": "jsonlines"}
+
+def iter_render_scrapy_spider(spec, chunk_size=None):
+    """A complete Scrapy spider: item, spider, tuned settings and feed export.
+
+    Items declare one field per entry of scrape_data (made into valid
+    identifiers); main() runs the spider in a CrawlerProcess.
+    """
+    name = spec.name
+    website = spec.website
+    output_format = spec.output_format
+    class_name = "".join(part.capitalize() for part in re.split(r"[\W_]+", name) if part)
+    item_fields = [re.sub(r"\W+", "_", item).strip("_") for item in split_list(spec.scrape_data)]
+    item_fields = [field for field in item_fields if field]
+    # A crawl keeps its state in JOBDIR, so it always resumes like a streaming spider
+    streaming = spec.streaming or spec.crawl
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - Web Scraper for {website}")
+    out.blank()
+    modules = []
+    if output_format == "Database":
+        modules = ["json", "sqlite3"]
+    elif streaming and output_format == "CSV":
+        modules = ["os"]
+    for module in modules:
+        out.line(f"import {module}")
+    if modules:
+        out.blank()
+    out.line("import scrapy")
+    out.line("from scrapy.crawler import CrawlerProcess")
+    if spec.crawl:
+        out.line("from scrapy.linkextractors import LinkExtractor")
+    out.blank()
+
+    out.block('''
+        SETTINGS = {
+            # Requests in flight overall and per domain
+            "CONCURRENT_REQUESTS": 32,
+            "CONCURRENT_REQUESTS_PER_DOMAIN": 16,
+            # AutoThrottle adjusts the delay to the server's latency, aiming at
+            # AUTOTHROTTLE_TARGET_CONCURRENCY parallel requests per server
+            "AUTOTHROTTLE_ENABLED": True,
+            "AUTOTHROTTLE_START_DELAY": 0.5,
+            "AUTOTHROTTLE_MAX_DELAY": 10.0,
+            "AUTOTHROTTLE_TARGET_CONCURRENCY": 8.0,
+            # Responses are cached in .scrapy/httpcache and revalidated by their
+            # cache headers, so re-runs only download pages that changed
+            "HTTPCACHE_ENABLED": True,
+            "HTTPCACHE_POLICY": "scrapy.extensions.httpcache.RFC2616Policy",
+            "DOWNLOAD_TIMEOUT": 30,
+            "RETRY_TIMES": 3,
+            "ROBOTSTXT_OBEY": True,
+            "LOG_LEVEL": "INFO",
+    ''')
+    if spec.crawl:
+        with out.indented():
+            out.block('''
+                # Crawl breadth-first, at most DEPTH_LIMIT links from the start page and
+                # CLOSESPIDER_PAGECOUNT pages per run
+                "DEPTH_LIMIT": 3,
+                "DEPTH_PRIORITY": 1,
+                "SCHEDULER_DISK_QUEUE": "scrapy.squeues.PickleFifoDiskQueue",
+                "SCHEDULER_MEMORY_QUEUE": "scrapy.squeues.FifoMemoryQueue",
+                "CLOSESPIDER_PAGECOUNT": 10000,
+            ''')
+    if streaming:
+        with out.indented():
+            out.line("# Pending requests and seen URLs are kept here: stop the crawl with a single")
+            out.line("# Ctrl-C and the next run resumes it, appending to the same output")
+            out.line(f'"JOBDIR": "crawls/{name}",')
+    out.line("}")
+    out.blank()
+
+    out.line(f"class {class_name}Item(scrapy.Item):")
+    with out.indented():
+        out.line('"""One scraped record."""')
+        for field in item_fields:
+            out.line(f"{field} = scrapy.Field()")
+            yield from out.drain()
+    out.blank()
+
+    out.line(f"class {class_name}Spider(scrapy.Spider):")
+    with out.indented():
+        out.line(f'name = "{name}"')
+        out.line(f'allowed_domains = ["{website.split("/")[0].split(":")[0]}"]')
+        out.line(f'start_urls = ["https://{website}"]')
+        if spec.crawl:
+            out.line("# Skips mailto: and other non-HTTP links, and links to images, archives, etc.")
+            out.line("link_extractor = LinkExtractor()")
+        out.blank()
+        out.line("def parse(self, response):")
+        with out.indented():
+            out.line('"""Yield the items on a page, and requests for the pages it links to."""')
+            out.line(f"item = {class_name}Item()")
+            out.block('''
+                # TODO: Implement scraping logic
+                # Example for scraping titles:
+                # item["titles"] = [text.strip() for text in response.css("h2.title::text").getall()]
+                yield item
+            ''')
+            out.blank()
+            if spec.crawl:
+                out.line("# Follow every link on allowed_domains; the scheduler drops URLs it has seen")
+                out.line("yield from response.follow_all(self.link_extractor.extract_links(response), callback=self.parse)")
+            else:
+                out.line("# Example for following pagination (the scheduler drops duplicate URLs):")
+                out.line('# yield from response.follow_all(css="a.next", callback=self.parse)')
+    out.blank()
+
+    if output_format == "Database":
+        out.block(f'''
+            class SQLitePipeline:
+                """Writes items to a SQLite table, committing in batches."""
+
+                BATCH_SIZE = 500
+
+                def __init__(self, db_file, table_name):
+                    self.db_file = db_file
+                    self.table_name = table_name
+                    self.fields = list({class_name}Item.fields)
+                    self.rows = []
+
+                @classmethod
+                def from_crawler(cls, crawler):
+                    return cls(crawler.settings["SQLITE_FILE"], crawler.settings["SQLITE_TABLE"])
+
+                def open_spider(self, spider=None):
+                    self.conn = sqlite3.connect(self.db_file)
+                    columns = ", ".join(f'"{{field}}"' for field in self.fields)
+        ''')
+        with out.indented(2):
+            if streaming:
+                out.line("# A resumed crawl adds to the rows saved by the previous run")
+                out.line("self.conn.execute(f'CREATE TABLE IF NOT EXISTS \"{self.table_name}\" ({columns})')")
+            else:
+                out.line("self.conn.execute(f'DROP TABLE IF EXISTS \"{self.table_name}\"')")
+                out.line("self.conn.execute(f'CREATE TABLE \"{self.table_name}\" ({columns})')")
+        out.blank()
+        with out.indented():
+            out.block('''
+                def process_item(self, item, spider=None):
+                    # Lists and other non-scalar values are stored as JSON text
+                    self.rows.append(tuple(
+                        value if value is None or isinstance(value, (str, int, float)) else json.dumps(value)
+                        for value in (item.get(field) for field in self.fields)
+                    ))
+                    if len(self.rows) >= self.BATCH_SIZE:
+                        self.flush()
+                    return item
+
+                def flush(self):
+                    placeholders = ", ".join("?" * len(self.fields))
+                    with self.conn:
+                        self.conn.executemany(f'INSERT INTO "{self.table_name}" VALUES ({placeholders})', self.rows)
+                    self.rows = []
+
+                def close_spider(self, spider=None):
+                    self.flush()
+                    self.conn.close()
+            ''')
+        out.blank()
+
+    out.line("def main():")
+    with out.indented():
+        out.line(f'print(f"Scraping data from {website}...")')
+        if output_format == "Database":
+            out.block('''
+                output_file = input("Enter output database file path: ")
+                table_name = input("Enter table name: ")
+                settings = dict(SETTINGS, ITEM_PIPELINES={SQLitePipeline: 300},
+                                SQLITE_FILE=output_file, SQLITE_TABLE=table_name)
+            ''')
+        elif output_format == "Console":
+            out.line('settings = dict(SETTINGS, FEEDS={"stdout:": {"format": "jsonlines"}})')
+        elif streaming and output_format == "CSV":
+            out.block('''
+                output_file = input("Enter output CSV file path: ")
+                # Appended to across resumed runs, with the header only at the top
+                feed = {"format": "csv", "overwrite": False,
+                        "item_export_kwargs": {"include_headers_line": not os.path.exists(output_file)}}
+                settings = dict(SETTINGS, FEEDS={output_file: feed})
+            ''')
+        elif streaming and output_format == "JSON":
+            out.line('output_file = input("Enter output JSON Lines file path: ")')
+            out.line("# Appended to across resumed runs, one item per line")
+            out.line('settings = dict(SETTINGS, FEEDS={output_file: {"format": "jsonlines", "overwrite": False}})')
+        elif output_format in SCRAPY_FEED_FORMATS:
+            out.line(f'output_file = input("Enter output {output_format} file path: ")')
+            out.line(f'settings = dict(SETTINGS, FEEDS={{output_file: {{"format": "{SCRAPY_FEED_FORMATS[output_format]}", "overwrite": True}}}})')
+        else:
+            out.line("settings = SETTINGS")
+        out.blank()
+        out.line("process = CrawlerProcess(settings=settings)")
+        out.line(f"process.crawl({class_name}Spider)")
+        out.line("process.start()  # Blocks until the crawl is finished")
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+def render_streaming_scraper_main(out, name, website, output_format, crawl=False):
+    """main() of a streaming scraper: open the RecordWriter (and Frontier), scrape, close them."""
+    out.line("def main():")
+    with out.indented():
+        out.line(f'print(f"Scraping data from {website}...")')
+        if output_format == "Database":
+            out.line('output_file = input("Enter output database file path: ")')
+            out.line('table_name = input("Enter table name: ")')
+            out.line("writer = RecordWriter(output_file, table_name)")
+        elif output_format == "Console":
+            out.line("writer = RecordWriter()")
+        else:
+            prompt = "JSON Lines" if output_format == "JSON" else output_format
+            out.line(f'output_file = input("Enter output {prompt} file path: ")')
+            out.line("writer = RecordWriter(output_file)")
+        if crawl:
+            if output_format == "Database":
+                out.line('frontier = Frontier(output_file, f"{table_name}_frontier")')
+            elif output_format == "Console":
+                out.line("# Console output cannot be resumed, so the frontier only lives in memory")
+                out.line('frontier = Frontier(":memory:")')
+            else:
+                out.line('frontier = Frontier(output_file + ".frontier")')
+        out.line("if writer.done:")
+        out.line('    print(f"Resuming: skipping {len(writer.done)} pages saved by an earlier run")')
+        out.line("try:")
+        out.line(f"    scrape_{name.lower()}(writer{', frontier' if crawl else ''})")
+        out.line("finally:")
+        out.line("    # Saves the records of every page scraped so far, even after Ctrl-C")
+        out.line("    writer.close()")
+        if crawl:
+            out.line("    frontier.close()")
+        if output_format == "Console":
+            out.line('print(f"{writer.count} records scraped")')
         elif output_format == "Database":
-            code += f'    save_output(data, output_file + ".db")\n'
-        elif output_format == "Plot":
-            code += f'    save_output(data, output_file + ".png")\n'
-        
-        code += f'\n\nif __name__ == "__main__":\n'
-        code += f'    main()\n'
-        
-        return code
-    
-    def generate_web_scraper(self):
-        name = self.name_var.get()
-        website = self.website_var.get()
-        scrape_data = [s.strip() for s in self.scrape_data_var.get().split(',')]
-        library = self.scraper_lib_var.get()
-        output_format = self.scraper_output_var.get()
-        
-        code = f'# {name}.py - Web Scraper for {website}\n\n'
-        
-        if library == "BeautifulSoup":
-            code += f'import requests\n'
-            code += f'from bs4 import BeautifulSoup\n'
-        elif library == "Scrapy":
-            code += f'import scrapy\n'
-        elif library == "Selenium":
-            code += f'from selenium import webdriver\n'
-            code += f'from selenium.webdriver.common.by import By\n'
-            code += f'from selenium.webdriver.support.ui import WebDriverWait\n'
-            code += f'from selenium.webdriver.support import expected_conditions as EC\n'
-        elif library == "Requests":
-            code += f'import requests\n'
-        
-        code += f'import pandas as pd\n\n'
-        
-        # Scraper function
-        if library == "BeautifulSoup":
-            code += f'def scrape_{name.lower()}():\n'
-            code += f'    """Scrape data from {website} using BeautifulSoup."""\n'
-            code += f'    url = "https://{website}"\n'
-            code += f'    try:\n'
-            code += f'        response = requests.get(url)\n'
-            code += f'        response.raise_for_status()\n'
-            code += f'        soup = BeautifulSoup(response.text, "html.parser")\n'
-            code += f'        \n'
-            code += f'        # Initialize data storage\n'
-            code += f'        data = {{}}\n'
-            
+            out.line('print(f"{writer.count} records saved to {table_name} table in {output_file}")')
+        else:
+            out.line('print(f"{writer.count} records saved to {output_file}")')
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+def iter_render_web_scraper(spec, chunk_size=None):
+    if spec.library == "Scrapy":
+        yield from iter_render_scrapy_spider(spec, chunk_size)
+        return
+
+    name = spec.name
+    website = spec.website
+    scrape_data = split_list(spec.scrape_data)
+    library = spec.library
+    output_format = spec.output_format
+    # Crawling follows links in HTML pages, which the Requests scraper does not parse
+    crawl = spec.crawl and library in ("BeautifulSoup", "aiohttp", "httpx")
+    # Selenium scrapes a single page, so it has nothing to stream or resume;
+    # crawls always stream, as resuming one depends on the saved pages
+    streaming = (spec.streaming or crawl) and library != "Selenium"
+    # The BeautifulSoup and Requests scrapers fetch through a shared session
+    session = library in ("BeautifulSoup", "Requests") and (spec.pooled_session or spec.http_cache or streaming)
+
+    out = CodeBuilder(chunk_size)
+    out.line(f"# {name}.py - Web Scraper for {website}")
+    out.blank()
+
+    if library == "BeautifulSoup":
+        out.line("import requests")
+        out.line("from bs4 import BeautifulSoup")
+    elif library == "Selenium":
+        out.block('''
+            from selenium import webdriver
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+        ''')
+    elif library == "Requests":
+        out.line("import requests")
+    elif library in ASYNC_CLIENTS:
+        out.line("import asyncio")
+        out.line("import random")
+        out.line("import time")
+        if crawl:
+            out.line("from collections import deque")
+            out.line("from urllib.parse import urldefrag, urljoin, urlsplit")
+        else:
+            out.line("from urllib.parse import urlsplit")
+        out.blank()
+        out.line(f"import {library}")
+        out.line("from bs4 import BeautifulSoup")
+
+    if session and spec.pooled_session:
+        out.line("from requests.adapters import HTTPAdapter")
+        out.line("from urllib3.util.retry import Retry")
+    modules = set()
+    if session and spec.http_cache:
+        modules.update(["hashlib", "json", "os"])
+    if streaming:
+        modules.update(RECORD_WRITER_IMPORTS.get(output_format, []))
+    if crawl:
+        modules.add("sqlite3")
+    for module in sorted(modules):
+        out.line(f"import {module}")
+    if crawl and library not in ASYNC_CLIENTS:
+        out.line("from collections import deque")
+        out.line("from urllib.parse import urldefrag, urljoin, urlsplit")
+    if not streaming:
+        out.line("import pandas as pd")
+    out.blank()
+
+    if library in ASYNC_CLIENTS:
+        render_async_fetch(out, library, website)
+    elif session:
+        render_session_fetch(out, website, spec.pooled_session, spec.http_cache)
+    if crawl:
+        render_crawl_frontier(out, website)
+    if streaming:
+        render_record_writer(out, output_format, scrape_data)
+
+    # Scraper function
+    if crawl and session:
+        out.line(f"def scrape_{name.lower()}(writer, frontier, urls=None):")
+        with out.indented():
+            out.line(f'"""Crawl {website} breadth-first using {library}, handing each page\'s records to writer."""')
+            out.block('''
+                frontier.add(URLS if urls is None else urls, 0)
+                frontier.resume(writer.done)
+                fetched = len(writer.done)
+                queue = deque()
+                with make_session() as session:
+                    while fetched < MAX_PAGES:
+                        if not queue:
+                            queue.extend(frontier.claim())
+                            if not queue:
+                                break
+                        url, depth = queue.popleft()
+                        try:
+                            html = fetch(session, url)
+                        except requests.exceptions.RequestException as e:
+                            print(f"Error scraping {url}: {e}")
+                            continue
+                        fetched += 1
+                        soup = BeautifulSoup(html, "html.parser")
+                        records = []
+                        # TODO: Implement scraping logic, one dict per record
+                        # Example for scraping titles:
+                        # for element in soup.select("h2.title"):
+                        #     records.append({"titles": element.text.strip()})
+                        if depth < MAX_DEPTH:
+                            # Links are recorded before the page is saved, so a resumed crawl still has them
+                            frontier.add(extract_links(url, soup), depth + 1)
+                        writer.write(url, records)
+            ''')
+        out.blank()
+
+    elif crawl:
+        out.block('''
+            def parse_page(url, html, records):
+                """Add one page's records (one dict each); returns the URLs to crawl from it."""
+                soup = BeautifulSoup(html, "html.parser")
+                # TODO: Implement scraping logic
+                # Example for scraping titles:
+                # for element in soup.select("h2.title"):
+                #     records.append({"titles": element.text.strip()})
+                return extract_links(url, soup)
+        ''')
+        out.blank()
+        out.block(f'''
+            async def crawl(urls, writer, frontier):
+                """Crawl breadth-first from urls, CONCURRENCY pages at a time, skipping pages already saved."""
+                semaphore = asyncio.Semaphore(CONCURRENCY)
+                limiter = HostRateLimiter(PER_HOST_DELAY)
+                frontier.add(urls, 0)
+                frontier.resume(writer.done)
+                fetched = len(writer.done)
+                queue = deque()
+                pending = {{}}  # Fetch task -> link depth of its page
+                async with {ASYNC_CLIENTS[library][0]} as session:
+                    while True:
+                        # Keep CONCURRENCY fetches in flight, but none past MAX_PAGES
+                        while len(pending) < CONCURRENCY and fetched + len(pending) < MAX_PAGES:
+                            if not queue:
+                                queue.extend(frontier.claim(CONCURRENCY))
+                                if not queue:
+                                    break
+                            url, depth = queue.popleft()
+                            pending[asyncio.create_task(fetch(session, url, semaphore, limiter))] = depth
+                        if not pending:
+                            break
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            depth = pending.pop(task)
+                            url, html = task.result()
+                            if html is None:
+                                continue
+                            fetched += 1
+                            records = []
+                            links = parse_page(url, html, records)
+                            if depth < MAX_DEPTH:
+                                # Links are recorded before the page is saved, so a resumed crawl still has them
+                                frontier.add(links, depth + 1)
+                            writer.write(url, records)
+        ''')
+        out.blank()
+        out.line(f"def scrape_{name.lower()}(writer, frontier, urls=None):")
+        with out.indented():
+            out.line(f'"""Crawl {website} using {library}, fetching pages concurrently."""')
+            out.line("asyncio.run(crawl(URLS if urls is None else urls, writer, frontier))")
+        out.blank()
+
+    elif session and streaming:
+        out.line(f"def scrape_{name.lower()}(writer, urls=None):")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using {library}, handing each page\'s records to writer."""')
+            out.block('''
+                with make_session() as session:
+                    for url in (URLS if urls is None else urls):
+                        if url in writer.done:
+                            continue
+                        try:
+                            html = fetch(session, url)
+                        except requests.exceptions.RequestException as e:
+                            print(f"Error scraping {url}: {e}")
+                            continue
+                        records = []
+            ''')
+            with out.indented(2):
+                if library == "BeautifulSoup":
+                    out.block('''
+                        soup = BeautifulSoup(html, "html.parser")
+                        # TODO: Implement scraping logic, one dict per record
+                        # Example for scraping titles:
+                        # for element in soup.select("h2.title"):
+                        #     records.append({"titles": element.text.strip()})
+                    ''')
+                else:
+                    out.block('''
+                        # TODO: Implement scraping logic, one dict per record
+                        # Example for a JSON API returning a list of records:
+                        # for record in json.loads(html):
+                        #     records.append({"titles": record["title"]})
+                    ''')
+                out.line("writer.write(url, records)")
+        out.blank()
+
+    elif session:
+        out.line(f"def scrape_{name.lower()}(urls=None):")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using {library}, over one session for all pages."""')
+            out.line("# Initialize data storage")
+            out.line("data = {}")
             for item in scrape_data:
-                item_name = item.lower().replace(" ", "_")
-                code += f'        data["{item}"] = []\n'
-            
-            code += f'        \n'
-            code += f'        # TODO: Implement scraping logic\n'
-            code += f'        # Example for scraping titles:\n'
-            code += f'        # for element in soup.select("h2.title"):\n'
-            code += f'        #     data["titles"].append(element.text.strip())\n'
-            code += f'        \n'
-            code += f'        return pd.DataFrame(data)\n'
-            code += f'    except requests.exceptions.RequestException as e:\n'
-            code += f'        print(f"Error scraping website: {{e}}")\n'
-            code += f'        return pd.DataFrame()\n\n'
-        
-        elif library == "Selenium":
-            code += f'def scrape_{name.lower()}():\n'
-            code += f'    """Scrape data from {website} using Selenium."""\n'
-            code += f'    url = "https://{website}"\n'
-            code += f'    driver = webdriver.Chrome()  # Ensure ChromeDriver is installed\n'
-            code += f'    try:\n'
-            code += f'        driver.get(url)\n'
-            code += f'        \n'
-            code += f'        # Wait for page to load\n'
-            code += f'        WebDriverWait(driver, 10).until(\n'
-            code += f'            EC.presence_of_element_located((By.TAG_NAME, "body"))\n'
-            code += f'        )\n'
-            code += f'        \n'
-            code += f'        # Initialize data storage\n'
-            code += f'        data = {{}}\n'
-            
+                out.line(f'data["{item}"] = []')
+                yield from out.drain()
+            out.blank()
+            out.block('''
+                with make_session() as session:
+                    for url in (URLS if urls is None else urls):
+                        try:
+                            html = fetch(session, url)
+                        except requests.exceptions.RequestException as e:
+                            print(f"Error scraping {url}: {e}")
+                            continue
+            ''')
+            with out.indented(2):
+                if library == "BeautifulSoup":
+                    out.block('''
+                        soup = BeautifulSoup(html, "html.parser")
+                        # TODO: Implement scraping logic
+                        # Example for scraping titles:
+                        # for element in soup.select("h2.title"):
+                        #     data["titles"].append(element.text.strip())
+                    ''')
+                else:
+                    out.block('''
+                        # TODO: Implement scraping logic
+                        # Example for a JSON API returning a list of records:
+                        # for record in json.loads(html):
+                        #     data["titles"].append(record["title"])
+                    ''')
+            out.blank()
+            out.line("return pd.DataFrame(data)")
+        out.blank()
+
+    elif library == "BeautifulSoup":
+        out.line(f"def scrape_{name.lower()}():")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using BeautifulSoup."""')
+            out.line(f'url = "https://{website}"')
+            out.line("try:")
+            with out.indented():
+                out.block('''
+                    response = requests.get(url)
+                    response.raise_for_status()
+                    soup = BeautifulSoup(response.text, "html.parser")
+
+                    # Initialize data storage
+                    data = {}
+                ''')
+                for item in scrape_data:
+                    out.line(f'data["{item}"] = []')
+                    yield from out.drain()
+                out.blank()
+                out.block('''
+                    # TODO: Implement scraping logic
+                    # Example for scraping titles:
+                    # for element in soup.select("h2.title"):
+                    #     data["titles"].append(element.text.strip())
+
+                    return pd.DataFrame(data)
+                ''')
+            out.block('''
+                except requests.exceptions.RequestException as e:
+                    print(f"Error scraping website: {e}")
+                    return pd.DataFrame()
+            ''')
+        out.blank()
+
+    elif library == "Selenium":
+        out.line(f"def scrape_{name.lower()}():")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using Selenium."""')
+            out.line(f'url = "https://{website}"')
+            out.line("driver = webdriver.Chrome()  # Ensure ChromeDriver is installed")
+            out.line("try:")
+            with out.indented():
+                out.block('''
+                    driver.get(url)
+
+                    # Wait for page to load
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "body"))
+                    )
+
+                    # Initialize data storage
+                    data = {}
+                ''')
+                for item in scrape_data:
+                    out.line(f'data["{item}"] = []')
+                    yield from out.drain()
+                out.blank()
+                out.block('''
+                    # TODO: Implement scraping logic
+                    # Example for scraping titles:
+                    # for element in driver.find_elements(By.CSS_SELECTOR, "h2.title"):
+                    #     data["titles"].append(element.text)
+
+                    return pd.DataFrame(data)
+                ''')
+            out.block('''
+                except Exception as e:
+                    print(f"Error scraping website: {e}")
+                    return pd.DataFrame()
+                finally:
+                    driver.quit()
+            ''')
+        out.blank()
+
+    elif library == "Requests":
+        out.line(f"def scrape_{name.lower()}():")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using Requests."""')
+            out.line(f'url = "https://{website}"')
+            out.line("try:")
+            with out.indented():
+                out.block('''
+                    response = requests.get(url)
+                    response.raise_for_status()
+
+                    # Initialize data storage
+                    data = {}
+                ''')
+                for item in scrape_data:
+                    out.line(f'data["{item}"] = []')
+                    yield from out.drain()
+                out.blank()
+                out.block('''
+                    # TODO: Implement scraping logic
+                    # Example for a JSON API returning a list of records:
+                    # for record in response.json():
+                    #     data["titles"].append(record["title"])
+
+                    return pd.DataFrame(data)
+                ''')
+            out.block('''
+                except requests.exceptions.RequestException as e:
+                    print(f"Error scraping website: {e}")
+                    return pd.DataFrame()
+            ''')
+        out.blank()
+
+    elif library in ASYNC_CLIENTS and streaming:
+        out.block('''
+            def parse_page(url, html, records):
+                """Add one page's records (one dict each); returns further URLs to fetch."""
+                soup = BeautifulSoup(html, "html.parser")
+                # TODO: Implement scraping logic
+                # Example for scraping titles:
+                # for element in soup.select("h2.title"):
+                #     records.append({"titles": element.text.strip()})
+                # Example for following pagination (needs urllib.parse.urljoin):
+                # return [urljoin(url, a["href"]) for a in soup.select("a.next")]
+                return []
+        ''')
+        out.blank()
+        out.block(f'''
+            async def scrape_pages(urls, writer):
+                """Fetch urls (and the URLs their pages lead to) concurrently, skipping pages already saved."""
+                semaphore = asyncio.Semaphore(CONCURRENCY)
+                limiter = HostRateLimiter(PER_HOST_DELAY)
+                seen = set(urls) | writer.done
+                async with {ASYNC_CLIENTS[library][0]} as session:
+                    pending = {{asyncio.create_task(fetch(session, url, semaphore, limiter)) for url in set(urls) - writer.done}}
+                    # Write pages out as they arrive; links they return join the frontier
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            url, html = task.result()
+                            if html is None:
+                                continue
+                            records = []
+                            links = parse_page(url, html, records)
+                            writer.write(url, records)
+                            for link in links:
+                                if link not in seen:
+                                    seen.add(link)
+                                    pending.add(asyncio.create_task(fetch(session, link, semaphore, limiter)))
+        ''')
+        out.blank()
+        out.line(f"def scrape_{name.lower()}(writer, urls=None):")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using {library}, fetching pages concurrently."""')
+            out.line("asyncio.run(scrape_pages(URLS if urls is None else urls, writer))")
+        out.blank()
+
+    elif library in ASYNC_CLIENTS:
+        out.block('''
+            def parse_page(url, html, data):
+                """Add one page's fields to data; returns further URLs to fetch."""
+                soup = BeautifulSoup(html, "html.parser")
+                # TODO: Implement scraping logic
+                # Example for scraping titles:
+                # for element in soup.select("h2.title"):
+                #     data["titles"].append(element.text.strip())
+                # Example for following pagination (needs urllib.parse.urljoin):
+                # return [urljoin(url, a["href"]) for a in soup.select("a.next")]
+                return []
+        ''')
+        out.blank()
+        out.line("async def scrape_pages(urls):")
+        with out.indented():
+            out.line('"""Fetch urls (and the URLs their pages lead to) concurrently."""')
+            out.line("# Initialize data storage")
+            out.line("data = {}")
             for item in scrape_data:
-                item_name = item.lower().replace(" ", "_")
-                code += f'        data["{item}"] = []\n'
-            
-            code += f'        \n'
-            code += f'        # TODO: Implement scraping logic\n'
-            code += f'        # Example for scraping titles:\n'
-            code += f'        # for element in driver.find_elements(By.CSS_SELECTOR, "h2.title"):\n'
-            code += f'        #     data["titles"].append(element.text)\n'
-            code += f'        \n'
-            code += f'        return pd.DataFrame(data)\n'
-            code += f'    except Exception as e:\n'
-            code += f'        print(f"Error scraping website: {{e}}")\n'
-            code += f'        return pd.DataFrame()\n'
-            code += f'    finally:\n'
-            code += f'        driver.quit()\n\n'
-        
-        # Save function
-        code += f'def save_data(data, output_file):\n'
-        code += f'    """Save scraped data in the specified format."""\n'
-        
-        if output_format == "CSV":
-            code += f'    data.to_csv(output_file, index=False)\n'
-            code += f'    print(f"Data saved to {{output_file}} as CSV")\n\n'
-        elif output_format == "JSON":
-            code += f'    data.to_json(output_file, orient="records")\n'
-            code += f'    print(f"Data saved to {{output_file}} as JSON")\n\n'
-        elif output_format == "Database":
-            code += f'    import sqlite3\n'
-            code += f'    table_name = input("Enter table name: ")\n'
-            code += f'    conn = sqlite3.connect(output_file)\n'
-            code += f'    data.to_sql(table_name, conn, if_exists="replace", index=False)\n'
-            code += f'    conn.close()\n'
-            code += f'    print(f"Data saved to {{table_name}} table in {{output_file}}")\n\n'
-        elif output_format == "Console":
-            code += f'    print("Scraped Data:")\n'
-            code += f'    print(data)\n\n'
-        
-        # Main function
-        code += f'def main():\n'
-        code += f'    print(f"Scraping data from {website}...")\n'
-        code += f'    data = scrape_{name.lower()}()\n'
-        code += f'    \n'
-        code += f'    if not data.empty:\n'
-        code += f'        print("\\nSample of scraped data:")\n'
-        code += f'        print(data.head())\n'
-        code += f'        \n'
-        code += f'        # Save data\n'
-        
+                out.line(f'data["{item}"] = []')
+                yield from out.drain()
+            out.blank()
+            out.block(f'''
+                semaphore = asyncio.Semaphore(CONCURRENCY)
+                limiter = HostRateLimiter(PER_HOST_DELAY)
+                seen = set(urls)
+                async with {ASYNC_CLIENTS[library][0]} as session:
+                    pending = {{asyncio.create_task(fetch(session, url, semaphore, limiter)) for url in seen}}
+                    # Parse pages as they arrive; links they return join the frontier
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            url, html = task.result()
+                            if html is None:
+                                continue
+                            for link in parse_page(url, html, data):
+                                if link not in seen:
+                                    seen.add(link)
+                                    pending.add(asyncio.create_task(fetch(session, link, semaphore, limiter)))
+                return pd.DataFrame(data)
+            ''')
+        out.blank()
+        out.line(f"def scrape_{name.lower()}(urls=None):")
+        with out.indented():
+            out.line(f'"""Scrape data from {website} using {library}, fetching pages concurrently."""')
+            out.line("return asyncio.run(scrape_pages(URLS if urls is None else urls))")
+        out.blank()
+
+    if streaming:
+        render_streaming_scraper_main(out, name, website, output_format, crawl)
+        yield from out.drain(final=True)
+        return
+
+    # Save function
+    out.line("def save_data(data, output_file):")
+    with out.indented():
+        out.line('"""Save scraped data in the specified format."""')
+
         if output_format == "CSV":
-            code += f'        output_file = input("Enter output CSV file path: ")\n'
-            code += f'        save_data(data, output_file)\n'
+            out.line("data.to_csv(output_file, index=False)")
+            out.line('print(f"Data saved to {output_file} as CSV")')
+            out.blank()
         elif output_format == "JSON":
-            code += f'        output_file = input("Enter output JSON file path: ")\n'
-            code += f'        save_data(data, output_file)\n'
+            out.line('data.to_json(output_file, orient="records")')
+            out.line('print(f"Data saved to {output_file} as JSON")')
+            out.blank()
         elif output_format == "Database":
-            code += f'        output_file = input("Enter output database file path: ")\n'
-            code += f'        save_data(data, output_file)\n'
+            out.block('''
+                import sqlite3
+                table_name = input("Enter table name: ")
+                conn = sqlite3.connect(output_file)
+                data.to_sql(table_name, conn, if_exists="replace", index=False)
+                conn.close()
+                print(f"Data saved to {table_name} table in {output_file}")
+            ''')
+            out.blank()
         elif output_format == "Console":
-            code += f'        save_data(data, None)\n'
-        
-        code += f'    else:\n'
-        code += f'        print("No data was scraped")\n'
-        code += f'\n\nif __name__ == "__main__":\n'
-        code += f'    main()\n'
-        
-        return code
-    
-    def copy_to_clipboard(self):
-        code = self.code_display.get(1.0, tk.END)
-        self.root.clipboard_clear()
-        self.root.clipboard_append(code)
-        messagebox.showinfo("Copied", "Code copied to clipboard!")
-    
-    def clear_code(self):
-        self.code_display.delete(1.0, tk.END)
-    
-    def save_code(self):
-        code = self.code_display.get(1.0, tk.END)
-        if not code.strip():
-            messagebox.showwarning("Empty", "No code to save!")
+            out.line('print("Scraped Data:")')
+            out.line("print(data)")
+            out.blank()
+
+    # Main function
+    out.line("def main():")
+    with out.indented():
+        out.line(f'print(f"Scraping data from {website}...")')
+        out.line(f"data = scrape_{name.lower()}()")
+        out.blank()
+        out.line("if not data.empty:")
+        with out.indented():
+            out.line('print("\\nSample of scraped data:")')
+            out.line("print(data.head())")
+            out.blank()
+            out.line("# Save data")
+
+            if output_format in ("CSV", "JSON", "Database"):
+                prompt = "database" if output_format == "Database" else output_format
+                out.line(f'output_file = input("Enter output {prompt} file path: ")')
+                out.line("save_data(data, output_file)")
+            elif output_format == "Console":
+                out.line("save_data(data, None)")
+
+        out.line("else:")
+        out.line('    print("No data was scraped")')
+
+    out.blank(2)
+    out.line('if __name__ == "__main__":')
+    out.line("    main()")
+
+    yield from out.drain(final=True)
+
+def line_diff(old_lines, new_lines, max_matcher_lines=4000):
+    """Return (i1, i2, j1, j2) ranges where old_lines[i1:i2] must become new_lines[j1:j2].
+
+    Common leading and trailing lines are skipped in linear time; only the
+    differing middle is handed to SequenceMatcher, and only while it is small
+    enough that the quadratic worst case stays cheap. Larger middles come
+    back as a single replacement range.
+    """
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    old_end = len(old_lines) - suffix
+    new_end = len(new_lines) - suffix
+    if prefix == old_end and prefix == new_end:
+        return []
+    if (old_end - prefix) + (new_end - prefix) > max_matcher_lines:
+        return [(prefix, old_end, prefix, new_end)]
+
+    # Imported here: only the GUI's incremental redraw diffs sources
+    import difflib
+
+    matcher = difflib.SequenceMatcher(None, old_lines[prefix:old_end], new_lines[prefix:new_end], autojunk=False)
+    return [
+        (prefix + i1, prefix + i2, prefix + j1, prefix + j2)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+# Code type label -> (spec class, chunked render generator)
+CODE_TYPES = {
+    "Function": (FunctionSpec, iter_render_function),
+    "Class": (ClassSpec, iter_render_class),
+    "Script": (ScriptSpec, iter_render_script),
+    "GUI Application": (GuiAppSpec, iter_render_gui_app),
+    "Data Processing": (DataProcessingSpec, iter_render_data_processing),
+    "Web Scraper": (WebScraperSpec, iter_render_web_scraper),
+}
+
+# Default chunk size used when streaming generated source
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def iter_render(spec, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the generated source for a spec in chunks of roughly chunk_size characters."""
+    return CODE_TYPES[spec.code_type][1](spec, chunk_size)
+
+def render(spec):
+    """Render any spec object to Python source."""
+    return "".join(iter_render(spec, chunk_size=None))
+
+def render_cancellable(spec, cancel_event, on_progress=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Render a spec, checking cancel_event between chunks.
+
+    Returns the source, or None if cancel_event was set before rendering
+    finished. on_progress is called with the number of characters rendered
+    so far after every chunk. Safe to call from a worker thread.
+    """
+    chunks = []
+    rendered = 0
+    for chunk in iter_render(spec, chunk_size):
+        if cancel_event.is_set():
+            return None
+        chunks.append(chunk)
+        rendered += len(chunk)
+        if on_progress:
+            on_progress(rendered)
+    # A cancel that came in while the last chunk rendered still counts
+    if cancel_event.is_set():
+        return None
+    return "".join(chunks)
+
+def write_rendered(spec, stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream the generated source for a spec into a writable text stream.
+
+    Only one chunk is held in memory at a time. Returns the number of
+    characters written.
+    """
+    written = 0
+    for chunk in iter_render(spec, chunk_size):
+        stream.write(chunk)
+        written += len(chunk)
+    return written
+
+def spec_from_template(template):
+    """Build a spec from a dict shaped like the entries in code_templates.json."""
+    code_type = template.get("code_type")
+    if code_type not in CODE_TYPES:
+        raise ValueError(f"Unknown code type: {code_type!r}")
+    spec_cls = CODE_TYPES[code_type][0]
+    names = {f.name for f in fields(spec_cls)}
+    return spec_cls(**{key: value for key, value in template.items() if key in names})
+
+def spec_to_template(spec):
+    """Convert a spec back into the dict shape stored in code_templates.json."""
+    template = {"code_type": spec.code_type}
+    template.update(asdict(spec))
+    return template
+
+def spec_key_value(field_type, value):
+    """Cache-key form of one spec field value.
+
+    Values of the field's own type are used as they are, and 0/1 in a bool
+    field count as False/True (they render the same). Anything else, such as
+    the string "false" in a bool field, is keyed by its type and repr: it
+    never shares a key with a different value and never raises.
+    """
+    if field_type is bool and type(value) in (bool, int) and value in (0, 1):
+        return bool(value)
+    if type(value) is field_type:
+        return value
+    return (type(value).__name__, repr(value))
+
+def spec_key(spec):
+    """Normalized, hashable option tuple identifying a spec's rendered output."""
+    return (spec.code_type,) + tuple(spec_key_value(field.type, getattr(spec, field.name)) for field in fields(spec))
+
+class RenderCache:
+    """Bounded LRU cache of rendered source keyed by spec_key().
+
+    Entries are evicted least-recently-used first once either max_entries or
+    max_bytes (UTF-8 size of the cached sources) is exceeded. Outputs larger
+    than max_bytes are rendered but never cached.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, spec):
+        """Return the cached source for spec, or None, counting a hit or miss."""
+        key = spec_key(spec)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, spec, code):
+        key = spec_key(spec)
+        size = len(code.encode("utf-8"))
+        if self.max_entries <= 0 or size > self.max_bytes:
             return
-        
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".py",
-            filetypes=[("Python Files", "*.py"), ("All Files", "*.*")],
-            title="Save Python File"
-        )
-        
-        if file_path:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (code, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def render(self, spec):
+        code = self.get(spec)
+        if code is None:
+            code = render(spec)
+            self.put(spec, code)
+        return code
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+# ---------------------------------------------------------------------------
+# Syntax validation of generated output
+# ---------------------------------------------------------------------------
+
+VALIDATION_CACHE_SIZE = 65536
+
+# Content hash of a generated source -> verdict (None when it compiles)
+_validation_verdicts = {}
+
+def validate_source(code):
+    """Compile generated source; return None if it is valid Python, else an error message.
+
+    Verdicts are cached by a hash of the source, so identical outputs (very
+    common across a batch or when re-rendering) are only compiled once.
+    """
+    # Imported here: hashlib is only needed when validation is switched on
+    import hashlib
+
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+    try:
+        return _validation_verdicts[digest]
+    except KeyError:
+        pass
+
+    try:
+        with warnings.catch_warnings():
+            # Generated docstrings and messages may contain odd escapes; only errors matter here
+            warnings.simplefilter("ignore")
+            compile(code, "<generated>", "exec", dont_inherit=True)
+        verdict = None
+    except SyntaxError as e:
+        verdict = f"{type(e).__name__}: {e.msg} (line {e.lineno})"
+    except ValueError as e:
+        verdict = f"ValueError: {e}"
+
+    if len(_validation_verdicts) >= VALIDATION_CACHE_SIZE:
+        # clear() is a single atomic step, so the GUI's worker thread can share the cache
+        _validation_verdicts.clear()
+    _validation_verdicts[digest] = verdict
+    return verdict
+
+def undefined_names(code):
+    """Names the source reads but never binds anywhere (and that are not builtins).
+
+    Scope-insensitive on purpose: it finds calls to functions a generator
+    forgot to emit, not every NameError a scope analysis would. Returns an
+    empty list for source that does not parse.
+    """
+    import ast
+
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return []
+
+    bound = set(dir(builtins)) | {"__file__"}
+    loaded = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Load):
+                loaded.setdefault(node.id, node.lineno)
+            else:
+                bound.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            bound.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound.update(node.names)
+    return sorted(name for name in loaded if name not in bound)
+
+# ---------------------------------------------------------------------------
+# Template storage
+# ---------------------------------------------------------------------------
+
+TEMPLATE_DB = "code_templates.db"
+LEGACY_TEMPLATE_FILE = "code_templates.json"
+
+class TemplateStore:
+    """SQLite-backed template library.
+
+    Each save writes a single row inside its own transaction, so saving is
+    independent of library size and a crash mid-write leaves the previous
+    state intact. Names are listed without decoding any template, and a
+    template's JSON is only parsed when it is fetched. On first use an
+    existing code_templates.json is imported once.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path=TEMPLATE_DB, legacy_file=LEGACY_TEMPLATE_FILE):
+        # Imported here: plain renders never touch the template library
+        import sqlite3
+
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._create(legacy_file)
+
+    def _create(self, legacy_file):
+        legacy = {}
+        if legacy_file and os.path.exists(legacy_file):
             try:
-                with open(file_path, 'w') as f:
-                    f.write(code)
-                messagebox.showinfo("Saved", f"File saved successfully to:\n{file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save file:\n{e}")
-    
-    def load_templates(self):
-        """Load templates from file or return empty dict if file doesn't exist."""
-        template_file = "code_templates.json"
-        if os.path.exists(template_file):
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError):
+                legacy = {}
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS templates ("
+                " name TEXT PRIMARY KEY,"
+                " code_type TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            now = time.time()
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO templates (name, code_type, data, updated) VALUES (?, ?, ?, ?)",
+                ((name, data.get("code_type", ""), json.dumps(data), now)
+                 for name, data in legacy.items() if isinstance(data, dict)),
+            )
+            self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM templates").fetchone()[0]
+
+    def __contains__(self, name):
+        return self.conn.execute("SELECT 1 FROM templates WHERE name = ?", (name,)).fetchone() is not None
+
+    def names(self):
+        """All template names in sorted order."""
+        return [row[0] for row in self.conn.execute("SELECT name FROM templates ORDER BY name")]
+
+    def get(self, name):
+        """Return the template dict saved under name, or None."""
+        row = self.conn.execute("SELECT data FROM templates WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, name, data):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO templates (name, code_type, data, updated) VALUES (?, ?, ?, ?)",
+                (name, data.get("code_type", ""), json.dumps(data), time.time()),
+            )
+
+    def delete(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM templates WHERE name = ?", (name,))
+
+    def items(self):
+        """Iterate (name, template dict) pairs in name order."""
+        for name, data in self.conn.execute("SELECT name, data FROM templates ORDER BY name"):
+            yield name, json.loads(data)
+
+    def close(self):
+        self.conn.close()
+
+class TemplateIndex:
+    """In-memory search index over template names and their main fields.
+
+    Built once from a TemplateStore and then kept current with add() and
+    remove(), so searching never goes back to the database. Names are kept
+    in a sorted list for bisect-based prefix lookups. Every character and
+    trigram of a template's searchable text maps to the names containing it,
+    so substring and fuzzy (in-order subsequence) matching only look at the
+    templates that have all of the query's trigrams or characters.
+    """
+
+    SEARCH_FIELDS = ("code_type", "name", "description")
+
+    def __init__(self, templates=()):
+        self._keys = []
+        self._haystacks = {}
+        # Character or trigram -> names whose haystack contains it
+        self._postings = defaultdict(set)
+        for name, data in templates:
+            self._haystacks[name] = haystack = self._haystack(name, data)
+            self._post(name, haystack)
+        self._keys = sorted((name.lower(), name) for name in self._haystacks)
+
+    @classmethod
+    def from_store(cls, store):
+        return cls(store.items())
+
+    def _haystack(self, name, data):
+        values = [name] + [str(data.get(field, "")) for field in self.SEARCH_FIELDS]
+        return " ".join(values).lower()
+
+    @staticmethod
+    def _grams(text):
+        return set(text) | {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _post(self, name, haystack):
+        for gram in self._grams(haystack):
+            self._postings[gram].add(name)
+
+    def _unpost(self, name, haystack):
+        for gram in self._grams(haystack):
+            names = self._postings[gram]
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+
+    def _candidates(self, grams):
+        """Names whose haystack contains every one of grams, in key order."""
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        names = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        return sorted((name.lower(), name) for name in names)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, name, data):
+        old = self._haystacks.get(name)
+        if old is None:
+            bisect.insort(self._keys, (name.lower(), name))
+        else:
+            self._unpost(name, old)
+        self._haystacks[name] = haystack = self._haystack(name, data)
+        self._post(name, haystack)
+
+    def remove(self, name):
+        haystack = self._haystacks.pop(name, None)
+        if haystack is not None:
+            self._unpost(name, haystack)
+            key = (name.lower(), name)
+            self._keys.pop(bisect.bisect_left(self._keys, key))
+
+    def search(self, query):
+        """Return matching template names, best matches first.
+
+        Ranking: name prefix matches (alphabetical), then names or fields
+        containing the query, then fuzzy matches ordered by how tightly the
+        query characters cluster in the name.
+        """
+        query = query.strip().lower()
+        if not query:
+            return [name for _, name in self._keys]
+
+        start = bisect.bisect_left(self._keys, (query,))
+        prefix = []
+        for lowered, name in self._keys[start:]:
+            if not lowered.startswith(query):
+                break
+            prefix.append(name)
+        seen = set(prefix)
+
+        # A substring match has all of the query's trigrams (or characters,
+        # for queries shorter than three); only those candidates are checked
+        substring_grams = {query[i:i + 3] for i in range(len(query) - 2)} or set(query)
+        substring = []
+        for _, name in self._candidates(substring_grams):
+            if name not in seen and query in self._haystacks[name]:
+                substring.append(name)
+        seen.update(substring)
+
+        # A fuzzy match has every query character in its name, so in its haystack
+        fuzzy = []
+        pattern = re.compile(".*?".join(re.escape(char) for char in query))
+        for lowered, name in self._candidates(set(query)):
+            if name in seen:
+                continue
+            match = pattern.search(lowered)
+            if match:
+                fuzzy.append((match.end() - match.start(), name))
+        fuzzy.sort()
+        return prefix + substring + [name for _, name in fuzzy]
+
+# ---------------------------------------------------------------------------
+# Batch generation from a JSONL manifest
+#
+# Every manifest line is one record shaped like an entry of
+# code_templates.json. An optional "output" key sets the file name relative
+# to the output directory; otherwise "<name>.py" is used.
+# ---------------------------------------------------------------------------
+
+# Per-process cache so repeated records inside a worker are not re-rendered
+_batch_cache = RenderCache()
+
+def iter_manifest(path):
+    """Yield (line_no, record_or_error) for every non-blank manifest line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
             try:
-                with open(template_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
-    
-    def save_templates(self):
-        """Save templates to file."""
-        template_file = "code_templates.json"
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, e
+                continue
+            yield line_no, record
+
+def batch_output_path(record, output_dir):
+    """Resolve where a record's generated source is written, staying inside output_dir."""
+    relative = record.get("output") or f"{record.get('name', 'generated')}.py"
+    root = os.path.abspath(output_dir)
+    target = os.path.abspath(os.path.join(root, relative))
+    if os.path.commonpath([root, target]) != root:
+        raise ValueError(f"Output path escapes the output directory: {relative!r}")
+    return target
+
+def render_batch_chunk(chunk, output_dir, validate=False):
+    """Render and write one chunk of (line_no, record) pairs.
+
+    Runs inside worker processes; returns (line_no, path, error) per record
+    so one bad record never aborts the rest of the chunk. With validate,
+    output that does not compile is reported as an error and not written.
+    """
+    results = []
+    for line_no, record in chunk:
+        path = None
         try:
-            with open(template_file, 'w') as f:
-                json.dump(self.templates, f, indent=4)
-            return True
+            if isinstance(record, Exception):
+                raise record
+            if not isinstance(record, dict):
+                raise ValueError("Manifest record must be a JSON object")
+            path = batch_output_path(record, output_dir)
+            code = _batch_cache.render(spec_from_template(record))
+            if validate:
+                error = validate_source(code)
+                if error is not None:
+                    results.append((line_no, path, f"generated code does not compile: {error}"))
+                    continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            results.append((line_no, path, None))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to save templates:\n{e}")
-            return False
-    
-    def save_template(self):
-        template_name = self.template_name.get().strip()
-        if not template_name:
-            messagebox.showwarning("Missing Name", "Please enter a template name!")
-            return
-        
-        # Get current settings
-        template_data = {
-            "code_type": self.code_type.get(),
-            "name": self.name_var.get(),
-            "description": self.desc_var.get()
-        }
-        
-        # Add type-specific settings
-        code_type = self.code_type.get()
-        if code_type == "Function":
-            template_data.update({
-                "params": self.params_var.get(),
-                "return_value": self.return_var.get(),
-                "docstring": self.docstring_var.get(),
-                "example": self.example_var.get()
-            })
-        elif code_type == "Class":
-            template_data.update({
-                "parent": self.parent_var.get(),
-                "methods": self.methods_var.get(),
-                "docstring": self.docstring_var.get(),
-                "example": self.example_var.get()
-            })
-        elif code_type == "Script":
-            template_data.update({
-                "purpose": self.purpose_var.get(),
-                "input_type": self.input_type_var.get(),
-                "output_type": self.output_type_var.get(),
-                "error_handling": self.error_handling_var.get(),
-                "logging": self.logging_var.get()
-            })
-        elif code_type == "GUI Application":
-            template_data.update({
-                "framework": self.gui_framework_var.get(),
-                "widgets": self.widgets_var.get(),
-                "window_title": self.window_title_var.get(),
-                "main_loop": self.main_loop_var.get()
-            })
-        elif code_type == "Data Processing":
-            template_data.update({
-                "data_source": self.data_source_var.get(),
-                "processing_steps": self.processing_steps_var.get(),
-                "output_format": self.output_format_var.get(),
-                "visualization": self.visualization_var.get()
-            })
-        elif code_type == "Web Scraper":
-            template_data.update({
-                "website": self.website_var.get(),
-                "scrape_data": self.scrape_data_var.get(),
-                "library": self.scraper_lib_var.get(),
-                "output_format": self.scraper_output_var.get()
-            })
-        
-        self.templates[template_name] = template_data
-        
-        if self.save_templates():
-            messagebox.showinfo("Saved", f"Template '{template_name}' saved successfully!")
-    
-    def load_template(self):
-        if not self.templates:
-            messagebox.showinfo("No Templates", "No templates available to load.")
+            results.append((line_no, path, f"{type(e).__name__}: {e}"))
+    return results
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
             return
-        
-        # Create popup window
-        popup = tk.Toplevel(self.root)
-        popup.title("Load Template")
-        popup.geometry("400x300")
-        
-        # Template list
-        ttk.Label(popup, text="Select Template:").pack(pady=5)
-        
-        template_list = tk.Listbox(popup)
-        for template in sorted(self.templates.keys()):
-            template_list.insert(tk.END, template)
-        template_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        # Load button
-        def on_load():
-            selection = template_list.curselection()
-            if not selection:
-                messagebox.showwarning("No Selection", "Please select a template to load!")
-                return
-            
-            template_name = template_list.get(selection[0])
-            template_data = self.templates[template_name]
-            
-            # Set basic fields
-            self.code_type.set(template_data["code_type"])
-            self.name_var.set(template_data["name"])
-            self.desc_var.set(template_data["description"])
-            
-            # Update UI to show current code type options
-            self.update_options()
-            
-            # Set type-specific fields
-            code_type = template_data["code_type"]
-            if code_type == "Function":
-                self.params_var.set(template_data["params"])
-                self.return_var.set(template_data["return_value"])
-                self.docstring_var.set(template_data["docstring"])
-                self.example_var.set(template_data["example"])
-            elif code_type == "Class":
-                self.parent_var.set(template_data["parent"])
-                self.methods_var.set(template_data["methods"])
-                self.docstring_var.set(template_data["docstring"])
-                self.example_var.set(template_data["example"])
-            elif code_type == "Script":
-                self.purpose_var.set(template_data["purpose"])
-                self.input_type_var.set(template_data["input_type"])
-                self.output_type_var.set(template_data["output_type"])
-                self.error_handling_var.set(template_data["error_handling"])
-                self.logging_var.set(template_data["logging"])
-            elif code_type == "GUI Application":
-                self.gui_framework_var.set(template_data["framework"])
-                self.widgets_var.set(template_data["widgets"])
-                self.window_title_var.set(template_data["window_title"])
-                self.main_loop_var.set(template_data["main_loop"])
-            elif code_type == "Data Processing":
-                self.data_source_var.set(template_data["data_source"])
-                self.processing_steps_var.set(template_data["processing_steps"])
-                self.output_format_var.set(template_data["output_format"])
-                self.visualization_var.set(template_data["visualization"])
-            elif code_type == "Web Scraper":
-                self.website_var.set(template_data["website"])
-                self.scrape_data_var.set(template_data["scrape_data"])
-                self.scraper_lib_var.set(template_data["library"])
-                self.scraper_output_var.set(template_data["output_format"])
-            
-            popup.destroy()
-            messagebox.showinfo("Loaded", f"Template '{template_name}' loaded successfully!")
-        
-        ttk.Button(popup, text="Load Selected Template", command=on_load).pack(pady=10)
+        yield chunk
+
+def map_chunks(func, chunks, workers, *args):
+    """Yield func(chunk, *args) for every chunk, in completion order.
+
+    Chunks are spread over a process pool with at most ``2 * workers`` in
+    flight, so the input can be an arbitrarily long stream. With
+    ``workers=1`` everything runs in the current process.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    # Imported here: the process pool machinery is a large share of startup time
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(func, chunk, *args))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+def run_batch(manifest, output_dir, workers=None, chunk_size=64, on_result=None, validate=False):
+    """Render every record of a JSONL manifest into output_dir.
+
+    The manifest is streamed and at most ``2 * workers`` chunks are in flight
+    at once, so memory stays flat for arbitrarily large manifests. With
+    ``workers=1`` everything runs in the current process. ``validate``
+    compiles every output inside the worker that rendered it.
+
+    Returns (succeeded, failures) where failures is a list of
+    (line_no, error) tuples. ``on_result`` is called with every
+    (line_no, path, error) result as soon as its chunk completes.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    os.makedirs(output_dir, exist_ok=True)
+    succeeded = 0
+    failures = []
+
+    def collect(results):
+        nonlocal succeeded
+        for line_no, path, error in results:
+            if error is None:
+                succeeded += 1
+            else:
+                failures.append((line_no, error))
+            if on_result:
+                on_result(line_no, path, error)
+
+    chunks = iter_chunks(iter_manifest(manifest), chunk_size)
+    for results in map_chunks(render_batch_chunk, chunks, workers, output_dir, validate):
+        collect(results)
+    return succeeded, failures
+
+# ---------------------------------------------------------------------------
+# Option-space sweeps
+#
+# A sweep renders every combination of a code type's fixed options (the
+# SPEC_CHOICES values and both values of each bool field), with free-text
+# fields left at their defaults, and reports outputs that look wrong.
+# ---------------------------------------------------------------------------
+
+# Stands in for "a value no generator branch recognizes" when probing choices
+UNHANDLED_PROBE = "<unhandled option>"
+
+def sweep_options(code_type):
+    """Field -> values enumerated by a sweep of code_type, in field order."""
+    choices = SPEC_CHOICES.get(code_type, {})
+    options = {}
+    for field in fields(CODE_TYPES[code_type][0]):
+        if field.name in choices:
+            options[field.name] = choices[field.name]
+        elif field.type is bool:
+            options[field.name] = [True, False]
+    return options
+
+def iter_sweep_records(code_types=None):
+    """Yield one template record per option combination of each code type."""
+    for code_type in code_types or CODE_TYPES:
+        options = sweep_options(code_type)
+        for values in product(*options.values()):
+            record = {"code_type": code_type}
+            record.update(zip(options, values))
+            yield record
+
+def check_sweep_output(record, code):
+    """Problems with one combination's output, as short messages."""
+    error = validate_source(code)
+    if error is not None:
+        return [error]
+    if not code.strip() or all(line.startswith("#") for line in code.split("\n") if line.strip()):
+        return ["generates no code"]
+
+    issues = []
+    missing = undefined_names(code)
+    if missing:
+        issues.append(f"uses undefined name(s): {', '.join(missing)}")
+
+    # A choice nothing handles renders the same as a value nobody could handle
+    for field, value in record.items():
+        if field in SPEC_CHOICES.get(record["code_type"], {}):
+            probe = dict(record, **{field: UNHANDLED_PROBE})
+            if code.replace(value, UNHANDLED_PROBE) == _batch_cache.render(spec_from_template(probe)):
+                issues.append(f"{field}={value!r} is not handled")
+    return issues
+
+def sweep_chunk(chunk):
+    """Render and check one chunk of (index, record) pairs in a worker.
+
+    Only a hash of each output travels back to the parent, which is all
+    deduplication needs.
+    """
+    import hashlib
+
+    results = []
+    for index, record in chunk:
+        code = _batch_cache.render(spec_from_template(record))
+        digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+        results.append((index, digest, len(code), check_sweep_output(record, code)))
+    return results
+
+def run_sweep(code_types=None, workers=None, chunk_size=16):
+    """Render every option combination; returns (results in sweep order, seconds taken).
+
+    Each result is a dict with the record, the output's hash and size and
+    the list of issues found.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    records = list(iter_sweep_records(code_types))
+    results = [None] * len(records)
+    chunks = iter_chunks(enumerate(records), max(1, chunk_size))
+    for chunk_results in map_chunks(sweep_chunk, chunks, workers):
+        for index, digest, size, issues in chunk_results:
+            results[index] = {"record": records[index], "digest": digest, "chars": size, "issues": issues}
+    return results, time.perf_counter() - start
+
+def summarize_sweep_issues(results):
+    """Group identical issues per code type and name the option values they occur with.
+
+    Returns (code_type, issue, count, total, conditions) tuples, where
+    conditions maps each option that only had some of its values among the
+    affected combinations to those values.
+    """
+    totals = {}
+    affected = {}
+    for result in results:
+        code_type = result["record"]["code_type"]
+        totals[code_type] = totals.get(code_type, 0) + 1
+        for issue in result["issues"]:
+            affected.setdefault((code_type, issue), []).append(result["record"])
+
+    summary = []
+    for (code_type, issue), records in affected.items():
+        conditions = {}
+        for field, values in sweep_options(code_type).items():
+            seen = [value for value in values if any(record[field] == value for record in records)]
+            if len(seen) < len(values):
+                conditions[field] = seen
+        summary.append((code_type, issue, len(records), totals[code_type], conditions))
+    return summary
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def batch_command(args):
+    start = time.perf_counter()
+
+    def report(line_no, path, error):
+        if error is not None:
+            print(f"{args.manifest}:{line_no}: {error}", file=sys.stderr)
+
+    succeeded, failures = run_batch(args.manifest, args.output_dir, workers=args.workers,
+                                    chunk_size=args.chunk_size, on_result=report, validate=args.validate)
+    elapsed = time.perf_counter() - start
+    total = succeeded + len(failures)
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Generated {succeeded}/{total} files into {args.output_dir} "
+          f"in {elapsed:.2f}s ({rate:.0f} records/s), {len(failures)} failed")
+    return 1 if failures else 0
+
+def sweep_command(args):
+    unknown = [code_type for code_type in args.code_types if code_type not in CODE_TYPES]
+    if unknown:
+        print(f"mygen: unknown code type(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results, elapsed = run_sweep(args.code_types, workers=args.workers, chunk_size=args.chunk_size)
+    unique = {result["digest"] for result in results}
+    rate = len(results) / elapsed if elapsed > 0 else 0.0
+    summary = summarize_sweep_issues(results)
+
+    for code_type in args.code_types or CODE_TYPES:
+        of_type = [result for result in results if result["record"]["code_type"] == code_type]
+        distinct = len({result["digest"] for result in of_type})
+        print(f"{code_type:<16} {len(of_type):6} combinations  {distinct:6} unique outputs")
+    print(f"Swept {len(results)} combinations in {elapsed:.2f}s ({rate:.0f}/s), "
+          f"{len(unique)} unique outputs ({len(results) - len(unique)} duplicates)")
+
+    if summary:
+        print(f"\n{len(summary)} issue(s):")
+    for code_type, issue, count, total, conditions in summary:
+        where = ", ".join(f"{field}={values[0]!r}" if len(values) == 1 else
+                          f"{field} in ({', '.join(repr(value) for value in values)})"
+                          for field, values in conditions.items()) or "every combination"
+        print(f"  {code_type}: {issue} - {count}/{total} combinations, when {where}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                "combinations": len(results),
+                "unique_outputs": len(unique),
+                "elapsed_s": elapsed,
+                "combinations_per_s": rate,
+                "results": results,
+            }, f, indent=2)
+        print(f"Report saved to {args.report}")
+    return 1 if summary else 0
+
+def load_record(args):
+    """Read the single template record named by the render command's arguments."""
+    if args.template:
+        if not os.path.exists(args.templates_db):
+            # Opening a missing library would create an empty one just to look into it
+            raise ValueError(f"No template library at {args.templates_db}")
+        import sqlite3
+
+        try:
+            store = TemplateStore(args.templates_db)
+            try:
+                template = store.get(args.template)
+            finally:
+                store.close()
+        except sqlite3.Error as e:
+            raise ValueError(f"Cannot read template library {args.templates_db}: {e}") from e
+        if template is None:
+            raise ValueError(f"No template named {args.template!r} in {args.templates_db}")
+        return template
+    if args.record == "-":
+        record = json.load(sys.stdin)
+    else:
+        with open(args.record, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+    if not isinstance(record, dict):
+        raise ValueError("Record must be a JSON object")
+    return record
+
+def render_command(args):
+    try:
+        spec = spec_from_template(load_record(args))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"mygen: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        return write_render_output(args, spec)
+    except BrokenPipeError:
+        # The reader went away (e.g. `mygen render ... | head`). Point stdout
+        # at devnull so the interpreter's final flush does not fail as well.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+def write_render_output(args, spec):
+    """Write the render command's output; returns its exit status."""
+    if args.validate:
+        # The whole file has to exist before it can be compiled, so render it up front
+        code = render(spec)
+        error = validate_source(code)
+        if error is not None:
+            print(f"mygen: generated code does not compile: {error}", file=sys.stderr)
+            return 1
+        if args.output in (None, "-"):
+            sys.stdout.write(code)
+            sys.stdout.flush()
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(code)
+        return 0
+
+    if args.output in (None, "-"):
+        write_rendered(spec, sys.stdout, args.chunk_size)
+        # Flushed here, so a closed pipe surfaces inside render_command
+        sys.stdout.flush()
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            write_rendered(spec, f, args.chunk_size)
+    return 0
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="mygen", description="Python Code Generator")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser("batch", help="Generate files from a JSONL manifest of templates")
+    batch.add_argument("manifest", help="JSONL file with one template record per line")
+    batch.add_argument("-o", "--output-dir", default="generated", help="Directory to write generated files to")
+    batch.add_argument("-w", "--workers", type=int, default=None,
+                       help="Worker processes (default: CPU count, 1 renders in-process)")
+    batch.add_argument("-c", "--chunk-size", type=int, default=64, help="Records sent to a worker at a time")
+    batch.add_argument("--validate", action="store_true", help="Fail records whose generated code does not compile")
+    batch.set_defaults(handler=batch_command)
+
+    render_parser = subparsers.add_parser("render", help="Stream one generated file to stdout or a file")
+    source = render_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("record", nargs="?", help="JSON file holding one template record ('-' for stdin)")
+    source.add_argument("-t", "--template", help="Name of a template saved in the templates file")
+    render_parser.add_argument("--templates-db", default=TEMPLATE_DB, help="Template library for --template")
+    render_parser.add_argument("-o", "--output", help="File to write to (default: stdout)")
+    render_parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE,
+                               help="Characters rendered per write")
+    render_parser.add_argument("--validate", action="store_true",
+                               help="Exit with an error instead of writing code that does not compile")
+    render_parser.set_defaults(handler=render_command)
+
+    sweep = subparsers.add_parser("sweep", help="Render every combination of the fixed options and report problems")
+    sweep.add_argument("code_types", nargs="*", metavar="CODE_TYPE",
+                       help=f"Code types to sweep (default: all of {', '.join(CODE_TYPES)})")
+    sweep.add_argument("-w", "--workers", type=int, default=None,
+                       help="Worker processes (default: CPU count, 1 renders in-process)")
+    sweep.add_argument("-c", "--chunk-size", type=int, default=16, help="Combinations sent to a worker at a time")
+    sweep.add_argument("--report", help="Save every combination's options, output hash and issues as JSON")
+    sweep.set_defaults(handler=sweep_command)
+
+    return parser
+
+def run_gui():
+    # Tk is only imported on the GUI path so the command line starts fast
+    # (and works in builds that leave Tk out).
+    try:
+        import mygen_gui
+    except ImportError as e:
+        print(f"mygen: the GUI is not available in this build ({e})", file=sys.stderr)
+        return 1
+    mygen_gui.run()
+    return 0
+
+def __getattr__(name):
+    # Keep `from mygen import CodeGeneratorApp` working without importing Tk eagerly
+    if name in ("CodeGeneratorApp", "VirtualList"):
+        import mygen_gui
+        return getattr(mygen_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return run_gui()
+
+    args = build_arg_parser().parse_args(argv)
+    if not getattr(args, "handler", None):
+        build_arg_parser().print_help()
+        return 2
+    return args.handler(args)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = CodeGeneratorApp(root)
-    root.mainloop()
\ No newline at end of file
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    # Let mygen_gui's `from mygen import ...` reuse this module instead of
+    # executing the file a second time under its real name.
+    sys.modules.setdefault("mygen", sys.modules[__name__])
+    sys.exit(main())
\ No newline at end of file
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['mygen_gui'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,48 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Command-line build tuned for startup time: a onedir bundle (no onefile
+# unpack to a temp dir on every launch), no UPX (no decompression at load),
+# bytecode optimized ahead of time, and Tk left out entirely. The GUI
+# remains available from the mygen.spec build.
+
+
+a = Analysis(
+    ['mygen.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['tkinter', '_tkinter', 'mygen_gui'],
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='mygen-cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='mygen-cli',
+)
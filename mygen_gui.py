@@ -0,0 +1,829 @@
+"""Tkinter front end for the code generator.
+
+Imported lazily by mygen.run_gui() so the command line never loads Tk.
+"""
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+from tkinter import font as tkfont
+import queue
+import sqlite3
+import threading
+
+from mygen import (
+    CODE_TYPES,
+    SPEC_CHOICES,
+    RenderCache,
+    TemplateIndex,
+    TemplateStore,
+    line_diff,
+    render,
+    render_cancellable,
+    spec_key,
+    spec_to_template,
+    validate_source,
+    write_rendered,
+)
+
+class VirtualList(ttk.Frame):
+    """Scrollable list that only materializes the rows currently visible.
+
+    The backing tk.Listbox never holds more than one screenful of rows;
+    scrolling re-fills it from the item list, so opening and scrolling cost
+    the same for ten items or a hundred thousand.
+    """
+
+    def __init__(self, master, on_activate=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.offset = 0
+        self.selected = None
+        self.rows = 10
+        self.on_activate = on_activate
+
+        self.listbox = tk.Listbox(self, activestyle='none', exportselection=False)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.row_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<Double-Button-1>", lambda event: self.activate())
+        self.listbox.bind("<Return>", lambda event: self.activate())
+        self.listbox.bind("<Up>", lambda event: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self.move_selection(1))
+        self.listbox.bind("<Prior>", lambda event: self.move_selection(-self.rows))
+        self.listbox.bind("<Next>", lambda event: self.move_selection(self.rows))
+        self.listbox.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1, "units"))
+        self.listbox.bind("<Button-4>", lambda event: self.scroll_by(-1, "units"))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll_by(1, "units"))
+
+    def set_items(self, items):
+        self.items = items
+        self.offset = 0
+        self.selected = 0 if items else None
+        self.refresh()
+
+    def get_selected(self):
+        if self.selected is None or self.selected >= len(self.items):
+            return None
+        return self.items[self.selected]
+
+    def refresh(self):
+        visible = self.items[self.offset:self.offset + self.rows]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *visible)
+        if self.selected is not None and self.offset <= self.selected < self.offset + self.rows:
+            self.listbox.selection_set(self.selected - self.offset)
+            self.listbox.activate(self.selected - self.offset)
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, len(self.items) - self.rows))
+        self.refresh()
+        return "break"
+
+    def scroll_by(self, amount, what):
+        step = self.rows if what == "pages" else 1
+        return self.scroll_to(self.offset + amount * step)
+
+    def on_scrollbar(self, action, amount, what=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        else:
+            self.scroll_by(int(amount), what)
+
+    def on_resize(self, event):
+        rows = max(1, event.height // self.row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll_to(self.offset)
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.offset + selection[0]
+
+    def move_selection(self, amount):
+        if not self.items:
+            return "break"
+        current = self.selected if self.selected is not None else 0
+        self.selected = max(0, min(current + amount, len(self.items) - 1))
+        if self.selected < self.offset:
+            self.offset = self.selected
+        elif self.selected >= self.offset + self.rows:
+            self.offset = self.selected - self.rows + 1
+        return self.scroll_to(self.offset)
+
+    def activate(self):
+        if self.on_activate and self.get_selected() is not None:
+            self.on_activate(self.get_selected())
+        return "break"
+
+class CodeGeneratorApp:
+    # Quiet period after the last option edit before a live-preview render
+    LIVE_PREVIEW_DELAY_MS = 300
+
+    def __init__(self, root, render_cache=None):
+        self.root = root
+        self.render_cache = render_cache if render_cache is not None else RenderCache()
+        self.displayed_spec = None
+        # Lines currently shown in code_display, or None when unknown
+        self.displayed_lines = None
+        # Pending root.after id for a debounced live-preview render
+        self.live_preview_after = None
+
+        # Background generation state (see generate_code)
+        self.generation_thread = None
+        self.generation_cancel = None
+        self.generation_id = 0
+        self.pending_spec = None
+        self.generation_queue = queue.Queue()
+        self.root.title("Python Code Generator")
+        self.root.geometry("900x700")
+        
+        # Configure styles
+        self.style = ttk.Style()
+        self.style.configure('TFrame', background='#f0f0f0')
+        self.style.configure('TLabel', background='#f0f0f0', font=('Arial', 10))
+        self.style.configure('TButton', font=('Arial', 10))
+        self.style.configure('Header.TLabel', font=('Arial', 12, 'bold'))
+        
+        # Create main container
+        self.main_frame = ttk.Frame(root)
+        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Left panel - Code Generation Options
+        self.options_frame = ttk.LabelFrame(self.main_frame, text="Code Generation Options", padding=10)
+        self.options_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
+        
+        # Right panel - Code Preview and Output
+        self.output_frame = ttk.LabelFrame(self.main_frame, text="Generated Code", padding=10)
+        self.output_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Initialize UI components
+        self.create_options_panel()
+        self.create_output_panel()
+        self.update_options()
+        
+        # Load templates
+        self.templates = self.load_templates()
+        # Search index over the library, built the first time the picker opens
+        self.template_index = None
+        
+    def create_options_panel(self):
+        # Code type selection
+        ttk.Label(self.options_frame, text="Code Type:", style='Header.TLabel').grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        
+        self.code_type = tk.StringVar()
+        code_types = ['Function', 'Class', 'Script', 'GUI Application', 'Data Processing', 'Web Scraper']
+        self.code_type_combobox = ttk.Combobox(self.options_frame, textvariable=self.code_type, values=code_types, state='readonly')
+        self.code_type_combobox.grid(row=1, column=0, sticky=tk.EW, pady=(0, 10))
+        self.code_type_combobox.current(0)
+        self.code_type_combobox.bind('<<ComboboxSelected>>', self.update_options)
+        
+        # Options frame (will be populated dynamically)
+        self.dynamic_options_frame = ttk.Frame(self.options_frame)
+        self.dynamic_options_frame.grid(row=2, column=0, sticky=tk.EW)
+        
+        # Generate button
+        self.generate_button = ttk.Button(self.options_frame, text="Generate Code", command=self.generate_code)
+        self.generate_button.grid(row=3, column=0, pady=20)
+        
+        # Save button
+        self.save_button = ttk.Button(self.options_frame, text="Save Code", command=self.save_code)
+        self.save_button.grid(row=4, column=0, pady=5)
+        
+        # Template management
+        ttk.Label(self.options_frame, text="Templates:", style='Header.TLabel').grid(row=5, column=0, sticky=tk.W, pady=(20, 5))
+        
+        self.template_name = tk.StringVar()
+        ttk.Entry(self.options_frame, textvariable=self.template_name).grid(row=6, column=0, sticky=tk.EW, pady=(0, 5))
+        
+        self.save_template_button = ttk.Button(self.options_frame, text="Save as Template", command=self.save_template)
+        self.save_template_button.grid(row=7, column=0, pady=5)
+        
+        self.load_template_button = ttk.Button(self.options_frame, text="Load Template", command=self.load_template)
+        self.load_template_button.grid(row=8, column=0, pady=5)
+        
+    def create_output_panel(self):
+        # Code display
+        self.code_display = scrolledtext.ScrolledText(self.output_frame, wrap=tk.WORD, width=80, height=30, font=('Courier New', 10))
+        self.code_display.pack(fill=tk.BOTH, expand=True)
+        
+        # Copy button
+        self.copy_button = ttk.Button(self.output_frame, text="Copy to Clipboard", command=self.copy_to_clipboard)
+        self.copy_button.pack(side=tk.LEFT, pady=5)
+
+        # Live preview re-renders automatically whenever an option changes
+        self.live_preview_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.output_frame, text="Live Preview", variable=self.live_preview_var,
+                        command=self.schedule_live_preview).pack(side=tk.LEFT, padx=10, pady=5)
+
+        # Optional syntax check of every generated output
+        self.validate_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.output_frame, text="Check Syntax", variable=self.validate_var,
+                        command=self.generate_code).pack(side=tk.LEFT, pady=5)
+        self.validation_var = tk.StringVar()
+        ttk.Label(self.output_frame, textvariable=self.validation_var).pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # Clear button
+        self.clear_button = ttk.Button(self.output_frame, text="Clear", command=self.clear_code)
+        self.clear_button.pack(side=tk.RIGHT, pady=5)
+
+        # Background generation progress and cancel
+        self.cancel_button = ttk.Button(self.output_frame, text="Cancel", command=self.cancel_generation, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        self.progress = ttk.Progressbar(self.output_frame, mode='indeterminate', length=120)
+        self.progress.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        self.status_var = tk.StringVar()
+        ttk.Label(self.output_frame, textvariable=self.status_var).pack(side=tk.RIGHT, padx=5, pady=5)
+    
+    def update_options(self, event=None):
+        # Clear previous options
+        for widget in self.dynamic_options_frame.winfo_children():
+            widget.destroy()
+        
+        code_type = self.code_type.get()
+        row = 0
+        
+        # Common options
+        ttk.Label(self.dynamic_options_frame, text="Function/Class Name:").grid(row=row, column=0, sticky=tk.W)
+        self.name_var = tk.StringVar(value="my_" + code_type.lower().replace(" ", "_"))
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.name_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Description:").grid(row=row, column=0, sticky=tk.W)
+        self.desc_var = tk.StringVar(value=f"A {code_type.lower()}")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.desc_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        # Type-specific options
+        if code_type == "Function":
+            self.setup_function_options(row)
+        elif code_type == "Class":
+            self.setup_class_options(row)
+        elif code_type == "Script":
+            self.setup_script_options(row)
+        elif code_type == "GUI Application":
+            self.setup_gui_options(row)
+        elif code_type == "Data Processing":
+            self.setup_data_processing_options(row)
+        elif code_type == "Web Scraper":
+            self.setup_web_scraper_options(row)
+
+        if code_type in CODE_TYPES:
+            for var in self.spec_variables(code_type).values():
+                getattr(self, var).trace_add("write", self.schedule_live_preview)
+        self.schedule_live_preview()
+
+    def schedule_live_preview(self, *args):
+        """Debounce option edits into a single render once typing pauses."""
+        if not self.live_preview_var.get():
+            return
+        if self.live_preview_after is not None:
+            self.root.after_cancel(self.live_preview_after)
+        self.live_preview_after = self.root.after(self.LIVE_PREVIEW_DELAY_MS, self.run_live_preview)
+
+    def run_live_preview(self):
+        self.live_preview_after = None
+        if self.live_preview_var.get():
+            self.generate_code()
+    
+    def setup_function_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="Parameters:").grid(row=row, column=0, sticky=tk.W)
+        self.params_var = tk.StringVar(value="param1, param2='default'")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.params_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Return Value:").grid(row=row, column=0, sticky=tk.W)
+        self.return_var = tk.StringVar(value="None")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.return_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Docstring:").grid(row=row, column=0, sticky=tk.W)
+        self.docstring_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.docstring_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Example:").grid(row=row, column=0, sticky=tk.W)
+        self.example_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.example_var).grid(row=row, column=1, sticky=tk.W)
+    
+    def setup_class_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="Parent Class:").grid(row=row, column=0, sticky=tk.W)
+        self.parent_var = tk.StringVar(value="object")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.parent_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Methods:").grid(row=row, column=0, sticky=tk.W)
+        self.methods_var = tk.StringVar(value="__init__, do_something")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.methods_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Docstring:").grid(row=row, column=0, sticky=tk.W)
+        self.docstring_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.docstring_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Example Usage:").grid(row=row, column=0, sticky=tk.W)
+        self.example_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.example_var).grid(row=row, column=1, sticky=tk.W)
+    
+    def setup_script_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="Script Purpose:").grid(row=row, column=0, sticky=tk.W)
+        self.purpose_var = tk.StringVar(value="Process data")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.purpose_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Input Type:").grid(row=row, column=0, sticky=tk.W)
+        self.input_type_var = tk.StringVar(value="file")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.input_type_var, 
+                     values=SPEC_CHOICES["Script"]["input_type"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Output Type:").grid(row=row, column=0, sticky=tk.W)
+        self.output_type_var = tk.StringVar(value="console")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.output_type_var, 
+                     values=SPEC_CHOICES["Script"]["output_type"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Error Handling:").grid(row=row, column=0, sticky=tk.W)
+        self.error_handling_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.error_handling_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Logging:").grid(row=row, column=0, sticky=tk.W)
+        self.logging_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.logging_var).grid(row=row, column=1, sticky=tk.W)
+    
+    def setup_gui_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="GUI Framework:").grid(row=row, column=0, sticky=tk.W)
+        self.gui_framework_var = tk.StringVar(value="Tkinter")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.gui_framework_var, 
+                    values=SPEC_CHOICES["GUI Application"]["framework"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Main Widgets:").grid(row=row, column=0, sticky=tk.W)
+        self.widgets_var = tk.StringVar(value="Label, Entry, Button")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.widgets_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Window Title:").grid(row=row, column=0, sticky=tk.W)
+        self.window_title_var = tk.StringVar(value="My Application")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.window_title_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Main Loop:").grid(row=row, column=0, sticky=tk.W)
+        self.main_loop_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.main_loop_var).grid(row=row, column=1, sticky=tk.W)
+    
+    def setup_data_processing_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="Data Source:").grid(row=row, column=0, sticky=tk.W)
+        self.data_source_var = tk.StringVar(value="CSV file")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.data_source_var, 
+                    values=SPEC_CHOICES["Data Processing"]["data_source"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Processing Steps:").grid(row=row, column=0, sticky=tk.W)
+        self.processing_steps_var = tk.StringVar(value="clean, transform, analyze")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.processing_steps_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Output Format:").grid(row=row, column=0, sticky=tk.W)
+        self.output_format_var = tk.StringVar(value="CSV")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.output_format_var, 
+                    values=SPEC_CHOICES["Data Processing"]["output_format"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Include Visualization:").grid(row=row, column=0, sticky=tk.W)
+        self.visualization_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.visualization_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Stream in Chunks:").grid(row=row, column=0, sticky=tk.W)
+        self.streaming_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.streaming_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Rows per Chunk:").grid(row=row, column=0, sticky=tk.W)
+        self.rows_per_chunk_var = tk.IntVar(value=100000)
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.rows_per_chunk_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Columns to Read:").grid(row=row, column=0, sticky=tk.W)
+        self.columns_var = tk.StringVar(value="")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.columns_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Run in Parallel:").grid(row=row, column=0, sticky=tk.W)
+        self.parallel_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.parallel_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Backend:").grid(row=row, column=0, sticky=tk.W)
+        self.backend_var = tk.StringVar(value="pandas")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.backend_var,
+                    values=SPEC_CHOICES["Data Processing"]["backend"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Quiet Output:").grid(row=row, column=0, sticky=tk.W)
+        self.quiet_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.quiet_var).grid(row=row, column=1, sticky=tk.W)
+    
+    def setup_web_scraper_options(self, row):
+        ttk.Label(self.dynamic_options_frame, text="Target Website:").grid(row=row, column=0, sticky=tk.W)
+        self.website_var = tk.StringVar(value="example.com")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.website_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Data to Scrape:").grid(row=row, column=0, sticky=tk.W)
+        self.scrape_data_var = tk.StringVar(value="titles, links")
+        ttk.Entry(self.dynamic_options_frame, textvariable=self.scrape_data_var).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Library:").grid(row=row, column=0, sticky=tk.W)
+        self.scraper_lib_var = tk.StringVar(value="BeautifulSoup")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.scraper_lib_var, 
+                    values=SPEC_CHOICES["Web Scraper"]["library"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+        
+        ttk.Label(self.dynamic_options_frame, text="Output Format:").grid(row=row, column=0, sticky=tk.W)
+        self.scraper_output_var = tk.StringVar(value="CSV")
+        ttk.Combobox(self.dynamic_options_frame, textvariable=self.scraper_output_var, 
+                    values=SPEC_CHOICES["Web Scraper"]["output_format"]).grid(row=row, column=1, sticky=tk.EW)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Pooled Session:").grid(row=row, column=0, sticky=tk.W)
+        self.pooled_session_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.pooled_session_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Cache Responses:").grid(row=row, column=0, sticky=tk.W)
+        self.http_cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.http_cache_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Stream Records to Output:").grid(row=row, column=0, sticky=tk.W)
+        self.scraper_streaming_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.scraper_streaming_var).grid(row=row, column=1, sticky=tk.W)
+        row += 1
+
+        ttk.Label(self.dynamic_options_frame, text="Crawl Links:").grid(row=row, column=0, sticky=tk.W)
+        self.scraper_crawl_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.dynamic_options_frame, variable=self.scraper_crawl_var).grid(row=row, column=1, sticky=tk.W)
+    
+    # Spec field -> Tk variable created by the matching setup_*_options method
+    SPEC_VARIABLES = {
+        "Function": {"params": "params_var", "return_value": "return_var",
+                     "docstring": "docstring_var", "example": "example_var"},
+        "Class": {"parent": "parent_var", "methods": "methods_var",
+                  "docstring": "docstring_var", "example": "example_var"},
+        "Script": {"purpose": "purpose_var", "input_type": "input_type_var", "output_type": "output_type_var",
+                   "error_handling": "error_handling_var", "logging": "logging_var"},
+        "GUI Application": {"framework": "gui_framework_var", "widgets": "widgets_var",
+                            "window_title": "window_title_var", "main_loop": "main_loop_var"},
+        "Data Processing": {"data_source": "data_source_var", "processing_steps": "processing_steps_var",
+                            "output_format": "output_format_var", "visualization": "visualization_var",
+                            "streaming": "streaming_var", "rows_per_chunk": "rows_per_chunk_var",
+                            "columns": "columns_var", "parallel": "parallel_var",
+                            "backend": "backend_var", "quiet": "quiet_var"},
+        "Web Scraper": {"website": "website_var", "scrape_data": "scrape_data_var",
+                        "library": "scraper_lib_var", "output_format": "scraper_output_var",
+                        "pooled_session": "pooled_session_var", "http_cache": "http_cache_var",
+                        "streaming": "scraper_streaming_var", "crawl": "scraper_crawl_var"},
+    }
+    
+    def spec_variables(self, code_type):
+        variables = {"name": "name_var", "description": "desc_var"}
+        variables.update(self.SPEC_VARIABLES[code_type])
+        return variables
+    
+    def get_spec(self, code_type=None):
+        """Snapshot the current option widgets into a spec object."""
+        code_type = code_type or self.code_type.get()
+        spec_cls = CODE_TYPES[code_type][0]
+        values = {}
+        for field, var in self.spec_variables(code_type).items():
+            try:
+                values[field] = getattr(self, var).get()
+            except tk.TclError:
+                # Half-typed number (e.g. an emptied entry): use the spec default
+                continue
+        return spec_cls(**values)
+    
+    def is_selected(self, spec):
+        """Whether spec still matches the option widgets."""
+        code_type = self.code_type.get()
+        return code_type in CODE_TYPES and spec_key(self.get_spec(code_type)) == spec_key(spec)
+    
+    def set_spec(self, template_data):
+        """Push template/spec values back into the option widgets."""
+        for field, var in self.spec_variables(template_data["code_type"]).items():
+            if field in template_data:
+                getattr(self, var).set(template_data[field])
+    
+    def generate_code(self):
+        code_type = self.code_type.get()
+
+        if code_type not in CODE_TYPES:
+            self.cancel_generation()
+            self.show_code(None, "# Select a code type to generate")
+            self.show_validation(False)
+            return
+
+        # Tk variables may only be read on the main thread, so snapshot them here
+        spec = self.get_spec(code_type)
+        code = self.render_cache.get(spec)
+        if code is not None:
+            self.show_code(spec, code)
+            if not self.validate_var.get():
+                self.cancel_generation()
+                self.show_validation(False)
+                return
+            # Compiling a large source whose verdict is not cached yet takes a
+            # while, so the check runs on the worker just like a render
+            self.show_validation(False)
+
+        if self.generation_thread is not None:
+            # Coalesce rapid re-clicks: abort the running render and remember
+            # only the latest spec; it starts once the worker has stopped.
+            self.pending_spec = spec
+            self.generation_cancel.set()
+            return
+
+        self.start_generation(spec, code)
+
+    def start_generation(self, spec, code=None):
+        """Render spec on a worker thread (or only check code, when it is already rendered)."""
+        self.generation_id += 1
+        job_id = self.generation_id
+        self.generation_cancel = cancel = threading.Event()
+        results = self.generation_queue
+        validate = self.validate_var.get()
+
+        def work():
+            try:
+                source = code
+                if source is None:
+                    source = render_cancellable(
+                        spec, cancel, on_progress=lambda rendered: results.put(("progress", job_id, rendered)))
+                verdict = validate_source(source) if validate and source is not None else False
+                if cancel.is_set():
+                    # The poller drops a cancelled job's result; only tell it the job ended
+                    results.put(("cancelled", job_id, None))
+                else:
+                    results.put(("done", job_id, (source, verdict)))
+            except Exception as e:
+                results.put(("error", job_id, e))
+
+        self.generation_thread = threading.Thread(target=work, name="mygen-render", daemon=True)
+        self.generation_thread.start()
+
+        self.status_var.set("Generating..." if code is None else "Checking syntax...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress.start(10)
+        self.root.after(50, self.poll_generation, spec, job_id, cancel)
+
+    def poll_generation(self, spec, job_id, cancel):
+        """Drain worker messages on the Tk thread; reschedules itself until the job ends.
+
+        Once the job's cancel event is set, whatever it finished with is dropped.
+        """
+        finished = False
+        while True:
+            try:
+                kind, message_job, payload = self.generation_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message_job != job_id:
+                continue
+            if kind == "progress":
+                self.status_var.set(f"Generating... {payload // 1024} KB")
+            elif cancel.is_set():
+                finished = True
+            elif kind == "done":
+                finished = True
+                code, verdict = payload
+                if code is not None:
+                    self.render_cache.put(spec, code)
+                    # The options may have moved on while the job ran
+                    if self.is_selected(spec):
+                        # A cached source was shown before its check started
+                        if self.displayed_spec is not spec:
+                            self.show_code(spec, code)
+                        self.show_validation(verdict)
+            elif kind == "error":
+                finished = True
+                messagebox.showerror("Error", f"Failed to generate code:\n{payload}")
+
+        if not finished:
+            self.root.after(50, self.poll_generation, spec, job_id, cancel)
+            return
+
+        self.generation_thread = None
+        self.generation_cancel = None
+        self.progress.stop()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_var.set("")
+
+        if self.pending_spec is not None:
+            pending, self.pending_spec = self.pending_spec, None
+            self.start_generation(pending, self.render_cache.get(pending))
+
+    def cancel_generation(self):
+        self.pending_spec = None
+        if self.generation_cancel is not None:
+            self.generation_cancel.set()
+            self.status_var.set("Cancelling...")
+
+    def show_validation(self, verdict):
+        """Show a validate_source() verdict; False means the output was not checked."""
+        if verdict is False:
+            self.validation_var.set("")
+        elif verdict is None:
+            self.validation_var.set("Syntax OK")
+        else:
+            self.validation_var.set(verdict)
+
+    def show_code(self, spec, code):
+        self.displayed_spec = spec
+        new_lines = code.splitlines(keepends=True)
+        old_lines = self.displayed_lines
+
+        if old_lines is None or self.code_display.edit_modified() or not code.endswith("\n"):
+            self.code_display.delete(1.0, tk.END)
+            self.code_display.insert(tk.END, code)
+        else:
+            # Patch only the changed line ranges, bottom-up so earlier indices stay valid
+            top = self.code_display.yview()[0]
+            for i1, i2, j1, j2 in reversed(line_diff(old_lines, new_lines)):
+                if i2 > i1:
+                    self.code_display.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+                if j2 > j1:
+                    self.code_display.insert(f"{i1 + 1}.0", "".join(new_lines[j1:j2]))
+            self.code_display.yview_moveto(top)
+
+        # Patching relies on every shown line ending in a newline
+        self.displayed_lines = new_lines if code.endswith("\n") else None
+        # Lets save_code tell whether the preview still matches displayed_spec
+        self.code_display.edit_modified(False)
+
+    def generate_function(self):
+        return render(self.get_spec("Function"))
+    
+    def generate_class(self):
+        return render(self.get_spec("Class"))
+    
+    def generate_script(self):
+        return render(self.get_spec("Script"))
+    
+    def generate_gui_app(self):
+        return render(self.get_spec("GUI Application"))
+    
+    def generate_data_processing(self):
+        return render(self.get_spec("Data Processing"))
+    
+    def generate_web_scraper(self):
+        return render(self.get_spec("Web Scraper"))
+    
+    def copy_to_clipboard(self):
+        code = self.code_display.get(1.0, tk.END)
+        self.root.clipboard_clear()
+        self.root.clipboard_append(code)
+        messagebox.showinfo("Copied", "Code copied to clipboard!")
+    
+    def clear_code(self):
+        self.displayed_spec = None
+        self.displayed_lines = []
+        self.code_display.delete(1.0, tk.END)
+        self.code_display.edit_modified(False)
+        self.show_validation(False)
+    
+    def save_code(self):
+        # Unedited previews are streamed straight from the spec instead of
+        # copying the whole program back out of the Text widget.
+        spec = None if self.code_display.edit_modified() else self.displayed_spec
+        if spec is None and not self.code_display.get(1.0, tk.END).strip():
+            messagebox.showwarning("Empty", "No code to save!")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".py",
+            filetypes=[("Python Files", "*.py"), ("All Files", "*.*")],
+            title="Save Python File"
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'w') as f:
+                    if spec is not None:
+                        write_rendered(spec, f)
+                    else:
+                        f.write(self.code_display.get(1.0, tk.END))
+                messagebox.showinfo("Saved", f"File saved successfully to:\n{file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save file:\n{e}")
+    
+    def load_templates(self):
+        """Open the template library (templates themselves are read lazily)."""
+        return TemplateStore()
+
+    def save_template(self):
+        template_name = self.template_name.get().strip()
+        if not template_name:
+            messagebox.showwarning("Missing Name", "Please enter a template name!")
+            return
+        
+        # Get current settings
+        template_data = spec_to_template(self.get_spec())
+        
+        try:
+            self.templates.put(template_name, template_data)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to save templates:\n{e}")
+            return
+        if self.template_index is not None:
+            self.template_index.add(template_name, template_data)
+
+        messagebox.showinfo("Saved", f"Template '{template_name}' saved successfully!")
+
+    def load_template(self):
+        if not self.templates:
+            messagebox.showinfo("No Templates", "No templates available to load.")
+            return
+        
+        if self.template_index is None:
+            self.template_index = TemplateIndex.from_store(self.templates)
+        index = self.template_index
+
+        # Create popup window
+        popup = tk.Toplevel(self.root)
+        popup.title("Load Template")
+        popup.geometry("400x400")
+
+        # Search box
+        ttk.Label(popup, text="Search Templates:").pack(pady=5)
+        search_var = tk.StringVar()
+        search_entry = ttk.Entry(popup, textvariable=search_var)
+        search_entry.pack(fill=tk.X, padx=10)
+
+        count_var = tk.StringVar()
+        ttk.Label(popup, textvariable=count_var).pack(pady=(5, 0))
+
+        # Load button
+        def on_load(template_name=None):
+            template_name = template_name or template_list.get_selected()
+            if template_name is None:
+                messagebox.showwarning("No Selection", "Please select a template to load!")
+                return
+
+            template_data = self.templates.get(template_name)
+            if template_data is None:
+                messagebox.showerror("Error", f"Template '{template_name}' no longer exists.")
+                index.remove(template_name)
+                on_search()
+                return
+
+            # Set basic fields
+            self.code_type.set(template_data["code_type"])
+
+            # Update UI to show current code type options
+            self.update_options()
+
+            # Set all spec fields
+            self.set_spec(template_data)
+
+            popup.destroy()
+            messagebox.showinfo("Loaded", f"Template '{template_name}' loaded successfully!")
+
+        # Template list
+        template_list = VirtualList(popup, on_activate=on_load)
+        template_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        def on_search(*args):
+            matches = index.search(search_var.get())
+            template_list.set_items(matches)
+            count_var.set(f"{len(matches)} of {len(index)} templates")
+
+        search_var.trace_add("write", on_search)
+        search_entry.bind("<Down>", lambda event: template_list.listbox.focus_set())
+        search_entry.bind("<Return>", lambda event: on_load())
+        on_search()
+        search_entry.focus_set()
+
+        ttk.Button(popup, text="Load Selected Template", command=lambda: on_load()).pack(pady=10)
+
+def run():
+    root = tk.Tk()
+    # The widgets' callbacks keep the app alive for as long as the window
+    CodeGeneratorApp(root)
+    root.mainloop()
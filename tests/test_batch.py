@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import mygen
+
+def write_manifest(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n")
+    return str(path)
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_batch_reports_each_bad_record_and_keeps_going(tmp_path, capsys, workers):
+    manifest = write_manifest(tmp_path / "manifest.jsonl", [
+        {"code_type": "Function", "name": "good_one"},
+        "{not json",
+        {"code_type": "Nope", "name": "bad_type"},
+        [1, 2],
+        "",
+        {"code_type": "Class", "name": "good_two", "output": "nested/good_two.py"},
+        {"code_type": "Function", "name": "escape", "output": "../escaped.py"},
+    ])
+    output_dir = tmp_path / "out"
+
+    # Two records per chunk, so a process pool gets several chunks
+    status = mygen.main(["batch", manifest, "-o", str(output_dir), "-w", workers, "-c", "2"])
+
+    assert status == 1
+    stdout, stderr = capsys.readouterr()
+    # Chunks finish in any order; errors are reported as they come in
+    errors = sorted(stderr.splitlines(), key=lambda error: int(error.split(":")[1]))
+    assert [error.split(":")[1] for error in errors] == ["2", "3", "4", "7"]
+    assert errors[0].startswith(f"{manifest}:2: JSONDecodeError: ")
+    assert errors[1] == f"{manifest}:3: ValueError: Unknown code type: 'Nope'"
+    assert errors[2] == f"{manifest}:4: ValueError: Manifest record must be a JSON object"
+    assert errors[3] == f"{manifest}:7: ValueError: Output path escapes the output directory: '../escaped.py'"
+    assert "Generated 2/6 files" in stdout and "4 failed" in stdout
+
+    assert (output_dir / "good_one.py").read_text().startswith("def good_one(")
+    assert (output_dir / "nested" / "good_two.py").read_text().startswith("class good_two(")
+    assert not (tmp_path / "escaped.py").exists()
+
+def test_batch_succeeds_when_every_record_renders(tmp_path, capsys):
+    manifest = write_manifest(tmp_path / "manifest.jsonl", [{"code_type": "Function", "name": f"f{i}"} for i in range(5)])
+    assert mygen.main(["batch", manifest, "-o", str(tmp_path / "out"), "-w", "1", "-c", "2"]) == 0
+    assert capsys.readouterr().err == ""
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [f"f{i}.py" for i in range(5)]
+
+@pytest.mark.parametrize("relative", ["../escaped.py", "a/../../escaped.py", "/tmp/escaped.py"])
+def test_output_paths_may_not_escape_the_output_directory(tmp_path, relative):
+    with pytest.raises(ValueError, match="escapes the output directory"):
+        mygen.batch_output_path({"output": relative}, str(tmp_path))
+
+def test_output_path_defaults_to_the_record_name(tmp_path):
+    assert mygen.batch_output_path({"name": "tool"}, str(tmp_path)) == str(tmp_path / "tool.py")
+    assert mygen.batch_output_path({"output": "a/../b.py"}, str(tmp_path)) == str(tmp_path / "b.py")
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+import mygen
+
+MYGEN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mygen.py")
+
+def run_mygen(*args, stdin="", cwd=None):
+    return subprocess.run([sys.executable, MYGEN, *args], input=stdin, capture_output=True, text=True, cwd=cwd)
+
+def test_render_rejects_a_record_that_is_not_an_object():
+    result = run_mygen("render", "-", stdin="[1]")
+    assert result.returncode == 1
+    assert result.stderr == "mygen: Record must be a JSON object\n"
+
+def test_render_exits_quietly_when_the_reader_closes_the_pipe(tmp_path):
+    record = tmp_path / "big.json"
+    record.write_text(json.dumps({"code_type": "Class", "methods": ", ".join(f"m{i}" for i in range(20000))}))
+    process = subprocess.Popen([sys.executable, MYGEN, "render", str(record)],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert process.stdout.readline()
+    process.stdout.close()
+    stderr = process.stderr.read().decode()
+    process.stderr.close()
+    assert process.wait() == 1
+    assert stderr == ""
+
+def test_render_template_without_a_library_creates_no_files(tmp_path):
+    result = run_mygen("render", "-t", "missing", cwd=tmp_path)
+    assert result.returncode == 1
+    assert result.stderr == "mygen: No template library at code_templates.db\n"
+    assert list(tmp_path.iterdir()) == []
+
+def test_render_template_from_library(tmp_path):
+    store = mygen.TemplateStore(str(tmp_path / "code_templates.db"), legacy_file=None)
+    store.put("greeter", {"code_type": "Function", "name": "greet"})
+    store.close()
+    result = run_mygen("render", "-t", "greeter", cwd=tmp_path)
+    assert result.returncode == 0
+    assert result.stdout.startswith("def greet(")
+
+def test_render_template_from_a_corrupt_library(tmp_path):
+    (tmp_path / "code_templates.db").write_text("not a database")
+    result = run_mygen("render", "-t", "greeter", cwd=tmp_path)
+    assert result.returncode == 1
+    assert result.stderr.startswith("mygen: Cannot read template library code_templates.db: ")
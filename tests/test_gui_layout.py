@@ -0,0 +1,35 @@
+import re
+
+import mygen
+from mygen import GuiAppSpec, layout_widgets
+
+def test_first_widget_of_a_type_is_named_after_it():
+    assert list(layout_widgets(["Label", "Entry", "Button"])) == [
+        ("Label", "label", 0), ("Entry", "entry", 1), ("Button", "button", 2)]
+
+def test_repeated_widgets_get_counter_suffixes():
+    names = [name for _, name, _ in layout_widgets(["Entry", "Label", "Entry", "Entry", "Label"])]
+    assert names == ["entry", "label", "entry_2", "entry_3", "label_2"]
+
+def test_unsupported_widgets_are_skipped_but_keep_their_row():
+    assert list(layout_widgets(["Label", "Slider", "Entry", "Slider", "Entry"])) == [
+        ("Label", "label", 0), ("Entry", "entry", 2), ("Entry", "entry_2", 4)]
+
+def test_no_widgets():
+    assert list(layout_widgets([])) == []
+
+def test_tkinter_grid_rows_and_columns():
+    code = mygen.render(GuiAppSpec(framework="Tkinter", widgets="Label, Entry, Entry, Text, Checkbutton, Button"))
+    grid = re.findall(r"self\.(\w+)\.grid\(row=(\d+), column=(\d+)(, columnspan=2)?", code)
+    assert grid == [
+        ("label", "0", "0", ""),
+        ("entry", "1", "1", ""),
+        ("entry_2", "2", "1", ""),
+        ("text", "3", "0", ", columnspan=2"),
+        ("checkbutton", "4", "0", ", columnspan=2"),
+        ("button", "5", "0", ", columnspan=2"),
+    ]
+
+def test_pyqt_adds_widgets_in_list_order():
+    code = mygen.render(GuiAppSpec(framework="PyQt", widgets="Entry, Label, Entry"))
+    assert re.findall(r"layout\.addWidget\(self\.(\w+)\)", code) == ["entry", "label", "entry_2"]
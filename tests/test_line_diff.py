@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from mygen import line_diff
+
+def apply_ops(old_lines, new_lines, ops):
+    """Patch old_lines bottom-up, the way CodeGeneratorApp.show_code patches the text widget."""
+    lines = list(old_lines)
+    for i1, i2, j1, j2 in reversed(ops):
+        lines[i1:i2] = new_lines[j1:j2]
+    return lines
+
+def lines(text):
+    return [line + "\n" for line in text.split()] if text else []
+
+@pytest.mark.parametrize("old, new", [
+    ("a b c", "a b c"),
+    ("a b c", "a b c d"),
+    ("a b c", "z a b c"),
+    ("a b c d", "a x y d"),
+    ("a b c d", "a d"),
+    ("a b c", "c b a"),
+    ("", "a b"),
+    ("a b", ""),
+    ("", ""),
+])
+def test_applying_ops_gives_new_lines(old, new):
+    old_lines, new_lines = lines(old), lines(new)
+    assert apply_ops(old_lines, new_lines, line_diff(old_lines, new_lines)) == new_lines
+
+def test_identical_input_needs_no_ops():
+    assert line_diff(lines("a b c"), lines("a b c")) == []
+    assert line_diff([], []) == []
+
+def test_common_prefix_and_suffix_are_trimmed():
+    old_lines = lines("a b c d e")
+    new_lines = lines("a b x d e")
+    assert line_diff(old_lines, new_lines) == [(2, 3, 2, 3)]
+
+def test_repeated_lines_are_not_trimmed_twice():
+    # The prefix takes the shared "a"s; the suffix must not reuse them
+    old_lines = lines("a a")
+    new_lines = lines("a a a")
+    ops = line_diff(old_lines, new_lines)
+    assert ops == [(2, 2, 2, 3)]
+    assert apply_ops(old_lines, new_lines, ops) == new_lines
+
+def test_empty_old_inserts_everything():
+    assert line_diff([], lines("a b")) == [(0, 0, 0, 2)]
+
+def test_empty_new_deletes_everything():
+    assert line_diff(lines("a b"), []) == [(0, 2, 0, 0)]
+
+def test_large_middle_falls_back_to_one_replacement():
+    old_lines = lines("head " + " ".join(f"old{i}" for i in range(10)) + " tail")
+    new_lines = lines("head " + " ".join(f"new{i}" for i in range(10)) + " tail")
+    ops = line_diff(old_lines, new_lines, max_matcher_lines=5)
+    assert ops == [(1, 11, 1, 11)]
+    assert apply_ops(old_lines, new_lines, ops) == new_lines
+
+def test_random_edits_round_trip():
+    rng = random.Random(7)
+    for _ in range(200):
+        old_lines = [f"{rng.randrange(5)}\n" for _ in range(rng.randrange(12))]
+        new_lines = [f"{rng.randrange(5)}\n" for _ in range(rng.randrange(12))]
+        for limit in (0, 4, 4000):
+            ops = line_diff(old_lines, new_lines, max_matcher_lines=limit)
+            assert apply_ops(old_lines, new_lines, ops) == new_lines
@@ -0,0 +1,71 @@
+import mygen
+from mygen import ClassSpec, DataProcessingSpec, FunctionSpec, RenderCache, spec_key
+
+def spec(i):
+    return FunctionSpec(name=f"function_{i}")
+
+def size(code):
+    return len(code.encode("utf-8"))
+
+def test_spec_key_keeps_distinct_values_apart():
+    assert spec_key(ClassSpec(docstring="false")) != spec_key(ClassSpec(docstring=False))
+    assert spec_key(ClassSpec(docstring="false")) != spec_key(ClassSpec(docstring=True))
+    assert spec_key(FunctionSpec(name="1")) != spec_key(FunctionSpec(name=1))
+
+def test_spec_key_merges_equivalent_bools():
+    assert spec_key(ClassSpec(docstring=1, example=0)) == spec_key(ClassSpec(docstring=True, example=False))
+
+def test_spec_key_accepts_malformed_values():
+    assert spec_key(DataProcessingSpec(rows_per_chunk="abc")) != spec_key(DataProcessingSpec())
+    assert spec_key(FunctionSpec(params=["a", "b"])) != spec_key(FunctionSpec())
+
+def test_hits_and_misses_are_counted():
+    cache = RenderCache()
+    first = cache.render(spec(1))
+    assert cache.render(spec(1)) is first
+    assert cache.get(spec(2)) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0, "entries": 1, "bytes": size(first)}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RenderCache(max_entries=2)
+    cache.render(spec(1))
+    cache.render(spec(2))
+    cache.get(spec(1))  # spec(2) is now the least recently used
+    cache.render(spec(3))
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(spec(2)) is None
+    assert cache.get(spec(1)) is not None
+    assert cache.get(spec(3)) is not None
+
+def test_byte_budget_evicts_oldest_entries():
+    codes = [mygen.render(spec(i)) for i in range(3)]
+    cache = RenderCache(max_bytes=size(codes[1]) + size(codes[2]))
+    for i, code in enumerate(codes):
+        cache.put(spec(i), code)
+    assert cache.get(spec(0)) is None
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] == size(codes[1]) + size(codes[2])
+
+def test_entry_over_byte_budget_is_not_cached():
+    cache = RenderCache(max_bytes=10)
+    code = cache.render(spec(1))
+    assert code == mygen.render(spec(1))
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+    assert cache.evictions == 0
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = RenderCache()
+    cache.put(spec(1), "old")
+    cache.put(spec(1), "newer")
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == 5
+    assert cache.get(spec(1)) == "newer"
+
+def test_clear_empties_the_cache():
+    cache = RenderCache()
+    cache.render(spec(1))
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,34 @@
+import threading
+
+import mygen
+from mygen import ClassSpec, render_cancellable
+
+SPEC = ClassSpec(methods=", ".join(f"method_{i}" for i in range(200)))
+
+def test_uncancelled_render_matches_render():
+    progress = []
+    code = render_cancellable(SPEC, threading.Event(), on_progress=progress.append, chunk_size=256)
+    assert code == mygen.render(SPEC)
+    assert len(progress) > 1
+    assert progress[-1] == len(code)
+
+def test_cancel_during_render_returns_none():
+    cancel = threading.Event()
+    progress = []
+
+    def on_progress(rendered):
+        progress.append(rendered)
+        cancel.set()
+
+    assert render_cancellable(SPEC, cancel, on_progress=on_progress, chunk_size=256) is None
+    assert len(progress) == 1
+
+def test_cancel_after_last_chunk_returns_none():
+    cancel = threading.Event()
+    code = mygen.render(SPEC)
+
+    def on_progress(rendered):
+        if rendered == len(code):
+            cancel.set()
+
+    assert render_cancellable(SPEC, cancel, on_progress=on_progress, chunk_size=256) is None
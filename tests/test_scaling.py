@@ -0,0 +1,39 @@
+"""Render time grows linearly with spec size."""
+import gc
+import time
+
+import mygen
+
+def best_render_time(spec, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        # Cold fragment caches, so every size pays the same per-item cost
+        mygen.clear_fragment_caches()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            mygen.render(spec)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return best
+
+def methods(n):
+    return ", ".join(f"method_{i}" for i in range(n))
+
+def steps(n):
+    return ", ".join(f"{['clean', 'transform', 'analyze'][i % 3]}_{i}" for i in range(n))
+
+def assert_linear(make_spec, n=5000):
+    small = best_render_time(make_spec(n))
+    large = best_render_time(make_spec(10 * n))
+    ratio = large / small
+    # Linear rendering gives ~10x (timer noise aside); quadratic string building gives ~100x
+    assert 5 < ratio < 30, f"10x the items took {ratio:.1f}x as long"
+
+def test_class_render_time_is_linear_in_methods():
+    assert_linear(lambda n: mygen.ClassSpec(methods=methods(n)))
+
+def test_data_processing_render_time_is_linear_in_steps():
+    assert_linear(lambda n: mygen.DataProcessingSpec(processing_steps=steps(n)))
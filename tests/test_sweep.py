@@ -0,0 +1,53 @@
+import math
+
+import mygen
+from mygen import CODE_TYPES, SPEC_CHOICES, check_sweep_output, iter_sweep_records, summarize_sweep_issues, sweep_options
+
+def test_bool_options_are_swept_both_ways():
+    assert sweep_options("Function") == {"docstring": [True, False], "example": [True, False]}
+    assert list(iter_sweep_records(["Function"])) == [
+        {"code_type": "Function", "docstring": True, "example": True},
+        {"code_type": "Function", "docstring": True, "example": False},
+        {"code_type": "Function", "docstring": False, "example": True},
+        {"code_type": "Function", "docstring": False, "example": False},
+    ]
+
+def test_sweep_covers_every_choice_combination():
+    for code_type in CODE_TYPES:
+        options = sweep_options(code_type)
+        assert set(SPEC_CHOICES.get(code_type, {})) <= set(options)
+        records = list(iter_sweep_records([code_type]))
+        assert len(records) == math.prod(len(values) for values in options.values())
+        assert len({tuple(sorted(record.items())) for record in records}) == len(records)
+
+def test_clean_output_has_no_issues():
+    record = {"code_type": "Function", "docstring": True, "example": True}
+    assert check_sweep_output(record, mygen.render(mygen.spec_from_template(record))) == []
+
+def test_undefined_name_is_reported():
+    record = {"code_type": "Function", "docstring": True, "example": False}
+    code = mygen.render(mygen.spec_from_template(record)) + "\nprint(not_defined_anywhere)\n"
+    assert check_sweep_output(record, code) == ["uses undefined name(s): not_defined_anywhere"]
+
+def test_syntax_error_and_empty_output_are_reported():
+    record = {"code_type": "Function", "docstring": True, "example": False}
+    assert check_sweep_output(record, "def broken(:\n")[0].startswith("SyntaxError: ")
+    assert check_sweep_output(record, "# nothing here\n") == ["generates no code"]
+
+def test_unhandled_choice_is_reported():
+    issues = [check_sweep_output(record, mygen.render(mygen.spec_from_template(record)))
+              for record in iter_sweep_records(["GUI Application"]) if record["framework"] == "Kivy"]
+    assert issues and all(issue == ["generates no code"] for issue in issues)
+
+def test_summary_names_the_options_an_issue_depends_on():
+    results = [{"record": record, "issues": ["uses undefined name(s): x"] if not record["example"] else []}
+               for record in iter_sweep_records(["Function"])]
+    assert summarize_sweep_issues(results) == [
+        ("Function", "uses undefined name(s): x", 2, 4, {"example": [False]}),
+    ]
+
+def test_sweep_finds_the_frameworks_without_templates():
+    results, _ = mygen.run_sweep(["GUI Application"], workers=1)
+    assert summarize_sweep_issues(results) == [
+        ("GUI Application", "generates no code", 4, 8, {"framework": ["Kivy", "PyGTK"]}),
+    ]
@@ -0,0 +1,67 @@
+from mygen import TemplateIndex
+
+TEMPLATES = {
+    "csv_cleaner": {"code_type": "Data Processing", "description": "Clean CSV exports"},
+    "csv_loader": {"code_type": "Data Processing", "description": "Load a CSV file"},
+    "report_csv": {"code_type": "Script", "description": "Write a report"},
+    "c_s_v_tools": {"code_type": "Class", "description": "Helpers"},
+    "scraper": {"code_type": "Web Scraper", "description": "Scrape news"},
+    "parser": {"code_type": "Function", "description": "Parse CSV rows"},
+}
+
+def index(templates=TEMPLATES):
+    return TemplateIndex(templates.items())
+
+def test_empty_query_lists_every_name_in_order():
+    assert index().search("  ") == ["c_s_v_tools", "csv_cleaner", "csv_loader", "parser", "report_csv", "scraper"]
+
+def test_prefix_then_substring_then_fuzzy():
+    # Prefix matches first, then name or field substrings, then subsequences of the name
+    assert index().search("csv") == ["csv_cleaner", "csv_loader", "parser", "report_csv", "c_s_v_tools"]
+
+def test_fuzzy_matches_rank_tighter_spans_first():
+    templates = {"s_c_r_a_p_e": {}, "scrap_e": {}, "xscxrape": {}}
+    assert index(templates).search("scrape") == ["scrap_e", "xscxrape", "s_c_r_a_p_e"]
+
+def test_search_is_case_insensitive():
+    assert index().search("LOADER") == ["csv_loader"]
+    assert index().search("NEWS") == ["scraper"]
+
+def test_names_differing_only_by_case_are_kept_apart():
+    templates = {"Report": {"description": "upper"}, "report": {"description": "lower"}}
+    idx = index(templates)
+    assert len(idx) == 2
+    assert idx.search("rep") == ["Report", "report"]
+    assert idx.search("upper") == ["Report"]
+    idx.remove("report")
+    assert idx.search("rep") == ["Report"]
+    assert idx.search("lower") == []
+
+def test_add_makes_a_template_searchable():
+    idx = index()
+    idx.add("weather_api", {"code_type": "Script", "description": "Fetch forecasts"})
+    assert len(idx) == len(TEMPLATES) + 1
+    assert idx.search("weather") == ["weather_api"]
+    assert idx.search("forecast") == ["weather_api"]
+
+def test_add_replaces_an_existing_template():
+    idx = index()
+    idx.add("scraper", {"code_type": "Web Scraper", "description": "Scrape prices"})
+    assert len(idx) == len(TEMPLATES)
+    assert idx.search("prices") == ["scraper"]
+    assert idx.search("news") == []
+
+def test_remove_drops_a_template():
+    idx = index()
+    idx.remove("parser")
+    idx.remove("not there")
+    assert len(idx) == len(TEMPLATES) - 1
+    assert "parser" not in idx.search("")
+    assert idx.search("rows") == []
+
+def test_removing_everything_leaves_no_postings():
+    idx = index()
+    for name in TEMPLATES:
+        idx.remove(name)
+    assert idx.search("csv") == []
+    assert not idx._postings
@@ -0,0 +1,39 @@
+import json
+
+import mygen
+from mygen import FunctionSpec, validate_source
+
+def test_valid_source_has_no_verdict():
+    assert validate_source(mygen.render(FunctionSpec(name="valid_one"))) is None
+
+def test_invalid_source_reports_the_syntax_error():
+    assert validate_source("def broken(:\n    pass\n").startswith("SyntaxError: ")
+    assert validate_source("x = 1\ny = (\n").endswith("(line 2)")
+
+def test_verdicts_are_cached_by_source(monkeypatch):
+    code = mygen.render(FunctionSpec(name="cached_one", params="a, b"))
+    assert validate_source(code) is None
+    compiled = []
+    monkeypatch.setattr(mygen, "compile", lambda *args, **kwargs: compiled.append(args), raising=False)
+    assert validate_source(code) is None
+    assert compiled == []
+    # A different source still gets compiled
+    validate_source(code + "\n")
+    assert len(compiled) == 1
+
+def test_batch_validate_skips_output_that_does_not_compile(tmp_path, capsys):
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text("\n".join(json.dumps(record) for record in [
+        {"code_type": "Function", "name": "good_one"},
+        {"code_type": "Function", "name": "1bad"},
+    ]) + "\n")
+    output_dir = tmp_path / "out"
+
+    status = mygen.main(["batch", str(manifest), "-o", str(output_dir), "-w", "1", "--validate"])
+
+    assert status == 1
+    stdout, stderr = capsys.readouterr()
+    assert stderr.startswith(f"{manifest}:2: generated code does not compile: SyntaxError: ")
+    assert "Generated 1/2 files" in stdout
+    assert (output_dir / "good_one.py").exists()
+    assert not (output_dir / "1bad.py").exists()